@@ -0,0 +1,55 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+import "@openzeppelin/contracts/math/SafeMath.sol";
+
+// FIFO queue of RewardEscrowV2 entry IDs, packed four uint64 IDs per storage slot.
+// The head points to the next ID to vest and the tail to the next free position.
+// Slots left behind by the head are cleared to free storage (and get the gas refund)
+library EntryIDQueue {
+    using SafeMath for uint256;
+
+    uint256 private constant IDS_PER_SLOT = 4;
+    uint256 private constant ID_BITS = 64;
+    uint256 private constant ID_MASK = uint256(type(uint64).max);
+
+    struct Queue {
+        uint64 head;
+        uint64 tail;
+        mapping(uint256 => uint256) slots;
+    }
+
+    function push(Queue storage _queue, uint256 _entryID) internal {
+        require(_entryID <= ID_MASK, "!entryID");
+        uint256 _index = _queue.tail;
+        uint256 _slot = _index / IDS_PER_SLOT;
+        uint256 _shift = (_index % IDS_PER_SLOT) * ID_BITS;
+
+        _queue.slots[_slot] = _queue.slots[_slot] | (_entryID << _shift);
+        _queue.tail = uint64(_index.add(1));
+    }
+
+    // IDs behind the head may have been cleared, in which case 0 is returned
+    function at(Queue storage _queue, uint256 _index)
+        internal
+        view
+        returns (uint256)
+    {
+        require(_index < _queue.tail, "!index");
+        uint256 _shift = (_index % IDS_PER_SLOT) * ID_BITS;
+        return (_queue.slots[_index / IDS_PER_SLOT] >> _shift) & ID_MASK;
+    }
+
+    // moves the head `_count` positions and clears the slots that have been fully consumed
+    function advance(Queue storage _queue, uint256 _count) internal {
+        uint256 _head = _queue.head;
+        uint256 _newHead = _head.add(_count);
+        require(_newHead <= _queue.tail, "!count");
+
+        uint256 _lastSlot = _newHead / IDS_PER_SLOT;
+        for (uint256 _slot = _head / IDS_PER_SLOT; _slot < _lastSlot; _slot++) {
+            delete _queue.slots[_slot];
+        }
+        _queue.head = uint64(_newHead);
+    }
+}
@@ -28,14 +28,41 @@ contract SnxOracle {
     IER public exchangeRate;
     ISynthetix public synthetix;
 
-    constructor(address _exchangeRates) public {
+    constructor(address _exchangeRates, address _synthetix) public {
         exchangeRate = IER(_exchangeRates);
-        //synthetix = ISynthetix(_synthetix);
+        synthetix = ISynthetix(_synthetix);
     }
 
-    function updateAllPrices() external {
-        uint256 _count = synthetix.availableSynthCount();
-        bytes32[] memory keys = synthetix.availableCurrencyKeys();
+    // SNX and every synth but sUSD (its rate is always 1), in the order of updateAllPrices
+    function currencyKeys() public view returns (bytes32[] memory keys) {
+        bytes32[] memory synths = synthetix.availableCurrencyKeys();
+        uint256 _count = 1;
+        for (uint256 i = 0; i < synths.length; i++) {
+            if (synths[i] != "sUSD") {
+                _count++;
+            }
+        }
+
+        keys = new bytes32[](_count);
+        keys[0] = "SNX";
+        _count = 1;
+        for (uint256 i = 0; i < synths.length; i++) {
+            if (synths[i] != "sUSD") {
+                keys[_count++] = synths[i];
+            }
+        }
+    }
+
+    function updateAllPrices(uint256[] calldata _rates) external {
+        bytes32[] memory keys = currencyKeys();
+        require(_rates.length == keys.length, "!rates");
+        exchangeRate.updateRates(keys, _rates, now);
+    }
+
+    function updateRates(bytes32[] calldata _keys, uint256[] calldata _rates)
+        external
+    {
+        exchangeRate.updateRates(_keys, _rates, now);
     }
 
     function updateSnxPrice(uint256 _price) external {
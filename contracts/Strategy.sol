@@ -2,7 +2,11 @@
 pragma solidity 0.6.12;
 pragma experimental ABIEncoderV2;
 
-import {BaseStrategy, VaultAPI} from "@yearnvaults/contracts/BaseStrategy.sol";
+import {
+    BaseStrategy,
+    StrategyParams,
+    VaultAPI
+} from "@yearnvaults/contracts/BaseStrategy.sol";
 import {
     SafeERC20,
     SafeMath,
@@ -18,71 +22,200 @@ import "../interfaces/IReadProxy.sol";
 import "../interfaces/IAddressResolver.sol";
 import "../interfaces/IExchangeRates.sol";
 import "../interfaces/IRewardEscrowV2.sol";
+import "../interfaces/ISystemSettings.sol";
 
 import "../interfaces/IVault.sol";
 import "../interfaces/ISushiRouter.sol";
 
+import "./EntryIDQueue.sol";
+
 contract Strategy is BaseStrategy {
     using SafeERC20 for IERC20;
     using Address for address;
     using SafeMath for uint256;
+    using EntryIDQueue for EntryIDQueue.Queue;
 
     uint256 public constant MIN_ISSUE = 50 * 1e18;
-    uint256 public ratioThreshold = 1e15;
     uint256 public constant MAX_RATIO = type(uint256).max;
     uint256 public constant MAX_BPS = 10_000;
-
-    address public constant susd =
-        address(0x57Ab1ec28D129707052df4dF418D58a2D46d5f51);
-    IReadProxy public constant readProxy =
-        IReadProxy(address(0x4E3b31eB0E5CB73641EE1E65E7dCEFe520bA3ef2));
-    address public constant WETH =
-        address(0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2);
-
-    ISushiRouter public constant sushiswap =
-        ISushiRouter(address(0xd9e1cE17f2641f24aE83637ab66a2cca9C378B9F));
-    ISushiRouter public constant uniswap =
-        ISushiRouter(address(0x7a250d5630B4cF539739dF2C5dAcb4c659F2488D));
-    ISushiRouter public router =
-        ISushiRouter(address(0x7a250d5630B4cF539739dF2C5dAcb4c659F2488D));
-
-    uint256 public targetRatioMultiplier = 12_500;
+    uint256 private constant NO_QUOTE = type(uint256).max;
+    uint256 private constant MAX_UINT96 = 2**96 - 1;
+    uint256 private constant MAX_UINT64 = 2**64 - 1;
+    // phases of PositionUpdated
+    uint256 private constant PREPARE_RETURN = 1;
+    uint256 private constant ADJUST_POSITION = 2;
+
+    // set at deploy time so the strategy can run against any Synthetix deployment
+    // (mainnet: ReadProxyAddressResolver 0x4E3b31eB0E5CB73641EE1E65E7dCEFe520bA3ef2)
+    address public immutable susd;
+    IReadProxy public immutable readProxy;
+    address public immutable WETH;
+
+    ISushiRouter public immutable sushiswap;
+    ISushiRouter public immutable uniswap;
+
+    // Settings and timestamps are packed by the code that reads them together, so that
+    // tend and harvest load each slot once. The getters return the narrow types and the
+    // setters check that the value fits
+
+    // slot 1, read by _rebalance (tendTrigger, tend and harvest)
+    // the strategy repays debt over targetRatio + repayRatioThreshold and issues under
+    // issuanceRatio - issueRatioThreshold. It rebalances to targetRatio and issuanceRatio,
+    // inside of that band, so the ratio has to drift over a whole threshold to act again
+    uint64 public issueRatioThreshold = 1e15;
+    uint64 public repayRatioThreshold = 1e15;
+    uint64 public lastIssueTime;
+    uint64 public lastRepayTime;
+
+    // slot 2, read by _loadPosition and _rebalance
     IVault public susdVault;
+    uint16 public targetRatioMultiplier = 12_500;
+    // min time between two issues or two repays of tend/harvest (0: no limit)
+    uint32 public minRebalanceInterval;
+    // max number of VestingEntries vested in a single harvest
+    uint16 public maxEntriesToVest = 25;
+
+    // slot 3, read by the swaps
+    // preferred venue: it is quoted first and wins ties
+    ISushiRouter public router;
+    // min improvement (in BPS) over the best single venue quote to split a swap between venues
+    uint16 public minSplitImprovement = 10;
+
+    // candidate paths between sUSD and want, as the list of intermediate tokens
+    // (e.g. [WETH] is sUSD -> WETH -> SNX). They are used in both directions
+    address[][] internal swapPaths;
 
-    // to keep track of next entry to vest
-    uint256 public entryIDIndex = 0;
     // entryIDs of escrow rewards claimed and to be claimed by the Strategy
-    uint256[] public entryIDs;
+    // its head keeps track of next entry to vest (see entryIDIndex),
+    // head and tail share a slot
+    EntryIDQueue.Queue private entryIDQueue;
+    // strategy this one replaced, whose escrow entries are merged into this one, and the
+    // position in its entryIDs of the next entry to merge (see mergeEscrowEntries)
+    address public escrowMergeSource;
+    uint64 public escrowMergeIndex;
+
+    // Synthetix position read once and reused during the same phase
+    // (prepareReturn, adjustPosition, liquidatePosition, ...).
+    // It must be refreshed after any call that changes it:
+    // issue, burn, swap, claim or sUSD vault deposit/withdrawal
+    struct PositionSnapshot {
+        uint256 debt; // in sUSD
+        uint256 collateral; // in want (SNX), includes escrowed want
+        uint256 currentRatio;
+        uint256 issuanceRatio;
+        uint256 targetRatio;
+        uint256 snxRate;
+        uint256 balanceOfWant;
+        uint256 balanceOfSusd;
+        uint256 balanceOfSusdInVault;
+        // only filled by getPositionSnapshot (not used in operations)
+        uint256 unlockedWant;
+        uint256 balanceOfEscrowedWant;
+    }
+
+    // how repayDebt sources the sUSD it burns (see _planDeleverage)
+    struct DeleveragePlan {
+        uint256 amountToRepay; // capped at the debt, rounded up to all of it near MIN_ISSUE
+        uint256 fromVault; // sUSD withdrawn from the sUSD vault
+        uint256 burnBeforeSwap; // sUSD burnt to unlock want before selling it
+        uint256 wantToSell; // max want sold for sUSD
+        uint256 susdToBuy;
+        uint256 burnAfterSwap;
+        bool canBurn; // false during the minimum stake time, nothing is repaid
+    }
+
+    // sUSD sources and sinks of a harvest (see _planSusdFlows), netted so that the
+    // sUSD vault is touched once: a withdrawal here or a deposit in adjustPosition
+    struct SusdFlows {
+        uint256 burnToTarget; // sUSD burnt to claim fees (see _canClaimFees)
+        uint256 vaultProfit; // sUSD in the vault over the debt (after the burn), sold for want
+        uint256 toIssue; // debt issued before the sale, it pays for the vault profit
+        uint256 fromVault; // single withdrawal from the sUSD vault
+        uint256 toDeposit; // new debt not sold, deposited by adjustPosition
+    }
+
+    // SNX prices (getTriggerPrices, at the current debt) or debt balances
+    // (getTriggerDebts, at the current SNX price) at which the debt ratio of the
+    // position reaches each level: it is over a level under its price or over its debt
+    struct TriggerLevels {
+        uint256 repay; // targetRatio + repayRatioThreshold, tend repays over it
+        uint256 target;
+        uint256 issue; // issuanceRatio - issueRatioThreshold, tend issues under it
+        uint256 issuance;
+        uint256 liquidation; // Synthetix's liquidationRatio, flaggable over it
+    }
 
     bytes32 private constant CONTRACT_SYNTHETIX = "Synthetix";
     bytes32 private constant CONTRACT_EXRATES = "ExchangeRates";
     bytes32 private constant CONTRACT_REWARDESCROW_V2 = "RewardEscrowV2";
     bytes32 private constant CONTRACT_ISSUER = "Issuer";
     bytes32 private constant CONTRACT_FEEPOOL = "FeePool";
+    bytes32 private constant CONTRACT_SYSTEMSETTINGS = "SystemSettings";
+
+    // cache of Synthetix addresses (see Synthetix's MixinResolver)
+    // resolver used to build the cache, used to detect a resolver upgrade
+    IAddressResolver public cachedResolver;
+    mapping(bytes32 => address) private addressCache;
 
     // ********************** EVENTS **********************
 
     event RepayDebt(uint256 repaidAmount, uint256 debtAfterRepayment);
+    // repayDebt can't burn before the end of the minimum stake time (nextBurnableTimestamp)
+    event RepayDeferred(uint256 amountToRepay, uint256 burnableAt);
+    // position at the end of prepareReturn (phase 1) and adjustPosition (phase 2, harvest and tend)
+    // packed in 4 words, from the most significant bits (96/96/64 bits, saturated):
+    //   [0] debt | collateral | currentRatio
+    //   [1] unlockedWant | balanceOfEscrowedWant | issuanceRatio
+    //   [2] balanceOfSusdInVault | snxRate | targetRatio
+    //   [3] feesClaimed | rewardsClaimed | entriesVested (56 bits) << 8 | phase (8 bits)
+    // see scripts/position_log.py to decode it
+    event PositionUpdated(uint256[4] packed);
+    event CacheUpdated(bytes32 name, address destination);
+    // on migration, the new strategy is nominated to merge the escrow entries left to vest
+    event EscrowMergeNominated(address newStrategy, uint256 entries);
+    event EscrowEntriesMerged(
+        address oldStrategy,
+        uint256 entries,
+        uint256 nextIndex
+    );
 
     // ********************** CONSTRUCTOR **********************
 
-    constructor(address _vault, address _susdVault)
-        public
-        BaseStrategy(_vault)
-    {
+    // immutables can't be read during construction, so the constructor only uses its arguments
+    constructor(
+        address _vault,
+        address _susdVault,
+        address _readProxy,
+        address _uniswap,
+        address _sushiswap
+    ) public BaseStrategy(_vault) {
+        address _susd = IVault(_susdVault).token();
+        susd = _susd;
         susdVault = IVault(_susdVault);
+        readProxy = IReadProxy(_readProxy);
+        uniswap = ISushiRouter(_uniswap);
+        sushiswap = ISushiRouter(_sushiswap);
+        router = ISushiRouter(_uniswap);
+        address _weth = ISushiRouter(_uniswap).WETH();
+        WETH = _weth;
 
         // max time between harvest to collect rewards from each epoch
         maxReportDelay = 7 * 24 * 3600;
 
         // To deposit sUSD in the sUSD vault
-        IERC20(susd).safeApprove(address(_susdVault), type(uint256).max);
+        IERC20(_susd).safeApprove(_susdVault, type(uint256).max);
         // To exchange sUSD for SNX
-        IERC20(susd).safeApprove(address(uniswap), type(uint256).max);
-        IERC20(susd).safeApprove(address(sushiswap), type(uint256).max);
+        IERC20(_susd).safeApprove(_uniswap, type(uint256).max);
+        IERC20(_susd).safeApprove(_sushiswap, type(uint256).max);
         // To exchange SNX for sUSD
-        IERC20(want).safeApprove(address(uniswap), type(uint256).max);
-        IERC20(want).safeApprove(address(sushiswap), type(uint256).max);
+        IERC20(want).safeApprove(_uniswap, type(uint256).max);
+        IERC20(want).safeApprove(_sushiswap, type(uint256).max);
+
+        address[] memory _viaWeth = new address[](1);
+        _viaWeth[0] = _weth;
+        swapPaths.push(_viaWeth);
+
+        _rebuildCache(IAddressResolver(IReadProxy(_readProxy).target()));
     }
 
     // ********************** SETTERS **********************
@@ -96,19 +229,115 @@ contract Strategy is BaseStrategy {
         }
     }
 
+    function setSwapPaths(address[][] memory _swapPaths)
+        external
+        onlyGovernance
+    {
+        require(_swapPaths.length > 0);
+        delete swapPaths;
+        for (uint256 i = 0; i < _swapPaths.length; i++) {
+            swapPaths.push(_swapPaths[i]);
+        }
+    }
+
+    function setMinSplitImprovement(uint256 _minSplitImprovement)
+        external
+        onlyAuthorized
+    {
+        require(_minSplitImprovement <= MAX_BPS);
+        minSplitImprovement = uint16(_minSplitImprovement);
+    }
+
     function setTargetRatioMultiplier(uint256 _targetRatioMultiplier) external {
         require(
             msg.sender == governance() ||
                 msg.sender == VaultAPI(address(vault)).management()
         );
-        targetRatioMultiplier = _targetRatioMultiplier;
+        require(_targetRatioMultiplier <= type(uint16).max);
+        targetRatioMultiplier = uint16(_targetRatioMultiplier);
     }
 
+    // the single threshold of earlier versions, now split in issueRatioThreshold and
+    // repayRatioThreshold: sets both (see setRatioThresholds to set them apart)
     function setRatioThreshold(uint256 _ratioThreshold)
         external
         onlyStrategist
     {
-        ratioThreshold = _ratioThreshold;
+        require(_ratioThreshold <= type(uint64).max);
+        issueRatioThreshold = uint64(_ratioThreshold);
+        repayRatioThreshold = uint64(_ratioThreshold);
+    }
+
+    function setRatioThresholds(
+        uint256 _issueRatioThreshold,
+        uint256 _repayRatioThreshold
+    ) external onlyStrategist {
+        require(
+            _issueRatioThreshold <= type(uint64).max &&
+                _repayRatioThreshold <= type(uint64).max
+        );
+        issueRatioThreshold = uint64(_issueRatioThreshold);
+        repayRatioThreshold = uint64(_repayRatioThreshold);
+    }
+
+    function setMinRebalanceInterval(uint256 _minRebalanceInterval)
+        external
+        onlyStrategist
+    {
+        require(_minRebalanceInterval <= type(uint32).max);
+        minRebalanceInterval = uint32(_minRebalanceInterval);
+    }
+
+    function setMaxEntriesToVest(uint256 _maxEntriesToVest)
+        external
+        onlyAuthorized
+    {
+        require(
+            _maxEntriesToVest > 0 && _maxEntriesToVest <= type(uint16).max
+        );
+        maxEntriesToVest = uint16(_maxEntriesToVest);
+    }
+
+    // Merges up to `_maxEntries` escrow entries of the strategy this one replaced, once its
+    // migration nominated this one (see _nominateEscrowMerge). Entries keep their ID and
+    // are queued to vest here, starting at the entryIDIndex of the old strategy.
+    // Older entries must come first in the queue, so the merge has to be done before
+    // this strategy claims rewards of its own
+    function mergeEscrowEntries(address _oldStrategy, uint256 _maxEntries)
+        external
+        onlyAuthorized
+    {
+        Strategy _old = Strategy(_oldStrategy);
+        require(address(_old.vault()) == address(vault));
+        uint256 _start = escrowMergeIndex;
+        if (_oldStrategy != escrowMergeSource) {
+            escrowMergeSource = _oldStrategy;
+            _start = _old.entryIDIndex();
+        }
+        uint256 _end = Math.min(_old.entryIDsLength(), _start.add(_maxEntries));
+        require(_end > _start, "!entries");
+
+        IRewardEscrowV2 re = _rewardEscrowV2();
+        uint256[] memory _entries = new uint256[](_end - _start);
+        for (uint256 i = 0; i < _entries.length; i++) {
+            _entries[i] = _old.entryIDs(_start + i);
+        }
+        if (entryIDQueue.tail > entryIDQueue.head) {
+            (uint64 _lastEndTime, ) =
+                re.getVestingEntry(
+                    address(this),
+                    entryIDQueue.at(entryIDQueue.tail - 1)
+                );
+            (uint64 _endTime, ) = re.getVestingEntry(_oldStrategy, _entries[0]);
+            require(_endTime >= _lastEndTime, "!order");
+        }
+
+        re.mergeAccount(_oldStrategy, _entries);
+        for (uint256 i = 0; i < _entries.length; i++) {
+            entryIDQueue.push(_entries[i]);
+        }
+        escrowMergeIndex = uint64(_end);
+        emit EscrowEntriesMerged(_oldStrategy, _entries.length, _end);
     }
 
     // This method is used to migrate the vault where we deposit the sUSD for yield. It should be rarely used
@@ -130,11 +359,19 @@ contract Strategy is BaseStrategy {
         newSusdVault.deposit();
     }
 
+    // ********************** ADDRESS CACHE **********************
+
+    // Synthetix contracts change address when they are upgraded.
+    // Anyone can refresh the cache after an upgrade
+    function rebuildCache() external {
+        _rebuildCache(resolver());
+    }
+
     // ********************** MANUAL **********************
 
     function manuallyRepayDebt(uint256 amount) external onlyAuthorized {
         // To be used in case of emergencies, to operate the vault manually
-        repayDebt(amount);
+        repayDebt(amount, _loadPosition());
     }
 
     // ********************** YEARN STRATEGY **********************
@@ -144,17 +381,7 @@ contract Strategy is BaseStrategy {
     }
 
     function estimatedTotalAssets() public view override returns (uint256) {
-        uint256 totalAssets =
-            balanceOfWant().add(estimatedProfit()).add(
-                sUSDToWant(balanceOfSusdInVault().add(balanceOfSusd()))
-            );
-        uint256 totalLiabilities = sUSDToWant(balanceOfDebt());
-        // NOTE: the ternary operator is required because debt can be higher than assets
-        // due to i) increase in debt or ii) losses in invested assets
-        return
-            totalAssets > totalLiabilities
-                ? totalAssets.sub(totalLiabilities)
-                : 0;
+        return _estimatedTotalAssets(_loadPosition());
     }
 
     function prepareReturn(uint256 _debtOutstanding)
@@ -168,10 +395,25 @@ contract Strategy is BaseStrategy {
     {
         uint256 totalDebt = vault.strategies(address(this)).totalDebt;
 
-        claimProfits();
-        vestNextRewardsEntry();
+        // harvest rebuilds the cache when the resolver itself moved (one call).
+        // Contracts upgraded behind the same resolver are checked off-chain with
+        // isResolverCached, and the keeper calls rebuildCache for them
+        IAddressResolver _resolver = resolver();
+        if (_resolver != cachedResolver) {
+            _rebuildCache(_resolver);
+        }
+
+        PositionSnapshot memory _position = _loadPosition();
+        // new debt is only issued before the vault reports if it is not claiming any
+        (uint256 _feesClaimed, uint256 _rewardsClaimed) =
+            claimProfits(_position, _debtOutstanding == 0);
+        uint256 _entriesVested = vestRewardsEntries();
+        if (_entriesVested > 0) {
+            // vested want moves from escrow to balance (collateral does not change)
+            _position.balanceOfWant = balanceOfWant();
+        }
 
-        uint256 totalAssetsAfterProfit = estimatedTotalAssets();
+        uint256 totalAssetsAfterProfit = _estimatedTotalAssets(_position);
 
         _profit = totalAssetsAfterProfit > totalDebt
             ? totalAssetsAfterProfit.sub(totalDebt)
@@ -186,59 +428,52 @@ contract Strategy is BaseStrategy {
             if (_loss > 0) {
                 _profit = 0;
             }
+            _refreshPosition(_position);
         }
+
+        _emitPositionUpdated(
+            PREPARE_RETURN,
+            _position,
+            _feesClaimed,
+            _rewardsClaimed,
+            _entriesVested
+        );
     }
 
     function adjustPosition(uint256 _debtOutstanding) internal override {
-        if (emergencyExit) {
-            return;
-        }
+        PositionSnapshot memory _position = _loadPosition();
 
-        if (_debtOutstanding >= balanceOfWant()) {
+        // harvest skips prepareReturn during an emergency exit
+        if (emergencyExit || _debtOutstanding >= _position.balanceOfWant) {
+            _emitPositionUpdated(ADJUST_POSITION, _position, 0, 0, 0);
             return;
         }
 
-        // compare current ratio with target ratio
-        uint256 _currentRatio = getCurrentRatio();
-        // NOTE: target debt ratio is over 20% to maximize APY
-        uint256 _targetRatio = getTargetRatio();
-        uint256 _issuanceRatio = getIssuanceRatio();
-        // burn debt (sUSD) if the ratio is too high
-        // collateralisation_ratio = debt / collat
-
-        if (
-            _currentRatio > _targetRatio &&
-            _currentRatio.sub(_targetRatio) >= ratioThreshold
-        ) {
-            // NOTE: min threshold to act on differences = 1e16 (ratioThreshold)
+        (bool _repay, uint256 _amount) = _rebalance(_position);
+        if (_repay) {
             // current debt ratio might be unhealthy
             // we need to repay some debt to get back to the optimal range
-            uint256 _debtToRepay =
-                balanceOfDebt().sub(getTargetDebt(_collateral()));
-            repayDebt(_debtToRepay);
-        } else if (
-            _issuanceRatio > _currentRatio &&
-            _issuanceRatio.sub(_currentRatio) >= ratioThreshold
-        ) {
-            // NOTE: min threshold to act on differences = 1e16 (ratioThreshold)
-            // if there is enough collateral to issue Synth, issue it
-            // this should put the c-ratio around 500% (i.e. debt ratio around 20%)
-            uint256 _maxSynths = _synthetix().maxIssuableSynths(address(this));
-            uint256 _debtBalance = balanceOfDebt();
-            // only issue new debt if it is going to be used
-            if (
-                _maxSynths > _debtBalance &&
-                _maxSynths.sub(_debtBalance) >= MIN_ISSUE
-            ) {
-                _synthetix().issueMaxSynths();
+            uint256 _debtBalance = _position.debt;
+            repayDebt(_amount, _position);
+            // nothing is repaid during the minimum stake time
+            if (_position.debt < _debtBalance) {
+                lastRepayTime = uint64(block.timestamp);
             }
+        } else if (_amount > 0) {
+            // this should put the c-ratio around 500% (i.e. debt ratio around 20%)
+            _synthetix().issueMaxSynths();
+            lastIssueTime = uint64(block.timestamp);
+            _refreshPosition(_position);
         }
 
         // If there is susd in the strategy, send it to the susd vault
         // We do MIN_ISSUE instead of 0 since it might be dust
-        if (balanceOfSusd() >= MIN_ISSUE) {
+        if (_position.balanceOfSusd >= MIN_ISSUE) {
             susdVault.deposit();
+            _position.balanceOfSusdInVault = balanceOfSusdInVault();
         }
+
+        _emitPositionUpdated(ADJUST_POSITION, _position, 0, 0, 0);
     }
 
     function liquidatePosition(uint256 _amountNeeded)
@@ -252,16 +487,25 @@ contract Strategy is BaseStrategy {
         uint256 unlockedWant = _unlockedWant();
         if (unlockedWant < _amountNeeded) {
             // NOTE: we use _unlockedWant because `want` balance is the total amount of staked + unstaked want (SNX)
-            reduceLockedCollateral(_amountNeeded.sub(unlockedWant));
+            reduceLockedCollateral(
+                _amountNeeded.sub(unlockedWant),
+                unlockedWant,
+                _loadPosition()
+            );
+
+            // Fetch the unlocked collateral for a second time
+            // to update after repaying debt
+            unlockedWant = _unlockedWant();
         }
 
-        // Fetch the unlocked collateral for a second time
-        // to update after repaying debt
-        unlockedWant = _unlockedWant();
         // if not enough want in balance, it means the strategy lost `want`
+        // unless debt could not be burnt yet: the want is still there, locked until
+        // nextBurnableTimestamp, and the rest is freed by a later withdrawal or harvest
         if (_amountNeeded > unlockedWant) {
             _liquidatedAmount = unlockedWant;
-            _loss = _amountNeeded.sub(unlockedWant);
+            if (_issuer().canBurnSynths(address(this))) {
+                _loss = _amountNeeded.sub(unlockedWant);
+            }
         } else {
             _liquidatedAmount = _amountNeeded;
         }
@@ -269,28 +513,66 @@ contract Strategy is BaseStrategy {
 
     function prepareMigration(address _newStrategy) internal override {
         liquidatePosition(vault.strategies(address(this)).totalDebt);
+        _nominateEscrowMerge(_newStrategy);
+    }
+
+    // The escrow entries left to vest go to the new strategy (see mergeEscrowEntries)
+    // instead of vesting here for up to 52 weeks. RewardEscrowV2 only merges accounts
+    // without debt while its merging window is open, otherwise they stay here as before
+    function _nominateEscrowMerge(address _newStrategy) internal {
+        uint256 _entries = uint256(entryIDQueue.tail).sub(entryIDQueue.head);
+        if (_entries == 0) {
+            return;
+        }
+        IRewardEscrowV2 re = _rewardEscrowV2();
+        if (!re.accountMergingIsOpen()) {
+            return;
+        }
+
+        // the escrow is collateral: liquidatePosition leaves the debt it backs
+        PositionSnapshot memory _position = _loadPosition();
+        repayDebt(_position.debt, _position);
+        if (_position.debt == 0) {
+            re.nominateAccountToMerge(_newStrategy);
+            emit EscrowMergeNominated(_newStrategy, _entries);
+        }
     }
 
     // ********************** OPERATIONS FUNCTIONS **********************
 
-    function reduceLockedCollateral(uint256 amountToFree) internal {
+    function reduceLockedCollateral(
+        uint256 amountToFree,
+        uint256 _unlocked,
+        PositionSnapshot memory _position
+    ) internal {
         // amountToFree cannot be higher than the amount that is unlockable
-        amountToFree = Math.min(amountToFree, _unlockableWant());
+        // collateral includes escrowed SNX, we may not be able to unlock the full
+        // we can only unlock this by repaying debt
+        amountToFree = Math.min(
+            amountToFree,
+            _position.balanceOfWant.sub(_unlocked)
+        );
 
         if (amountToFree == 0) {
             return;
         }
 
-        uint256 _currentDebt = balanceOfDebt();
-        uint256 _newCollateral = _lockedCollateral().sub(amountToFree);
-        uint256 _targetDebt = _newCollateral.mul(getIssuanceRatio()).div(1e18);
-        // NOTE: _newCollateral will always be < _lockedCollateral() so _targetDebt will always be < _currentDebt
+        uint256 _currentDebt = _position.debt;
+        // collateral includes `want` balance (both locked and unlocked) AND escrowed balance
+        uint256 _lockedCollateral = _position.collateral.sub(_unlocked);
+        uint256 _newCollateral = _lockedCollateral.sub(amountToFree);
+        uint256 _targetDebt =
+            _newCollateral.mul(_position.issuanceRatio).div(1e18);
+        // NOTE: _newCollateral will always be < _lockedCollateral so _targetDebt will always be < _currentDebt
         uint256 _amountToRepay = _currentDebt.sub(_targetDebt);
 
-        repayDebt(_amountToRepay);
+        repayDebt(_amountToRepay, _position);
     }
 
-    function repayDebt(uint256 amountToRepay) internal {
+    function repayDebt(
+        uint256 amountToRepay,
+        PositionSnapshot memory _position
+    ) internal {
         // debt can grow over the amount of sUSD minted (see Synthetix docs)
         // if that happens, we might not have enough sUSD to repay debt
         // if we withdraw in this situation, we need to sell `want` to repay debt and would have losses
@@ -298,8 +580,46 @@ contract Strategy is BaseStrategy {
         if (amountToRepay == 0) {
             return;
         }
-        uint256 repaidAmount = 0;
-        uint256 _debtBalance = balanceOfDebt();
+        uint256 _debtBalance = _position.debt;
+        DeleveragePlan memory _plan =
+            _planDeleverage(amountToRepay, _position);
+        // burns are subject to minimumStakePeriod (see Synthetix docs)
+        // the repayment waits for the next harvest or tend, nothing is sold meanwhile
+        if (!_plan.canBurn) {
+            emit RepayDeferred(_plan.amountToRepay, nextBurnableTimestamp());
+            return;
+        }
+
+        if (_plan.fromVault > 0) {
+            withdrawFromSUSDVault(_plan.fromVault, _position);
+        }
+        // the vault may return a few wei less than planned (share rounding)
+        uint256 repaidAmount =
+            Math.min(_plan.burnBeforeSwap, _position.balanceOfSusd);
+        if (repaidAmount > 0) {
+            _synthetix().burnSynths(repaidAmount);
+        }
+        buySusdWithWant(_plan.susdToBuy);
+        uint256 _burnAfterSwap =
+            Math.min(_plan.burnAfterSwap, balanceOfSusd());
+        if (_burnAfterSwap > 0) {
+            _synthetix().burnSynths(_burnAfterSwap);
+            repaidAmount = repaidAmount.add(_burnAfterSwap);
+        }
+        _refreshPosition(_position);
+        emit RepayDebt(repaidAmount, _debtBalance.sub(repaidAmount));
+    }
+
+    // Works out in a single pass where the sUSD to repay `amountToRepay` comes from:
+    // the strategy's balance, then the sUSD vault, then selling unlocked `want`.
+    // Selling before burning takes a single burn, it is only possible if enough `want` is
+    // already unlocked. Otherwise the sUSD at hand is burnt first to unlock more `want`,
+    // which is then sold for the remaining sUSD (at most all of it)
+    function _planDeleverage(
+        uint256 amountToRepay,
+        PositionSnapshot memory _position
+    ) internal view returns (DeleveragePlan memory _plan) {
+        uint256 _debtBalance = _position.debt;
         // max amount to be repaid is the total balanceOfDebt
         amountToRepay = Math.min(_debtBalance, amountToRepay);
 
@@ -310,161 +630,339 @@ contract Strategy is BaseStrategy {
         ) {
             amountToRepay = _debtBalance;
         }
+        _plan.amountToRepay = amountToRepay;
+        _plan.canBurn = _issuer().canBurnSynths(address(this));
+        if (amountToRepay == 0 || !_plan.canBurn) {
+            return _plan;
+        }
 
-        uint256 currentSusdBalance = balanceOfSusd();
-        if (amountToRepay > currentSusdBalance) {
-            // there is not enough balance in strategy to repay debt
-
-            // we withdraw from susdvault
-            uint256 _withdrawAmount = amountToRepay.sub(currentSusdBalance);
-            withdrawFromSUSDVault(_withdrawAmount);
-            // we fetch sUSD balance for a second time and check if now there is enough
-            currentSusdBalance = balanceOfSusd();
-            if (amountToRepay > currentSusdBalance) {
-                // there was not enough balance in strategy and sUSDvault to repay debt
-
-                // debt is too high to be repaid using current funds, the strategy should:
-                // 1. repay max amount of debt
-                // 2. sell unlocked want to buy required sUSD to pay remaining debt
-                // 3. repay debt
-
-                if (currentSusdBalance > 0) {
-                    // we burn the full sUSD balance to unlock `want` (SNX) in order to sell
-                    if (burnSusd(currentSusdBalance)) {
-                        // subject to minimumStakePeriod
-                        // if successful burnt, update remaining amountToRepay
-                        // repaidAmount is previous debt minus current debt
-                        repaidAmount = _debtBalance.sub(balanceOfDebt());
-                    }
-                }
-                // buy enough sUSD to repay outstanding debt, selling `want` (SNX)
-                // or maximum sUSD with `want` available
-                uint256 amountToBuy =
-                    Math.min(
-                        _getSusdForWant(_unlockedWant()),
-                        amountToRepay.sub(repaidAmount)
-                    );
-                if (amountToBuy > 0) {
-                    buySusdWithWant(amountToBuy);
-                }
-                // amountToRepay should equal balanceOfSusd() (we just bought `amountToRepay` sUSD)
+        uint256 _susd = _position.balanceOfSusd;
+        if (amountToRepay > _susd) {
+            // same rule as withdrawFromSUSDVault: don't leave less than MIN_ISSUE in the vault
+            uint256 _inVault = _position.balanceOfSusdInVault;
+            _plan.fromVault = amountToRepay.sub(_susd);
+            if (
+                _plan.fromVault > _inVault ||
+                _inVault.sub(_plan.fromVault) <= MIN_ISSUE
+            ) {
+                _plan.fromVault = _inVault;
             }
+            _susd = _susd.add(_plan.fromVault);
+        }
+        if (amountToRepay <= _susd) {
+            _plan.burnAfterSwap = amountToRepay;
+            return _plan;
         }
 
-        // repay sUSD debt by burning the synth
-        if (amountToRepay > repaidAmount) {
-            burnSusd(amountToRepay.sub(repaidAmount)); // this method is subject to minimumStakePeriod (see Synthetix docs)
-            repaidAmount = amountToRepay;
+        uint256 _shortfall = amountToRepay.sub(_susd);
+        uint256 _wantIn = _getWantForSusd(_shortfall);
+        if (_wantIn <= _unlockedWant()) {
+            // sell first and burn once
+            _plan.wantToSell = _wantIn;
+            _plan.susdToBuy = _shortfall;
+            _plan.burnAfterSwap = amountToRepay;
+            return _plan;
         }
-        emit RepayDebt(repaidAmount, _debtBalance.sub(repaidAmount));
+
+        // burn, sell and burn again
+        _plan.burnBeforeSwap = _susd;
+        uint256 _unlocked =
+            _unlockedWantAfterBurn(_debtBalance.sub(_susd), _position);
+        if (_wantIn <= _unlocked) {
+            _plan.wantToSell = _wantIn;
+            _plan.susdToBuy = _shortfall;
+        } else {
+            _plan.wantToSell = _unlocked;
+            _plan.susdToBuy = _getSusdForWant(_unlocked);
+        }
+        _plan.burnAfterSwap = _plan.susdToBuy;
+    }
+
+    // how repayDebt would repay `_amountToRepay` sUSD of debt now (for operators)
+    function getDeleveragePlan(uint256 _amountToRepay)
+        external
+        view
+        returns (DeleveragePlan memory)
+    {
+        return _planDeleverage(_amountToRepay, _loadPosition());
     }
 
     // two profit sources: Synthetix protocol and Yearn sUSD Vault
-    function claimProfits() internal returns (bool) {
+    // returns the fees (sUSD) and rewards (want) claimed from Synthetix
+    function claimProfits(PositionSnapshot memory _position, bool _canIssue)
+        internal
+        returns (uint256 _feesClaimed, uint256 _rewardsClaimed)
+    {
         uint256 feesAvailable;
         uint256 rewardsAvailable;
         (feesAvailable, rewardsAvailable) = _getFeesAvailable();
-
+        // claim fees (in sUSD) and rewards (in want (SNX)) from Synthetix
+        bool _claim;
         if (feesAvailable > 0 || rewardsAvailable > 0) {
-            // claim fees from Synthetix
-            // claim fees (in sUSD) and rewards (in want (SNX))
-            // Synthetix protocol requires issuers to have a c-ratio above 500%
-            // to be able to claim fees so we need to burn some sUSD
-
-            // NOTE: we use issuanceRatio because that is what will put us on 500% c-ratio (i.e. 20% debt ratio)
-            uint256 _targetDebt =
-                getIssuanceRatio().mul(wantToSUSD(_collateral())).div(1e18);
-            uint256 _balanceOfDebt = balanceOfDebt();
-            bool claim = true;
-
-            if (_balanceOfDebt > _targetDebt) {
-                uint256 _requiredPayment = _balanceOfDebt.sub(_targetDebt);
-                uint256 _maxCash =
-                    balanceOfSusd().add(balanceOfSusdInVault()).mul(50).div(
-                        100
-                    );
-                // only claim rewards if the required payment to burn debt up to c-ratio 500%
-                // is less than 50% of available cash (both in strategy and in sUSD vault)
-                claim = _requiredPayment <= _maxCash;
+            _claim = _canClaimFees(_position);
+        }
+
+        SusdFlows memory _flows =
+            _planSusdFlows(_position, _claim, _canIssue);
+        if (_flows.fromVault > 0) {
+            withdrawFromSUSDVault(_flows.fromVault, _position);
+        }
+        if (_flows.burnToTarget > 0) {
+            // we use this method to be able to avoid the waiting period
+            // (see Synthetix Protocol)
+            _synthetix().burnSynthsToTarget();
+        }
+        if (_claim) {
+            // if a vesting entry is going to be created,
+            // we save its ID to keep track of its vesting
+            if (rewardsAvailable > 0) {
+                entryIDQueue.push(_rewardEscrowV2().nextEntryId());
             }
+            // claimFees() will claim both sUSD fees and put SNX rewards in the escrow (in the prev. saved entry)
+            _feePool().claimFees();
+            _feesClaimed = feesAvailable;
+            _rewardsClaimed = rewardsAvailable;
+        }
+        if (_flows.toIssue > 0) {
+            _synthetix().issueSynths(_flows.toIssue);
+            lastIssueTime = uint64(block.timestamp);
+        }
+        if (_flows.burnToTarget > 0 || _claim || _flows.toIssue > 0) {
+            // fees are paid in sUSD and rewards are escrowed (i.e. collateral)
+            _refreshPosition(_position);
+        }
 
-            if (claim) {
-                // we need to burn sUSD to target
-                burnSusdToTarget();
-
-                // if a vesting entry is going to be created,
-                // we save its ID to keep track of its vesting
-                if (rewardsAvailable > 0) {
-                    entryIDs.push(_rewardEscrowV2().nextEntryId());
-                }
-                // claimFees() will claim both sUSD fees and put SNX rewards in the escrow (in the prev. saved entry)
-                _feePool().claimFees();
+        // sell profits in sUSD for want (SNX) using router
+        uint256 _balance = _position.balanceOfSusd;
+        if (_balance > _flows.toDeposit) {
+            buyWantWithSusd(_balance.sub(_flows.toDeposit));
+            _refreshPosition(_position);
+        }
+    }
+
+    // Works out the sUSD a harvest burns, collects and issues before moving any of it.
+    // The vault profit is sold for want, and the debt adjustPosition would issue right
+    // after it is deposited: when both happen, the debt is issued first and pays for the
+    // sale, so that the vault only receives what is left (or only gives what is missing)
+    function _planSusdFlows(
+        PositionSnapshot memory _position,
+        bool _claim,
+        bool _canIssue
+    ) internal view returns (SusdFlows memory _flows) {
+        uint256 _debt = _position.debt;
+        if (_claim) {
+            // burnSynthsToTarget burns enough Synths to get back to 500% c-ratio
+            // NOTE: amount of synths at 500% c-ratio (with current collateral)
+            uint256 _maxSynths = _synthetix().maxIssuableSynths(address(this));
+            if (_debt > _maxSynths) {
+                _flows.burnToTarget = _debt.sub(_maxSynths);
+                _debt = _maxSynths;
             }
         }
 
-        // claim profits from Yearn sUSD Vault
-        if (balanceOfDebt() < balanceOfSusdInVault()) {
-            // balance
-            uint256 _valueToWithdraw =
-                balanceOfSusdInVault().sub(balanceOfDebt());
-            withdrawFromSUSDVault(_valueToWithdraw);
+        // the sUSD to burn that is not in balance comes from the vault
+        uint256 _inVault = _position.balanceOfSusdInVault;
+        if (_flows.burnToTarget > _position.balanceOfSusd) {
+            _flows.fromVault = _flows.burnToTarget.sub(
+                _position.balanceOfSusd
+            );
+            _inVault = _inVault > _flows.fromVault
+                ? _inVault.sub(_flows.fromVault)
+                : 0;
+        }
+        if (_inVault > _debt) {
+            _flows.vaultProfit = _inVault.sub(_debt);
         }
 
-        // sell profits in sUSD for want (SNX) using router
-        uint256 _balance = balanceOfSusd();
-        if (_balance > 0) {
-            buyWantWithSusd(_balance);
+        // burning to target and issuing are exclusive (over / under the issuance ratio)
+        if (_canIssue && _flows.vaultProfit > 0 && _flows.burnToTarget == 0) {
+            (bool _repay, uint256 _amount) = _rebalance(_position);
+            if (!_repay) {
+                _flows.toIssue = _amount;
+            }
+        }
+        if (_flows.vaultProfit > _flows.toIssue) {
+            _flows.fromVault = _flows.fromVault.add(
+                _flows.vaultProfit.sub(_flows.toIssue)
+            );
+        } else {
+            _flows.toDeposit = _flows.toIssue.sub(_flows.vaultProfit);
+        }
+    }
+
+    // how the next harvest would move sUSD now (for operators)
+    function getSusdFlows() external view returns (SusdFlows memory) {
+        PositionSnapshot memory _position = _loadPosition();
+        (uint256 _fees, uint256 _rewards) = _getFeesAvailable();
+        bool _claim;
+        if (_fees > 0 || _rewards > 0) {
+            _claim = _canClaimFees(_position);
         }
+        return
+            _planSusdFlows(_position, _claim, vault.debtOutstanding() == 0);
     }
 
-    function vestNextRewardsEntry() internal {
+    // Synthetix protocol requires issuers to have a c-ratio above 500%
+    // to be able to claim fees so we need to burn some sUSD
+    function _canClaimFees(PositionSnapshot memory _position)
+        internal
+        pure
+        returns (bool)
+    {
+        // NOTE: we use issuanceRatio because that is what will put us on 500% c-ratio (i.e. 20% debt ratio)
+        uint256 _targetDebt =
+            _position
+                .issuanceRatio
+                .mul(wantToSUSD(_position.collateral, _position.snxRate))
+                .div(1e18);
+        if (_position.debt <= _targetDebt) {
+            return true;
+        }
+
+        uint256 _requiredPayment = _position.debt.sub(_targetDebt);
+        uint256 _maxCash =
+            _position
+                .balanceOfSusd
+                .add(_position.balanceOfSusdInVault)
+                .mul(50)
+                .div(100);
+        // only claim rewards if the required payment to burn debt up to c-ratio 500%
+        // is less than 50% of available cash (both in strategy and in sUSD vault)
+        return _requiredPayment <= _maxCash;
+    }
+
+    // returns the number of entries vested
+    function vestRewardsEntries() internal returns (uint256) {
         // Synthetix protocol sends SNX staking rewards to a escrow contract that keeps them 52 weeks, until they vest
         // each time we claim the SNX rewards, a VestingEntry is created in the escrow contract for the amount that was owed
         // we need to keep track of those VestingEntries to know when they vest and claim them
         // after they vest and we claim them, we will receive them in our balance (strategy's balance)
-        if (entryIDs.length == 0) {
-            return;
+        IRewardEscrowV2 re = _rewardEscrowV2();
+        uint256[] memory _entries = _getVestableEntryIDs(re);
+        if (_entries.length == 0) {
+            return 0;
         }
 
-        // The strategy keeps track of the next VestingEntry expected to vest and only when it has vested, it checks the next one
-        // this works because the VestingEntries record has been saved in chronological order and they will vest in chronological order too
-        IRewardEscrowV2 re = _rewardEscrowV2();
-        uint256 nextEntryID = entryIDs[entryIDIndex];
-        uint256 _claimable =
-            re.getVestingEntryClaimable(address(this), nextEntryID);
-        // check if we need to vest
-        if (_claimable == 0) {
-            return;
+        // vest every matured entry at once
+        // entries that have already been vested are worth 0 and only move the cursor
+        if (re.getVestingQuantity(address(this), _entries) > 0) {
+            re.vest(_entries);
+        }
+
+        // we update the entryIDIndex to point to the next VestingEntry
+        // (this also frees the storage of the vested entryIDs)
+        entryIDQueue.advance(_entries.length);
+        return _entries.length;
+    }
+
+    // same checks as BaseStrategy, but a harvest only pays for its call with what it
+    // collects (see harvestableProfit), not with changes in the value of the position
+    function harvestTrigger(uint256 callCost)
+        public
+        view
+        override
+        returns (bool)
+    {
+        StrategyParams memory params = vault.strategies(address(this));
+        if (params.activation == 0) {
+            return false;
+        }
+
+        uint256 _sinceLastReport = block.timestamp.sub(params.lastReport);
+        if (_sinceLastReport < minReportDelay) {
+            return false;
+        }
+        if (_sinceLastReport >= maxReportDelay) {
+            return true;
+        }
+
+        // the vault is waiting for its debt, and the harvest can free it
+        // (unlocked want or debt to burn, see liquidatePosition)
+        uint256 _debtOutstanding = vault.debtOutstanding();
+        if (
+            _debtOutstanding > debtThreshold &&
+            (_unlockedWant() >= _debtOutstanding ||
+                block.timestamp >= nextBurnableTimestamp())
+        ) {
+            return true;
         }
 
-        // vest entryID
-        uint256[] memory params = new uint256[](1);
-        params[0] = nextEntryID;
-        re.vest(params);
+        PositionSnapshot memory _position = _loadPosition();
+        // losses must be reported
+        if (
+            _estimatedTotalAssets(_position).add(debtThreshold) <
+            params.totalDebt
+        ) {
+            return true;
+        }
 
-        // we update the nextEntryID to point to the next VestingEntry
-        entryIDIndex++;
+        // callCost is in want
+        return
+            profitFactor.mul(callCost) <
+            vault.creditAvailable().add(_harvestableProfit(_position));
     }
 
+    // tend when adjustPosition would repay, or issue debt worth (in want) profitFactor
+    // times the call (callCost is in want, as in harvestTrigger). Repays move the ratio
+    // away from liquidation: they are not weighed against the cost of the call
     function tendTrigger(uint256 callCost) public view override returns (bool) {
-        uint256 _currentRatio = getCurrentRatio(); // debt / collateral
-        uint256 _targetRatio = getTargetRatio(); // max debt ratio. over this number, we consider debt unhealthy
-        uint256 _issuanceRatio = getIssuanceRatio(); // preferred debt ratio by Synthetix (See protocol docs)
-
-        if (_currentRatio < _issuanceRatio) {
-            // strategy needs to take more debt
-            // only return true if the difference is greater than a threshold
-            return _issuanceRatio.sub(_currentRatio) >= ratioThreshold;
-        } else if (_currentRatio <= _targetRatio) {
-            // strategy is in optimal range (a bit undercollateralised)
+        PositionSnapshot memory _position = _loadPosition();
+        (bool _repay, uint256 _amount) = _rebalance(_position);
+        if (_amount == 0) {
             return false;
-        } else if (_currentRatio > _targetRatio) {
-            // the strategy needs to repay debt to exit the danger zone
-            // only return true if the difference is greater than a threshold
-            return _currentRatio.sub(_targetRatio) >= ratioThreshold;
         }
+        // the tend would not repay anything during the minimum stake time
+        if (_repay) {
+            return block.timestamp >= nextBurnableTimestamp();
+        }
+        return
+            profitFactor.mul(callCost) <
+            sUSDToWant(_amount, _position.snxRate);
+    }
 
-        return false;
+    // debt (sUSD) that adjustPosition repays (_repay) or issues, 0 if it does nothing.
+    // debt ratio = debt / collateral: over targetRatio the debt is unhealthy,
+    // under issuanceRatio (preferred debt ratio by Synthetix) it can take more
+    function _rebalance(PositionSnapshot memory _position)
+        internal
+        view
+        returns (bool _repay, uint256 _amount)
+    {
+        uint256 _currentRatio = _position.currentRatio;
+        uint256 _targetRatio = _position.targetRatio;
+        uint256 _issuanceRatio = _position.issuanceRatio;
+
+        if (
+            _currentRatio > _targetRatio &&
+            _currentRatio.sub(_targetRatio) >= repayRatioThreshold
+        ) {
+            _repay = true;
+            if (
+                block.timestamp >=
+                uint256(lastRepayTime).add(minRebalanceInterval)
+            ) {
+                _amount = _position.debt.sub(
+                    getTargetDebt(_position.collateral, _position)
+                );
+            }
+        } else if (
+            _issuanceRatio > _currentRatio &&
+            _issuanceRatio.sub(_currentRatio) >= issueRatioThreshold &&
+            // a harvest can issue twice: in prepareReturn to pay for the sale of the
+            // vault profit and in adjustPosition for the credit of the vault
+            (lastIssueTime == block.timestamp ||
+                block.timestamp >=
+                uint256(lastIssueTime).add(minRebalanceInterval))
+        ) {
+            uint256 _maxSynths = _synthetix().maxIssuableSynths(address(this));
+            // only issue new debt if it is going to be used
+            if (
+                _maxSynths > _position.debt &&
+                _maxSynths.sub(_position.debt) >= MIN_ISSUE
+            ) {
+                _amount = _maxSynths.sub(_position.debt);
+            }
+        }
     }
 
     function protectedTokens()
@@ -476,44 +974,15 @@ contract Strategy is BaseStrategy {
 
     // ********************** SUPPORT FUNCTIONS  **********************
 
-    function burnSusd(uint256 _amount) internal returns (bool) {
-        // returns false if unsuccessful
-        if (_issuer().canBurnSynths(address(this))) {
-            _synthetix().burnSynths(_amount);
-            return true;
-        } else {
-            return false;
-        }
-    }
-
-    function burnSusdToTarget() internal returns (uint256) {
-        // we use this method to be able to avoid the waiting period
-        // (see Synthetix Protocol)
-        // it burns enough Synths to get back to 500% c-ratio
-        // we need to have enough sUSD to burn to target
-        uint256 _debtBalance = balanceOfDebt();
-        // NOTE: amount of synths at 500% c-ratio (with current collateral)
-        uint256 _maxSynths = _synthetix().maxIssuableSynths(address(this));
-        if (_debtBalance <= _maxSynths) {
-            // we are over the 500% c-ratio (i.e. below 20% debt ratio), we don't need to burn sUSD
-            return 0;
-        }
-        uint256 _amountToBurn = _debtBalance.sub(_maxSynths);
-        uint256 _balance = balanceOfSusd();
-        if (_balance < _amountToBurn) {
-            // if we do not have enough in balance, we withdraw funds from sUSD vault
-            withdrawFromSUSDVault(_amountToBurn.sub(_balance));
-        }
-
-        if (_amountToBurn > 0) _synthetix().burnSynthsToTarget();
-        return _amountToBurn;
-    }
-
-    function withdrawFromSUSDVault(uint256 _amount) internal {
+    function withdrawFromSUSDVault(
+        uint256 _amount,
+        PositionSnapshot memory _position
+    ) internal {
         // Don't leave less than MIN_ISSUE sUSD in the vault
+        uint256 _balanceInVault = _position.balanceOfSusdInVault;
         if (
-            _amount > balanceOfSusdInVault() ||
-            balanceOfSusdInVault().sub(_amount) <= MIN_ISSUE
+            _amount > _balanceInVault ||
+            _balanceInVault.sub(_amount) <= MIN_ISSUE
         ) {
             susdVault.withdraw();
         } else {
@@ -521,6 +990,8 @@ contract Strategy is BaseStrategy {
                 _amount.mul(1e18).div(susdVault.pricePerShare());
             susdVault.withdraw(_sharesToWithdraw);
         }
+        _position.balanceOfSusd = balanceOfSusd();
+        _position.balanceOfSusdInVault = balanceOfSusdInVault();
     }
 
     function buyWantWithSusd(uint256 _amount) internal {
@@ -528,12 +999,7 @@ contract Strategy is BaseStrategy {
             return;
         }
 
-        address[] memory path = new address[](3);
-        path[0] = address(susd);
-        path[1] = address(WETH);
-        path[2] = address(want);
-
-        router.swapExactTokensForTokens(_amount, 0, path, address(this), now);
+        _swapExactTokensForTokens(susd, address(want), _amount);
     }
 
     function buySusdWithWant(uint256 _amount) internal {
@@ -541,19 +1007,220 @@ contract Strategy is BaseStrategy {
             return;
         }
 
-        address[] memory path = new address[](3);
-        path[0] = address(want);
-        path[1] = address(WETH);
-        path[2] = address(susd);
-
         // we use swapTokensForExactTokens because we need an exact sUSD amount
-        router.swapTokensForExactTokens(
-            _amount,
-            type(uint256).max,
-            path,
-            address(this),
-            now
-        );
+        _swapTokensForExactTokens(address(want), susd, _amount);
+    }
+
+    // ********************** SWAPS **********************
+
+    // Swaps are quoted on both venues over every path in swapPaths and executed on the best quote.
+    // Large orders are split in halves between both venues when the combined price impact is lower.
+    // Quotes come from the same block, so they are used as the swap limits
+
+    function _swapExactTokensForTokens(
+        address _from,
+        address _to,
+        uint256 _amountIn
+    ) internal {
+        ISushiRouter _main = router;
+        ISushiRouter _other = _otherRouter();
+        (address[] memory _mainPath, uint256 _mainOut) =
+            _bestPathOut(_main, _from, _to, _amountIn);
+        (address[] memory _otherPath, uint256 _otherOut) =
+            _bestPathOut(_other, _from, _to, _amountIn);
+
+        if (_mainOut > 0 && _otherOut > 0) {
+            uint256 _half = _amountIn.div(2);
+            uint256 _mainSplitOut = _quoteOut(_main, _mainPath, _half);
+            uint256 _otherSplitOut =
+                _quoteOut(_other, _otherPath, _amountIn.sub(_half));
+            uint256 _minSplitOut =
+                Math.max(_mainOut, _otherOut)
+                    .mul(MAX_BPS.add(minSplitImprovement))
+                    .div(MAX_BPS);
+            if (_mainSplitOut.add(_otherSplitOut) > _minSplitOut) {
+                _main.swapExactTokensForTokens(
+                    _half,
+                    _mainSplitOut,
+                    _mainPath,
+                    address(this),
+                    now
+                );
+                _other.swapExactTokensForTokens(
+                    _amountIn.sub(_half),
+                    _otherSplitOut,
+                    _otherPath,
+                    address(this),
+                    now
+                );
+                return;
+            }
+        }
+
+        if (_otherOut > _mainOut) {
+            _other.swapExactTokensForTokens(
+                _amountIn,
+                _otherOut,
+                _otherPath,
+                address(this),
+                now
+            );
+        } else if (_mainOut > 0) {
+            _main.swapExactTokensForTokens(
+                _amountIn,
+                _mainOut,
+                _mainPath,
+                address(this),
+                now
+            );
+        }
+        // NOTE: if no venue returns anything for _amountIn, it is dust and it is not swapped
+    }
+
+    function _swapTokensForExactTokens(
+        address _from,
+        address _to,
+        uint256 _amountOut
+    ) internal {
+        ISushiRouter _main = router;
+        ISushiRouter _other = _otherRouter();
+        (address[] memory _mainPath, uint256 _mainIn) =
+            _bestPathIn(_main, _from, _to, _amountOut);
+        (address[] memory _otherPath, uint256 _otherIn) =
+            _bestPathIn(_other, _from, _to, _amountOut);
+
+        if (_mainIn < NO_QUOTE && _otherIn < NO_QUOTE) {
+            uint256 _half = _amountOut.div(2);
+            uint256 _mainSplitIn = _quoteIn(_main, _mainPath, _half);
+            uint256 _otherSplitIn =
+                _quoteIn(_other, _otherPath, _amountOut.sub(_half));
+            if (
+                _mainSplitIn < NO_QUOTE &&
+                _otherSplitIn < NO_QUOTE &&
+                _mainSplitIn
+                    .add(_otherSplitIn)
+                    .mul(MAX_BPS.add(minSplitImprovement))
+                    .div(MAX_BPS) <
+                Math.min(_mainIn, _otherIn)
+            ) {
+                _main.swapTokensForExactTokens(
+                    _half,
+                    _mainSplitIn,
+                    _mainPath,
+                    address(this),
+                    now
+                );
+                _other.swapTokensForExactTokens(
+                    _amountOut.sub(_half),
+                    _otherSplitIn,
+                    _otherPath,
+                    address(this),
+                    now
+                );
+                return;
+            }
+        }
+
+        // NOTE: reverts if there is no route on any venue
+        if (_otherIn < _mainIn) {
+            _other.swapTokensForExactTokens(
+                _amountOut,
+                _otherIn,
+                _otherPath,
+                address(this),
+                now
+            );
+        } else {
+            _main.swapTokensForExactTokens(
+                _amountOut,
+                _mainIn,
+                _mainPath,
+                address(this),
+                now
+            );
+        }
+    }
+
+    function _otherRouter() internal view returns (ISushiRouter) {
+        return router == uniswap ? sushiswap : uniswap;
+    }
+
+    // best path on `_router` to sell `_amountIn` of `_from` (0 if there is none)
+    function _bestPathOut(
+        ISushiRouter _router,
+        address _from,
+        address _to,
+        uint256 _amountIn
+    ) internal view returns (address[] memory _bestPath, uint256 _bestOut) {
+        for (uint256 i = 0; i < swapPaths.length; i++) {
+            address[] memory _path = _buildPath(_from, swapPaths[i], _to);
+            uint256 _amountOut = _quoteOut(_router, _path, _amountIn);
+            if (_amountOut > _bestOut) {
+                _bestOut = _amountOut;
+                _bestPath = _path;
+            }
+        }
+    }
+
+    // best path on `_router` to buy `_amountOut` of `_to` (NO_QUOTE if there is none)
+    function _bestPathIn(
+        ISushiRouter _router,
+        address _from,
+        address _to,
+        uint256 _amountOut
+    ) internal view returns (address[] memory _bestPath, uint256 _bestIn) {
+        _bestIn = NO_QUOTE;
+        for (uint256 i = 0; i < swapPaths.length; i++) {
+            address[] memory _path = _buildPath(_from, swapPaths[i], _to);
+            uint256 _amountIn = _quoteIn(_router, _path, _amountOut);
+            if (_amountIn < _bestIn) {
+                _bestIn = _amountIn;
+                _bestPath = _path;
+            }
+        }
+    }
+
+    function _quoteOut(
+        ISushiRouter _router,
+        address[] memory _path,
+        uint256 _amountIn
+    ) internal view returns (uint256) {
+        // reverts if one of the pairs does not exist on this venue
+        try _router.getAmountsOut(_amountIn, _path) returns (
+            uint256[] memory _amounts
+        ) {
+            return _amounts[_amounts.length - 1];
+        } catch {
+            return 0;
+        }
+    }
+
+    function _quoteIn(
+        ISushiRouter _router,
+        address[] memory _path,
+        uint256 _amountOut
+    ) internal view returns (uint256) {
+        // reverts if one of the pairs does not exist or does not have enough liquidity
+        try _router.getAmountsIn(_amountOut, _path) returns (
+            uint256[] memory _amounts
+        ) {
+            return _amounts[0];
+        } catch {
+            return NO_QUOTE;
+        }
+    }
+
+    function _buildPath(
+        address _from,
+        address[] memory _hops,
+        address _to
+    ) internal pure returns (address[] memory _path) {
+        _path = new address[](_hops.length.add(2));
+        _path[0] = _from;
+        for (uint256 i = 0; i < _hops.length; i++) {
+            _path[i + 1] = _hops[i];
+        }
+        _path[_path.length - 1] = _to;
     }
 
     // ********************** CALCS **********************
@@ -563,32 +1230,150 @@ contract Strategy is BaseStrategy {
 
         (availableFees, ) = _getFeesAvailable();
 
-        return sUSDToWant(availableFees);
+        return sUSDToWant(availableFees, _getSnxRate());
     }
 
-    function getTargetDebt(uint256 _targetCollateral)
+    // want collected by the next harvest: Synthetix fees and rewards (if they can be claimed),
+    // escrow entries that have vested and sUSD vault profits (sUSD over the debt)
+    function harvestableProfit() external view returns (uint256) {
+        return _harvestableProfit(_loadPosition());
+    }
+
+    function _harvestableProfit(PositionSnapshot memory _position)
         internal
+        view
+        returns (uint256 _profit)
+    {
+        (uint256 _fees, uint256 _rewards) = _getFeesAvailable();
+        if ((_fees > 0 || _rewards > 0) && _canClaimFees(_position)) {
+            // rewards are escrowed but they are collateral right away
+            _profit = sUSDToWant(_fees, _position.snxRate).add(_rewards);
+        }
+
+        (, uint256 _vestable) = vestableRewards();
+        _profit = _profit.add(_vestable);
+
+        if (_position.balanceOfSusdInVault > _position.debt) {
+            _profit = _profit.add(
+                sUSDToWant(
+                    _position.balanceOfSusdInVault.sub(_position.debt),
+                    _position.snxRate
+                )
+            );
+        }
+    }
+
+    function _estimatedTotalAssets(PositionSnapshot memory _position)
+        internal
+        view
         returns (uint256)
     {
-        uint256 _targetRatio = getTargetRatio();
-        uint256 _collateralInSUSD = wantToSUSD(_targetCollateral);
-        return _targetRatio.mul(_collateralInSUSD).div(1e18);
+        uint256 availableFees; // in sUSD
+        (availableFees, ) = _getFeesAvailable();
+
+        uint256 _snxRate = _position.snxRate;
+        uint256 _susdBalance =
+            _position.balanceOfSusdInVault.add(_position.balanceOfSusd);
+        uint256 totalAssets =
+            _position
+                .balanceOfWant
+                .add(sUSDToWant(availableFees, _snxRate))
+                .add(sUSDToWant(_susdBalance, _snxRate));
+        uint256 totalLiabilities = sUSDToWant(_position.debt, _snxRate);
+        // NOTE: the ternary operator is required because debt can be higher than assets
+        // due to i) increase in debt or ii) losses in invested assets
+        return
+            totalAssets > totalLiabilities
+                ? totalAssets.sub(totalLiabilities)
+                : 0;
     }
 
-    function sUSDToWant(uint256 _amount) internal view returns (uint256) {
+    // entryIDs(i) and entryIDIndex() keep the interface of the former storage array and counter
+    // NOTE: entries already vested may have been pruned, in which case entryIDs(i) returns 0
+    function entryIDs(uint256 _index) external view returns (uint256) {
+        return entryIDQueue.at(_index);
+    }
+
+    // to keep track of next entry to vest
+    function entryIDIndex() public view returns (uint256) {
+        return entryIDQueue.head;
+    }
+
+    function entryIDsLength() external view returns (uint256) {
+        return entryIDQueue.tail;
+    }
+
+    // number of escrow entries and amount of want that the next harvest will vest
+    function vestableRewards()
+        public
+        view
+        returns (uint256 _entries, uint256 _amount)
+    {
+        IRewardEscrowV2 re = _rewardEscrowV2();
+        uint256[] memory _entryIDs = _getVestableEntryIDs(re);
+        _entries = _entryIDs.length;
+        if (_entries > 0) {
+            _amount = re.getVestingQuantity(address(this), _entryIDs);
+        }
+    }
+
+    function _getVestableEntryIDs(IRewardEscrowV2 re)
+        internal
+        view
+        returns (uint256[] memory _entryIDs)
+    {
+        // The strategy keeps track of the next VestingEntry expected to vest
+        // this works because the VestingEntries record has been saved in chronological order and they will vest in chronological order too
+        // so the matured entries are the ones from entryIDIndex up to the first entry that has not matured
+        uint256 _start = entryIDQueue.head;
+        uint256 _end = Math.min(entryIDQueue.tail, _start.add(maxEntriesToVest));
+        uint256 _matured = _start;
+        while (_matured < _end) {
+            (uint64 _endTime, ) =
+                re.getVestingEntry(address(this), entryIDQueue.at(_matured));
+            if (_endTime > now) {
+                break;
+            }
+            _matured++;
+        }
+
+        _entryIDs = new uint256[](_matured.sub(_start));
+        for (uint256 i = 0; i < _entryIDs.length; i++) {
+            _entryIDs[i] = entryIDQueue.at(_start.add(i));
+        }
+    }
+
+    function getTargetDebt(
+        uint256 _targetCollateral,
+        PositionSnapshot memory _position
+    ) internal pure returns (uint256) {
+        uint256 _collateralInSUSD =
+            wantToSUSD(_targetCollateral, _position.snxRate);
+        return _position.targetRatio.mul(_collateralInSUSD).div(1e18);
+    }
+
+    function sUSDToWant(uint256 _amount, uint256 _snxRate)
+        internal
+        pure
+        returns (uint256)
+    {
         if (_amount == 0) {
             return 0;
         }
 
-        return _amount.mul(1e18).div(_exchangeRates().rateForCurrency("SNX"));
+        return _amount.mul(1e18).div(_snxRate);
     }
 
-    function wantToSUSD(uint256 _amount) internal view returns (uint256) {
+    function wantToSUSD(uint256 _amount, uint256 _snxRate)
+        internal
+        pure
+        returns (uint256)
+    {
         if (_amount == 0) {
             return 0;
         }
 
-        return _amount.mul(_exchangeRates().rateForCurrency("SNX")).div(1e18);
+        return _amount.mul(_snxRate).div(1e18);
     }
 
     function _getSusdForWant(uint256 _wantAmount)
@@ -599,32 +1384,225 @@ contract Strategy is BaseStrategy {
         if (_wantAmount == 0) {
             return 0;
         }
-        address[] memory path = new address[](3);
-        path[0] = address(want);
-        path[1] = address(WETH);
-        path[2] = address(susd);
+        // best single venue quote. Buying that amount never needs more want (see _swapTokensForExactTokens)
+        (, uint256 _mainOut) =
+            _bestPathOut(router, address(want), susd, _wantAmount);
+        (, uint256 _otherOut) =
+            _bestPathOut(_otherRouter(), address(want), susd, _wantAmount);
+        return Math.max(_mainOut, _otherOut);
+    }
 
-        uint256[] memory amounts = router.getAmountsOut(_wantAmount, path);
-        return amounts[amounts.length - 1];
+    function _getWantForSusd(uint256 _susdAmount)
+        internal
+        view
+        returns (uint256)
+    {
+        // best single venue quote, the same as _swapTokensForExactTokens uses as its limit
+        (, uint256 _mainIn) =
+            _bestPathIn(router, address(want), susd, _susdAmount);
+        (, uint256 _otherIn) =
+            _bestPathIn(_otherRouter(), address(want), susd, _susdAmount);
+        return Math.min(_mainIn, _otherIn);
     }
 
-    // ********************** BALANCES & RATIOS **********************
-    function _lockedCollateral() internal view returns (uint256) {
-        // collateral includes `want` balance (both locked and unlocked) AND escrowed balance
-        uint256 _collateral = _synthetix().collateral(address(this));
+    // Synthetix locks debt / issuanceRatio worth of want (see Issuer.transferableSynthetix)
+    // rounded up, since Synthetix rounds to the nearest
+    function _unlockedWantAfterBurn(
+        uint256 _debtAfterBurn,
+        PositionSnapshot memory _position
+    ) internal pure returns (uint256) {
+        uint256 _lockedWant =
+            sUSDToWant(_debtAfterBurn, _position.snxRate)
+                .add(1)
+                .mul(1e18)
+                .div(_position.issuanceRatio)
+                .add(1);
+        return
+            _position.balanceOfWant > _lockedWant
+                ? _position.balanceOfWant.sub(_lockedWant)
+                : 0;
+    }
+
+    function getSwapPaths() external view returns (address[][] memory) {
+        return swapPaths;
+    }
+
+    // ********************** POSITION SNAPSHOT **********************
 
-        return _collateral.sub(_unlockedWant());
+    // everything keepers and dashboards need in a single call
+    function getPositionSnapshot()
+        external
+        view
+        returns (PositionSnapshot memory _position)
+    {
+        _position = _loadPosition();
+        _position.unlockedWant = _unlockedWant();
+        _position.balanceOfEscrowedWant = balanceOfEscrowedWant();
+    }
+
+    function _emitPositionUpdated(
+        uint256 _phase,
+        PositionSnapshot memory _position,
+        uint256 _feesClaimed,
+        uint256 _rewardsClaimed,
+        uint256 _entriesVested
+    ) internal {
+        uint256[4] memory _packed;
+        _packed[0] = _pack(
+            _position.debt,
+            _position.collateral,
+            _position.currentRatio
+        );
+        _packed[1] = _pack(
+            _unlockedWant(),
+            balanceOfEscrowedWant(),
+            _position.issuanceRatio
+        );
+        _packed[2] = _pack(
+            _position.balanceOfSusdInVault,
+            _position.snxRate,
+            _position.targetRatio
+        );
+        _packed[3] = _pack(
+            _feesClaimed,
+            _rewardsClaimed,
+            (_entriesVested << 8) | _phase
+        );
+        emit PositionUpdated(_packed);
     }
 
+    function _pack(
+        uint256 _high,
+        uint256 _middle,
+        uint256 _low
+    ) internal pure returns (uint256) {
+        return
+            (Math.min(_high, MAX_UINT96) << 160) |
+            (Math.min(_middle, MAX_UINT96) << 64) |
+            Math.min(_low, MAX_UINT64);
+    }
+
+    function _loadPosition()
+        internal
+        view
+        returns (PositionSnapshot memory _position)
+    {
+        // ratios and rates do not change during a transaction
+        _position.issuanceRatio = getIssuanceRatio();
+        _position.targetRatio = _position
+            .issuanceRatio
+            .mul(targetRatioMultiplier)
+            .div(MAX_BPS);
+        _position.snxRate = _getSnxRate();
+        _refreshPosition(_position);
+    }
+
+    function _refreshPosition(PositionSnapshot memory _position)
+        internal
+        view
+    {
+        _position.debt = balanceOfDebt();
+        _position.collateral = _collateral();
+        // same as Synthetix's collateralisationRatio: debt (in SNX) / collateral
+        _position.currentRatio = _position.collateral == 0
+            ? 0
+            : sUSDToWant(_position.debt, _position.snxRate).mul(1e18).div(
+                _position.collateral
+            );
+        _position.balanceOfWant = balanceOfWant();
+        _position.balanceOfSusd = balanceOfSusd();
+        _position.balanceOfSusdInVault = balanceOfSusdInVault();
+    }
+
+    // ********************** TRIGGER LEVELS **********************
+
+    // Monitors compare the SNX price (or the debt, after a debt snapshot) against
+    // these instead of calling tendTrigger on every update. Each level holds while
+    // the other input does not change: any issue, burn or deposit moves them all
+    function getTriggerPrices()
+        external
+        view
+        returns (TriggerLevels memory _levels)
+    {
+        PositionSnapshot memory _position = _loadPosition();
+        uint256[5] memory _ratios = _triggerRatios(_position);
+        uint256 _debt = _position.debt;
+        uint256 _collateral = _position.collateral;
+        _levels.repay = _priceAtRatio(_debt, _collateral, _ratios[0]);
+        _levels.target = _priceAtRatio(_debt, _collateral, _ratios[1]);
+        _levels.issue = _priceAtRatio(_debt, _collateral, _ratios[2]);
+        _levels.issuance = _priceAtRatio(_debt, _collateral, _ratios[3]);
+        _levels.liquidation = _priceAtRatio(_debt, _collateral, _ratios[4]);
+    }
+
+    function getTriggerDebts()
+        external
+        view
+        returns (TriggerLevels memory _levels)
+    {
+        PositionSnapshot memory _position = _loadPosition();
+        uint256[5] memory _ratios = _triggerRatios(_position);
+        uint256 _collateralInSUSD =
+            wantToSUSD(_position.collateral, _position.snxRate);
+        // as getTargetDebt
+        _levels.repay = _ratios[0].mul(_collateralInSUSD).div(1e18);
+        _levels.target = _ratios[1].mul(_collateralInSUSD).div(1e18);
+        _levels.issue = _ratios[2].mul(_collateralInSUSD).div(1e18);
+        _levels.issuance = _ratios[3].mul(_collateralInSUSD).div(1e18);
+        _levels.liquidation = _ratios[4].mul(_collateralInSUSD).div(1e18);
+    }
+
+    // debt ratios of TriggerLevels, in its order
+    function _triggerRatios(PositionSnapshot memory _position)
+        internal
+        view
+        returns (uint256[5] memory _ratios)
+    {
+        uint256 _issueRatioThreshold = issueRatioThreshold;
+        _ratios[0] = _position.targetRatio.add(repayRatioThreshold);
+        _ratios[1] = _position.targetRatio;
+        _ratios[2] = _position.issuanceRatio > _issueRatioThreshold
+            ? _position.issuanceRatio - _issueRatioThreshold
+            : 0;
+        _ratios[3] = _position.issuanceRatio;
+        _ratios[4] = _systemSettings().liquidationRatio();
+    }
+
+    // SNX price at which _debt over _collateral is a debt ratio of _ratio
+    // (inverse of _refreshPosition), 0 when no price gets it over _ratio
+    function _priceAtRatio(
+        uint256 _debt,
+        uint256 _collateral,
+        uint256 _ratio
+    ) internal pure returns (uint256) {
+        if (_debt == 0 || _collateral == 0) {
+            return 0;
+        }
+        if (_ratio == 0) {
+            return type(uint256).max;
+        }
+        return _debt.mul(1e18).div(_collateral).mul(1e18).div(_ratio);
+    }
+
+    // ********************** BALANCES & RATIOS **********************
+
     // amount of `want` (SNX) that can be transferred, sold, ...
+    // burns (repayments) revert until the minimum stake time after the last issue
+    // is over (same check as Synthetix's Issuer.canBurnSynths)
+    function nextBurnableTimestamp() public view returns (uint256) {
+        IIssuer _issuerContract = _issuer();
+        return
+            _issuerContract.lastIssueEvent(address(this)).add(
+                _issuerContract.minimumStakeTime()
+            );
+    }
+
     function _unlockedWant() internal view returns (uint256) {
         return _synthetix().transferableSynthetix(address(this));
     }
 
-    function _unlockableWant() internal view returns (uint256) {
-        // collateral includes escrowed SNX, we may not be able to unlock the full
-        // we can only unlock this by repaying debt
-        return balanceOfWant().sub(_unlockedWant());
+    function _getSnxRate() internal view returns (uint256) {
+        return _exchangeRates().rateForCurrency("SNX");
     }
 
     function _collateral() internal view returns (uint256) {
@@ -653,6 +1631,12 @@ contract Strategy is BaseStrategy {
         return getIssuanceRatio().mul(targetRatioMultiplier).div(MAX_BPS);
     }
 
+    // kept for keepers and dashboards that read the single threshold of earlier
+    // versions (setRatioThreshold): the repay side, that protects the position
+    function ratioThreshold() external view returns (uint256) {
+        return repayRatioThreshold;
+    }
+
     function balanceOfEscrowedWant() public view returns (uint256) {
         return _rewardEscrowV2().balanceOf(address(this));
     }
@@ -670,10 +1654,11 @@ contract Strategy is BaseStrategy {
     }
 
     function balanceOfSusdInVault() public view returns (uint256) {
+        IVault _susdVault = susdVault;
         return
-            susdVault
+            _susdVault
                 .balanceOf(address(this))
-                .mul(susdVault.pricePerShare())
+                .mul(_susdVault.pricePerShare())
                 .div(1e18);
     }
 
@@ -683,23 +1668,75 @@ contract Strategy is BaseStrategy {
         return IAddressResolver(readProxy.target());
     }
 
+    function resolverAddressesRequired()
+        public
+        pure
+        returns (bytes32[] memory addresses)
+    {
+        addresses = new bytes32[](6);
+        addresses[0] = CONTRACT_SYNTHETIX;
+        addresses[1] = CONTRACT_EXRATES;
+        addresses[2] = CONTRACT_REWARDESCROW_V2;
+        addresses[3] = CONTRACT_ISSUER;
+        addresses[4] = CONTRACT_FEEPOOL;
+        addresses[5] = CONTRACT_SYSTEMSETTINGS;
+    }
+
+    // returns false if the resolver or any of the cached addresses changed.
+    // One external call per address: meant for keepers, not for the hot paths
+    function isResolverCached() public view returns (bool) {
+        IAddressResolver _resolver = resolver();
+        if (_resolver != cachedResolver) {
+            return false;
+        }
+
+        bytes32[] memory required = resolverAddressesRequired();
+        for (uint256 i = 0; i < required.length; i++) {
+            bytes32 name = required[i];
+            if (addressCache[name] != _resolver.getAddress(name)) {
+                return false;
+            }
+        }
+        return true;
+    }
+
+    function _rebuildCache(IAddressResolver _resolver) internal {
+        cachedResolver = _resolver;
+
+        bytes32[] memory required = resolverAddressesRequired();
+        for (uint256 i = 0; i < required.length; i++) {
+            bytes32 name = required[i];
+            address destination =
+                _resolver.requireAndGetAddress(
+                    name,
+                    string(abi.encodePacked("Resolver missing target: ", name))
+                );
+            addressCache[name] = destination;
+            emit CacheUpdated(name, destination);
+        }
+    }
+
     function _synthetix() internal view returns (ISynthetix) {
-        return ISynthetix(resolver().getAddress(CONTRACT_SYNTHETIX));
+        return ISynthetix(addressCache[CONTRACT_SYNTHETIX]);
     }
 
     function _feePool() internal view returns (IFeePool) {
-        return IFeePool(resolver().getAddress(CONTRACT_FEEPOOL));
+        return IFeePool(addressCache[CONTRACT_FEEPOOL]);
     }
 
     function _issuer() internal view returns (IIssuer) {
-        return IIssuer(resolver().getAddress(CONTRACT_ISSUER));
+        return IIssuer(addressCache[CONTRACT_ISSUER]);
     }
 
     function _exchangeRates() internal view returns (IExchangeRates) {
-        return IExchangeRates(resolver().getAddress(CONTRACT_EXRATES));
+        return IExchangeRates(addressCache[CONTRACT_EXRATES]);
     }
 
     function _rewardEscrowV2() internal view returns (IRewardEscrowV2) {
-        return IRewardEscrowV2(resolver().getAddress(CONTRACT_REWARDESCROW_V2));
+        return IRewardEscrowV2(addressCache[CONTRACT_REWARDESCROW_V2]);
+    }
+
+    function _systemSettings() internal view returns (ISystemSettings) {
+        return ISystemSettings(addressCache[CONTRACT_SYSTEMSETTINGS]);
     }
 }
@@ -0,0 +1,54 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+import "./MockMixinResolver.sol";
+
+// Synthetix's AddressResolver: registry of the system contracts by name
+contract MockAddressResolver is Owned {
+    mapping(bytes32 => address) public repository;
+
+    constructor(address _owner) public Owned(_owner) {}
+
+    function importAddresses(
+        bytes32[] calldata names,
+        address[] calldata destinations
+    ) external onlyOwner {
+        require(
+            names.length == destinations.length,
+            "Input lengths must match"
+        );
+        for (uint256 i = 0; i < names.length; i++) {
+            repository[names[i]] = destinations[i];
+        }
+    }
+
+    function getAddress(bytes32 name) external view returns (address) {
+        return repository[name];
+    }
+
+    function requireAndGetAddress(bytes32 name, string calldata reason)
+        external
+        view
+        returns (address)
+    {
+        address _foundAddress = repository[name];
+        require(_foundAddress != address(0), reason);
+        return _foundAddress;
+    }
+}
+
+// Synthetix's ReadProxyAddressResolver: fixed address pointing to the current resolver
+contract MockReadProxy is Owned {
+    address public target;
+
+    event TargetUpdated(address newTarget);
+
+    constructor(address _owner, address _target) public Owned(_owner) {
+        target = _target;
+    }
+
+    function setTarget(address _target) external onlyOwner {
+        target = _target;
+        emit TargetUpdated(_target);
+    }
+}
@@ -0,0 +1,95 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+import {SafeMath} from "@openzeppelin/contracts/math/SafeMath.sol";
+
+import "./MockMixinResolver.sol";
+import "./MockExchangeRates.sol";
+import "./MockIssuer.sol";
+import "./MockSynth.sol";
+import "./MockSystemSettings.sol";
+import "./SafeDecimalMath.sol";
+
+// total value of the synths in sUSD, i.e. the debt shared by all stakers
+// it is only recomputed on takeDebtSnapshot (issue and burn adjust it by the sUSD amount)
+contract MockDebtCache is MockMixinResolver {
+    using SafeMath for uint256;
+    using SafeDecimalMath for uint256;
+
+    uint256 public cachedDebt;
+    uint256 public cacheTimestamp;
+    bool public cacheInvalid = true;
+
+    event DebtCacheUpdated(uint256 cachedDebt);
+    event DebtCacheSnapshotTaken(uint256 timestamp);
+
+    constructor(address _owner, address _resolver)
+        public
+        MockMixinResolver(_owner, _resolver)
+    {}
+
+    function cacheStale() public view returns (bool) {
+        return
+            cacheTimestamp.add(_settings().debtSnapshotStaleTime()) < now;
+    }
+
+    function cacheInfo()
+        external
+        view
+        returns (
+            uint256 debt,
+            uint256 timestamp,
+            bool isInvalid,
+            bool isStale
+        )
+    {
+        return (cachedDebt, cacheTimestamp, cacheInvalid, cacheStale());
+    }
+
+    function currentDebt()
+        public
+        view
+        returns (uint256 debt, bool anyRateIsInvalid)
+    {
+        MockIssuer _issuer = MockIssuer(requireAndGetAddress("Issuer"));
+        MockExchangeRates _exchangeRates =
+            MockExchangeRates(requireAndGetAddress("ExchangeRates"));
+        bytes32[] memory keys = _issuer.availableCurrencyKeys();
+
+        for (uint256 i = 0; i < keys.length; i++) {
+            uint256 supply = _issuer.synths(keys[i]).totalSupply();
+            debt = debt.add(
+                supply.multiplyDecimalRound(
+                    _exchangeRates.rateForCurrency(keys[i])
+                )
+            );
+        }
+        anyRateIsInvalid = _exchangeRates.anyRateIsInvalid(keys);
+    }
+
+    function takeDebtSnapshot() external {
+        (uint256 debt, bool invalid) = currentDebt();
+        cachedDebt = debt;
+        cacheTimestamp = now;
+        cacheInvalid = invalid;
+        emit DebtCacheUpdated(debt);
+        emit DebtCacheSnapshotTaken(now);
+    }
+
+    function updateCachedsUSDDebt(int256 amount) external {
+        require(
+            msg.sender == requireAndGetAddress("Issuer"),
+            "Sender is not Issuer"
+        );
+        if (amount > 0) {
+            cachedDebt = cachedDebt.add(uint256(amount));
+        } else {
+            cachedDebt = cachedDebt.sub(uint256(-amount));
+        }
+        emit DebtCacheUpdated(cachedDebt);
+    }
+
+    function _settings() internal view returns (MockSystemSettings) {
+        return MockSystemSettings(requireAndGetAddress("SystemSettings"));
+    }
+}
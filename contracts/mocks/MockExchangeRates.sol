@@ -0,0 +1,140 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+import {SafeMath} from "@openzeppelin/contracts/math/SafeMath.sol";
+
+import "./MockMixinResolver.sol";
+import "./MockSystemSettings.sol";
+import "./SafeDecimalMath.sol";
+
+// rates are pushed by the oracle (see SnxOracle), there are no aggregators
+contract MockExchangeRates is MockMixinResolver {
+    using SafeMath for uint256;
+    using SafeDecimalMath for uint256;
+
+    bytes32 private constant sUSD = "sUSD";
+    uint256 private constant ORACLE_FUTURE_LIMIT = 10 minutes;
+
+    address public oracle;
+    mapping(bytes32 => uint256) internal rates;
+    mapping(bytes32 => uint256) public lastRateUpdateTimes;
+    mapping(bytes32 => address) public aggregators;
+
+    event OracleUpdated(address newOracle);
+    event RatesUpdated(bytes32[] currencyKeys, uint256[] newRates);
+    event AggregatorRemoved(bytes32 currencyKey, address aggregator);
+
+    constructor(
+        address _owner,
+        address _oracle,
+        address _resolver
+    ) public MockMixinResolver(_owner, _resolver) {
+        oracle = _oracle;
+    }
+
+    function setOracle(address _oracle) external onlyOwner {
+        oracle = _oracle;
+        emit OracleUpdated(_oracle);
+    }
+
+    function removeAggregator(bytes32 currencyKey) external onlyOwner {
+        address aggregator = aggregators[currencyKey];
+        require(aggregator != address(0), "No aggregator exists for key");
+        delete aggregators[currencyKey];
+        emit AggregatorRemoved(currencyKey, aggregator);
+    }
+
+    function updateRates(
+        bytes32[] calldata currencyKeys,
+        uint256[] calldata newRates,
+        uint256 timeSent
+    ) external returns (bool) {
+        require(msg.sender == oracle, "Only the oracle can perform this action");
+        require(
+            currencyKeys.length == newRates.length,
+            "Currency key array length must match rates array length."
+        );
+        require(
+            timeSent < (now + ORACLE_FUTURE_LIMIT),
+            "Time is too far into the future"
+        );
+
+        for (uint256 i = 0; i < currencyKeys.length; i++) {
+            bytes32 currencyKey = currencyKeys[i];
+            require(newRates[i] != 0, "Zero is not a valid rate");
+            require(currencyKey != sUSD, "Rate of sUSD cannot be updated");
+            // older updates are ignored
+            if (timeSent < lastRateUpdateTimes[currencyKey]) {
+                continue;
+            }
+            rates[currencyKey] = newRates[i];
+            lastRateUpdateTimes[currencyKey] = timeSent;
+        }
+
+        emit RatesUpdated(currencyKeys, newRates);
+        return true;
+    }
+
+    function rateForCurrency(bytes32 currencyKey)
+        public
+        view
+        returns (uint256)
+    {
+        if (currencyKey == sUSD) {
+            return SafeDecimalMath.unit();
+        }
+        return rates[currencyKey];
+    }
+
+    function rateIsStale(bytes32 currencyKey) public view returns (bool) {
+        if (currencyKey == sUSD) {
+            return false;
+        }
+        return
+            lastRateUpdateTimes[currencyKey].add(_settings().rateStalePeriod()) <
+            now;
+    }
+
+    function rateIsInvalid(bytes32 currencyKey) public view returns (bool) {
+        return rateForCurrency(currencyKey) == 0 || rateIsStale(currencyKey);
+    }
+
+    function rateAndInvalid(bytes32 currencyKey)
+        external
+        view
+        returns (uint256 rate, bool isInvalid)
+    {
+        return (rateForCurrency(currencyKey), rateIsInvalid(currencyKey));
+    }
+
+    function anyRateIsInvalid(bytes32[] memory currencyKeys)
+        public
+        view
+        returns (bool)
+    {
+        for (uint256 i = 0; i < currencyKeys.length; i++) {
+            if (rateIsInvalid(currencyKeys[i])) {
+                return true;
+            }
+        }
+        return false;
+    }
+
+    function effectiveValue(
+        bytes32 sourceCurrencyKey,
+        uint256 sourceAmount,
+        bytes32 destinationCurrencyKey
+    ) external view returns (uint256) {
+        if (sourceCurrencyKey == destinationCurrencyKey) {
+            return sourceAmount;
+        }
+        return
+            sourceAmount
+                .multiplyDecimalRound(rateForCurrency(sourceCurrencyKey))
+                .divideDecimalRound(rateForCurrency(destinationCurrencyKey));
+    }
+
+    function _settings() internal view returns (MockSystemSettings) {
+        return MockSystemSettings(requireAndGetAddress("SystemSettings"));
+    }
+}
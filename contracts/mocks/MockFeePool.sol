@@ -0,0 +1,184 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+import {SafeMath} from "@openzeppelin/contracts/math/SafeMath.sol";
+
+import "./MockMixinResolver.sol";
+import "./MockIssuer.sol";
+import "./MockRewardEscrowV2.sol";
+import "./MockSynth.sol";
+import "./MockSynthetix.sol";
+import "./MockSystemSettings.sol";
+import "./SafeDecimalMath.sol";
+
+// Every fee period distributes fixed amounts of fees (sUSD) and rewards (escrowed SNX)
+// to stakers, by their debt ownership when the period closed.
+// As in Synthetix, only the last closed period can be claimed
+contract MockFeePool is MockMixinResolver {
+    using SafeMath for uint256;
+    using SafeDecimalMath for uint256;
+
+    struct FeePeriod {
+        uint256 feesToDistribute;
+        uint256 rewardsToDistribute;
+    }
+
+    // debt ownership at the last issuance event and the one it replaced,
+    // which applies to the periods closed before `periodId`
+    struct IssuanceRecord {
+        uint256 periodId;
+        uint256 debtOwnership;
+        uint256 previousDebtOwnership;
+    }
+
+    uint256 public constant ESCROW_DURATION = 52 weeks;
+
+    uint256 public feesPerPeriod;
+    uint256 public rewardsPerPeriod;
+
+    uint256 public currentPeriodId = 1;
+    uint256 public currentPeriodStartTime;
+    mapping(uint256 => FeePeriod) public closedPeriods;
+
+    mapping(address => IssuanceRecord) public issuanceRecords;
+    mapping(address => uint256) public lastFeeWithdrawal;
+
+    event FeePeriodClosed(uint256 feePeriodId);
+    event FeesClaimed(address account, uint256 sUSDAmount, uint256 snxRewards);
+
+    constructor(address _owner, address _resolver)
+        public
+        MockMixinResolver(_owner, _resolver)
+    {
+        currentPeriodStartTime = now;
+    }
+
+    function setPeriodDistributions(uint256 _fees, uint256 _rewards)
+        external
+        onlyOwner
+    {
+        feesPerPeriod = _fees;
+        rewardsPerPeriod = _rewards;
+    }
+
+    function feePeriodDuration() public view returns (uint256) {
+        return _settings().feePeriodDuration();
+    }
+
+    function targetThreshold() public view returns (uint256) {
+        return _settings().targetThreshold();
+    }
+
+    function closeCurrentFeePeriod() external {
+        require(
+            currentPeriodStartTime.add(feePeriodDuration()) <= now,
+            "Too early to close fee period"
+        );
+
+        closedPeriods[currentPeriodId] = FeePeriod(
+            feesPerPeriod,
+            rewardsPerPeriod
+        );
+        // inflation is minted to the escrow, where claimed rewards vest
+        MockSynthetix(requireAndGetAddress("Synthetix")).mint(
+            requireAndGetAddress("RewardEscrowV2"),
+            rewardsPerPeriod
+        );
+        emit FeePeriodClosed(currentPeriodId);
+
+        currentPeriodId = currentPeriodId.add(1);
+        currentPeriodStartTime = now;
+    }
+
+    function appendAccountIssuanceRecord(
+        address account,
+        uint256 debtOwnership
+    ) external {
+        require(
+            msg.sender == requireAndGetAddress("Issuer"),
+            "Issuer only"
+        );
+        IssuanceRecord storage record = issuanceRecords[account];
+        if (record.periodId != currentPeriodId) {
+            record.previousDebtOwnership = record.debtOwnership;
+            record.periodId = currentPeriodId;
+        }
+        record.debtOwnership = debtOwnership;
+    }
+
+    function feesAvailable(address account)
+        public
+        view
+        returns (uint256, uint256)
+    {
+        uint256 period = currentPeriodId.sub(1);
+        if (period == 0 || lastFeeWithdrawal[account] >= period) {
+            return (0, 0);
+        }
+
+        IssuanceRecord memory record = issuanceRecords[account];
+        uint256 ownership =
+            record.periodId > period
+                ? record.previousDebtOwnership
+                : record.debtOwnership;
+
+        FeePeriod memory feePeriod = closedPeriods[period];
+        return (
+            feePeriod.feesToDistribute.mul(ownership).div(
+                SafeDecimalMath.PRECISE_UNIT
+            ),
+            feePeriod.rewardsToDistribute.mul(ownership).div(
+                SafeDecimalMath.PRECISE_UNIT
+            )
+        );
+    }
+
+    // stakers can't claim with a c-ratio below the issuance ratio (plus the target threshold)
+    function isFeesClaimable(address account) public view returns (bool) {
+        uint256 ratio =
+            MockIssuer(requireAndGetAddress("Issuer")).collateralisationRatio(
+                account
+            );
+        uint256 targetRatio = _settings().issuanceRatio();
+        if (ratio <= targetRatio) {
+            return true;
+        }
+        uint256 ratioThreshold =
+            targetRatio.multiplyDecimal(
+                SafeDecimalMath.unit().add(targetThreshold())
+            );
+        return ratio <= ratioThreshold;
+    }
+
+    function claimFees() external returns (bool) {
+        require(
+            isFeesClaimable(msg.sender),
+            "C-Ratio below penalty threshold"
+        );
+
+        (uint256 fees, uint256 rewards) = feesAvailable(msg.sender);
+        require(
+            fees > 0 || rewards > 0,
+            "No fees or rewards available for period, or fees already claimed"
+        );
+        lastFeeWithdrawal[msg.sender] = currentPeriodId.sub(1);
+
+        if (fees > 0) {
+            MockSynth(requireAndGetAddress("SynthsUSD")).issue(
+                msg.sender,
+                fees
+            );
+        }
+        if (rewards > 0) {
+            MockRewardEscrowV2(requireAndGetAddress("RewardEscrowV2"))
+                .appendVestingEntry(msg.sender, rewards, ESCROW_DURATION);
+        }
+
+        emit FeesClaimed(msg.sender, fees, rewards);
+        return true;
+    }
+
+    function _settings() internal view returns (MockSystemSettings) {
+        return MockSystemSettings(requireAndGetAddress("SystemSettings"));
+    }
+}
@@ -0,0 +1,510 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+import {SafeMath} from "@openzeppelin/contracts/math/SafeMath.sol";
+import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+
+import "./MockMixinResolver.sol";
+import "./MockDebtCache.sol";
+import "./MockExchangeRates.sol";
+import "./MockFeePool.sol";
+import "./MockLiquidations.sol";
+import "./MockRewardEscrowV2.sol";
+import "./MockSynth.sol";
+import "./MockSystemSettings.sol";
+import "./SafeDecimalMath.sol";
+
+// Issuance, burning and liquidation with Synthetix's formulas.
+// Each staker owns a share of the debt pool (see DebtCache), so its debt
+// moves with the value of all the synths, not only the sUSD it minted
+contract MockIssuer is MockMixinResolver {
+    using SafeMath for uint256;
+    using SafeDecimalMath for uint256;
+
+    bytes32 private constant sUSD = "sUSD";
+    bytes32 private constant SNX = "SNX";
+    // debt shares have 9 more decimals than sUSD so that debt round trips exactly
+    uint256 private constant SHARES_PER_SUSD = 1e9;
+
+    mapping(bytes32 => MockSynth) public synths;
+    bytes32[] internal currencyKeys;
+
+    uint256 public totalDebtShares;
+    mapping(address => uint256) public debtShares;
+    mapping(address => uint256) public lastIssueEvent;
+
+    constructor(address _owner, address _resolver)
+        public
+        MockMixinResolver(_owner, _resolver)
+    {}
+
+    modifier onlySynthetix {
+        require(
+            msg.sender == requireAndGetAddress("Synthetix"),
+            "Issuer: Only the synthetix contract can perform this action"
+        );
+        _;
+    }
+
+    // ********************** SETUP **********************
+
+    function addSynth(MockSynth synth) external onlyOwner {
+        bytes32 currencyKey = synth.currencyKey();
+        require(address(synths[currencyKey]) == address(0), "Synth exists");
+        synths[currencyKey] = synth;
+        currencyKeys.push(currencyKey);
+    }
+
+    // debt of the stakers outside the tests, backing the synths minted by the owner
+    function importDebt(address account, uint256 amount) external onlyOwner {
+        (uint256 totalSystemValue, ) = _totalDebt();
+        _addToDebtRegister(account, amount, totalSystemValue);
+        _debtCache().updateCachedsUSDDebt(int256(amount));
+    }
+
+    // ********************** VIEWS **********************
+
+    function availableCurrencyKeys() external view returns (bytes32[] memory) {
+        return currencyKeys;
+    }
+
+    function availableSynthCount() external view returns (uint256) {
+        return currencyKeys.length;
+    }
+
+    function issuanceRatio() public view returns (uint256) {
+        return _settings().issuanceRatio();
+    }
+
+    function minimumStakeTime() public view returns (uint256) {
+        return _settings().minimumStakeTime();
+    }
+
+    function canBurnSynths(address account) public view returns (bool) {
+        return now >= lastIssueEvent[account].add(minimumStakeTime());
+    }
+
+    function anySynthOrSNXRateIsInvalid()
+        external
+        view
+        returns (bool anyRateInvalid)
+    {
+        (, anyRateInvalid) = _totalDebt();
+        anyRateInvalid = anyRateInvalid || _exchangeRates().rateIsInvalid(SNX);
+    }
+
+    // SNX in balance and in escrow
+    function collateral(address account) public view returns (uint256) {
+        return
+            IERC20(requireAndGetAddress("Synthetix")).balanceOf(account).add(
+                _rewardEscrowV2().balanceOf(account)
+            );
+    }
+
+    function debtBalanceOf(address account, bytes32 currencyKey)
+        external
+        view
+        returns (uint256 debtBalance)
+    {
+        (debtBalance, , ) = _debtBalanceOfAndTotalDebt(account, currencyKey);
+    }
+
+    function collateralisationRatio(address _issuer)
+        public
+        view
+        returns (uint256 cratio)
+    {
+        (cratio, ) = _collateralisationRatio(_issuer);
+    }
+
+    function collateralisationRatioAndAnyRatesInvalid(address _issuer)
+        external
+        view
+        returns (uint256 cratio, bool anyRateIsInvalid)
+    {
+        return _collateralisationRatio(_issuer);
+    }
+
+    function maxIssuableSynths(address _issuer)
+        external
+        view
+        returns (uint256 maxIssuable)
+    {
+        (maxIssuable, ) = _maxIssuableSynths(_issuer);
+    }
+
+    function remainingIssuableSynths(address _issuer)
+        external
+        view
+        returns (
+            uint256 maxIssuable,
+            uint256 alreadyIssued,
+            uint256 totalSystemDebt
+        )
+    {
+        (
+            maxIssuable,
+            alreadyIssued,
+            totalSystemDebt,
+
+        ) = _remainingIssuableSynths(_issuer);
+    }
+
+    function transferableSynthetixAndAnyRateIsInvalid(
+        address account,
+        uint256 balance
+    ) external view returns (uint256 transferable, bool anyRateIsInvalid) {
+        uint256 debtBalance;
+        (debtBalance, , anyRateIsInvalid) = _debtBalanceOfAndTotalDebt(
+            account,
+            SNX
+        );
+        // SNX needed to back the debt at the issuance ratio
+        uint256 lockedSynthetixValue =
+            debtBalance.divideDecimalRound(issuanceRatio());
+        if (lockedSynthetixValue < balance) {
+            transferable = balance.sub(lockedSynthetixValue);
+        }
+    }
+
+    // share of the debt pool (27 decimals)
+    function debtOwnership(address account) public view returns (uint256) {
+        if (totalDebtShares == 0) {
+            return 0;
+        }
+        return
+            debtShares[account].mul(SafeDecimalMath.PRECISE_UNIT).div(
+                totalDebtShares
+            );
+    }
+
+    // ********************** SYNTHETIX **********************
+
+    function issueSynths(address from, uint256 amount)
+        external
+        onlySynthetix
+    {
+        _issueSynths(from, amount, false);
+    }
+
+    function issueMaxSynths(address from) external onlySynthetix {
+        _issueSynths(from, 0, true);
+    }
+
+    function burnSynths(address from, uint256 amount) external onlySynthetix {
+        _voluntaryBurnSynths(from, amount, false);
+    }
+
+    // not subject to the minimum stake time
+    function burnSynthsToTarget(address from) external onlySynthetix {
+        _voluntaryBurnSynths(from, 0, true);
+    }
+
+    // the liquidator burns sUSD to repay `account` debt and is paid in SNX (plus a penalty)
+    function liquidateDelinquentAccount(
+        address account,
+        uint256 susdAmount,
+        address liquidator
+    )
+        external
+        onlySynthetix
+        returns (uint256 totalRedeemed, uint256 amountToLiquidate)
+    {
+        MockLiquidations _liquidations =
+            MockLiquidations(requireAndGetAddress("Liquidations"));
+        require(
+            _liquidations.isOpenForLiquidation(account),
+            "Account not open for liquidation"
+        );
+        require(
+            synths[sUSD].balanceOf(liquidator) >= susdAmount,
+            "Not enough sUSD"
+        );
+
+        uint256 debtBalance;
+        uint256 totalDebtIssued;
+        uint256 snxRate;
+        {
+            bool anyRateIsInvalid;
+            bool snxRateInvalid;
+            (
+                debtBalance,
+                totalDebtIssued,
+                anyRateIsInvalid
+            ) = _debtBalanceOfAndTotalDebt(account, sUSD);
+            (snxRate, snxRateInvalid) = _exchangeRates().rateAndInvalid(SNX);
+            _requireRatesNotInvalid(anyRateIsInvalid || snxRateInvalid);
+        }
+
+        uint256 collateralForAccount = collateral(account);
+        uint256 amountToFixRatio =
+            _liquidations.calculateAmountToFixCollateral(
+                debtBalance,
+                _snxToUSD(collateralForAccount, snxRate)
+            );
+        amountToLiquidate = amountToFixRatio < susdAmount
+            ? amountToFixRatio
+            : susdAmount;
+
+        uint256 penaltyMultiplier =
+            SafeDecimalMath.unit().add(_liquidations.liquidationPenalty());
+        totalRedeemed = _usdToSnx(amountToLiquidate, snxRate).multiplyDecimal(
+            penaltyMultiplier
+        );
+        // the account does not have enough collateral to pay the penalty
+        if (totalRedeemed > collateralForAccount) {
+            totalRedeemed = collateralForAccount;
+            amountToLiquidate = _snxToUSD(collateralForAccount, snxRate)
+                .divideDecimal(penaltyMultiplier);
+        }
+
+        _burnSynths(
+            account,
+            liquidator,
+            amountToLiquidate,
+            debtBalance,
+            totalDebtIssued
+        );
+        _appendAccountIssuanceRecord(account);
+
+        if (amountToLiquidate == amountToFixRatio) {
+            _liquidations.removeAccountInLiquidation(account);
+        }
+    }
+
+    // ********************** INTERNAL **********************
+
+    function _issueSynths(
+        address from,
+        uint256 amount,
+        bool issueMax
+    ) internal {
+        (
+            uint256 maxIssuable,
+            ,
+            uint256 totalSystemDebt,
+            bool anyRateIsInvalid
+        ) = _remainingIssuableSynths(from);
+        _requireRatesNotInvalid(anyRateIsInvalid);
+
+        if (issueMax) {
+            amount = maxIssuable;
+        } else {
+            require(amount <= maxIssuable, "Amount too large");
+        }
+
+        _addToDebtRegister(from, amount, totalSystemDebt);
+        synths[sUSD].issue(from, amount);
+        _debtCache().updateCachedsUSDDebt(int256(amount));
+
+        lastIssueEvent[from] = now;
+        _appendAccountIssuanceRecord(from);
+    }
+
+    function _voluntaryBurnSynths(
+        address from,
+        uint256 amount,
+        bool burnToTarget
+    ) internal {
+        if (!burnToTarget) {
+            require(canBurnSynths(from), "Minimum stake time not reached");
+        }
+
+        (
+            uint256 existingDebt,
+            uint256 totalSystemValue,
+            bool anyRateIsInvalid
+        ) = _debtBalanceOfAndTotalDebt(from, sUSD);
+        (uint256 maxIssuableSynthsForAccount, bool snxRateInvalid) =
+            _maxIssuableSynths(from);
+        _requireRatesNotInvalid(anyRateIsInvalid || snxRateInvalid);
+        require(existingDebt > 0, "No debt to forgive");
+
+        if (burnToTarget) {
+            amount = existingDebt.sub(maxIssuableSynthsForAccount);
+        }
+
+        _burnSynths(from, from, amount, existingDebt, totalSystemValue);
+        _appendAccountIssuanceRecord(from);
+
+        MockLiquidations(requireAndGetAddress("Liquidations"))
+            .checkAndRemoveAccountInLiquidation(from);
+    }
+
+    function _burnSynths(
+        address debtAccount,
+        address burnAccount,
+        uint256 amount,
+        uint256 existingDebt,
+        uint256 totalDebtIssued
+    ) internal returns (uint256 amountBurnt) {
+        // can't burn more than the debt
+        amountBurnt = existingDebt < amount ? existingDebt : amount;
+
+        _removeFromDebtRegister(
+            debtAccount,
+            amountBurnt,
+            existingDebt,
+            totalDebtIssued
+        );
+        synths[sUSD].burn(burnAccount, amountBurnt);
+        _debtCache().updateCachedsUSDDebt(-int256(amountBurnt));
+    }
+
+    function _addToDebtRegister(
+        address from,
+        uint256 amount,
+        uint256 totalDebtIssued
+    ) internal {
+        uint256 shares =
+            totalDebtShares == 0
+                ? amount.mul(SHARES_PER_SUSD)
+                : amount.mul(totalDebtShares).div(totalDebtIssued);
+        debtShares[from] = debtShares[from].add(shares);
+        totalDebtShares = totalDebtShares.add(shares);
+    }
+
+    function _removeFromDebtRegister(
+        address from,
+        uint256 amount,
+        uint256 existingDebt,
+        uint256 totalDebtIssued
+    ) internal {
+        uint256 shares =
+            amount == existingDebt
+                ? debtShares[from]
+                : amount.mul(totalDebtShares).div(totalDebtIssued);
+        debtShares[from] = debtShares[from].sub(shares);
+        totalDebtShares = totalDebtShares.sub(shares);
+    }
+
+    // fees and rewards are paid on the debt ownership (see FeePool)
+    function _appendAccountIssuanceRecord(address account) internal {
+        MockFeePool(requireAndGetAddress("FeePool"))
+            .appendAccountIssuanceRecord(account, debtOwnership(account));
+    }
+
+    function _totalDebt()
+        internal
+        view
+        returns (uint256 totalSystemValue, bool anyRateIsInvalid)
+    {
+        bool isInvalid;
+        bool isStale;
+        (totalSystemValue, , isInvalid, isStale) = _debtCache().cacheInfo();
+        anyRateIsInvalid = isInvalid || isStale;
+    }
+
+    function _debtBalanceOfAndTotalDebt(address account, bytes32 currencyKey)
+        internal
+        view
+        returns (
+            uint256 debtBalance,
+            uint256 totalSystemValue,
+            bool anyRateIsInvalid
+        )
+    {
+        (totalSystemValue, anyRateIsInvalid) = _totalDebt();
+        uint256 shares = debtShares[account];
+        if (shares == 0) {
+            return (0, totalSystemValue, anyRateIsInvalid);
+        }
+        // rounded to the nearest so that issuing or burning moves the debt by that exact amount
+        debtBalance = shares.mul(totalSystemValue).add(totalDebtShares / 2).div(
+            totalDebtShares
+        );
+        if (currencyKey != sUSD) {
+            debtBalance = _exchangeRates().effectiveValue(
+                sUSD,
+                debtBalance,
+                currencyKey
+            );
+        }
+    }
+
+    function _collateralisationRatio(address account)
+        internal
+        view
+        returns (uint256, bool)
+    {
+        uint256 totalOwnedSynthetix = collateral(account);
+        (uint256 debtBalance, , bool anyRateIsInvalid) =
+            _debtBalanceOfAndTotalDebt(account, SNX);
+        if (totalOwnedSynthetix == 0) {
+            return (0, anyRateIsInvalid);
+        }
+        return (
+            debtBalance.divideDecimalRound(totalOwnedSynthetix),
+            anyRateIsInvalid
+        );
+    }
+
+    function _maxIssuableSynths(address _issuer)
+        internal
+        view
+        returns (uint256, bool)
+    {
+        (uint256 snxRate, bool isInvalid) = _exchangeRates().rateAndInvalid(SNX);
+        uint256 destinationValue = _snxToUSD(collateral(_issuer), snxRate);
+        return (destinationValue.multiplyDecimal(issuanceRatio()), isInvalid);
+    }
+
+    function _remainingIssuableSynths(address _issuer)
+        internal
+        view
+        returns (
+            uint256 maxIssuable,
+            uint256 alreadyIssued,
+            uint256 totalSystemDebt,
+            bool anyRateIsInvalid
+        )
+    {
+        (
+            alreadyIssued,
+            totalSystemDebt,
+            anyRateIsInvalid
+        ) = _debtBalanceOfAndTotalDebt(_issuer, sUSD);
+        bool snxRateInvalid;
+        (maxIssuable, snxRateInvalid) = _maxIssuableSynths(_issuer);
+        anyRateIsInvalid = anyRateIsInvalid || snxRateInvalid;
+        maxIssuable = alreadyIssued < maxIssuable
+            ? maxIssuable.sub(alreadyIssued)
+            : 0;
+    }
+
+    function _snxToUSD(uint256 amount, uint256 snxRate)
+        internal
+        pure
+        returns (uint256)
+    {
+        return amount.multiplyDecimalRound(snxRate);
+    }
+
+    function _usdToSnx(uint256 amount, uint256 snxRate)
+        internal
+        pure
+        returns (uint256)
+    {
+        return amount.divideDecimalRound(snxRate);
+    }
+
+    function _requireRatesNotInvalid(bool anyRateIsInvalid) internal pure {
+        require(!anyRateIsInvalid, "A synth or SNX rate is invalid");
+    }
+
+    function _settings() internal view returns (MockSystemSettings) {
+        return MockSystemSettings(requireAndGetAddress("SystemSettings"));
+    }
+
+    function _exchangeRates() internal view returns (MockExchangeRates) {
+        return MockExchangeRates(requireAndGetAddress("ExchangeRates"));
+    }
+
+    function _debtCache() internal view returns (MockDebtCache) {
+        return MockDebtCache(requireAndGetAddress("DebtCache"));
+    }
+
+    function _rewardEscrowV2() internal view returns (MockRewardEscrowV2) {
+        return MockRewardEscrowV2(requireAndGetAddress("RewardEscrowV2"));
+    }
+}
@@ -0,0 +1,127 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+import {SafeMath} from "@openzeppelin/contracts/math/SafeMath.sol";
+
+import "./MockMixinResolver.sol";
+import "./MockIssuer.sol";
+import "./MockSystemSettings.sol";
+import "./SafeDecimalMath.sol";
+
+// an account under the liquidation ratio can be flagged, then liquidated after the
+// liquidation delay unless it gets back to the issuance ratio
+contract MockLiquidations is MockMixinResolver {
+    using SafeMath for uint256;
+    using SafeDecimalMath for uint256;
+
+    struct LiquidationEntry {
+        uint256 deadline;
+        address caller;
+    }
+
+    mapping(address => LiquidationEntry) internal liquidationEntries;
+
+    event AccountFlaggedForLiquidation(
+        address indexed account,
+        uint256 deadline
+    );
+    event AccountRemovedFromLiquidation(address indexed account, uint256 time);
+
+    constructor(address _owner, address _resolver)
+        public
+        MockMixinResolver(_owner, _resolver)
+    {}
+
+    function liquidationDelay() public view returns (uint256) {
+        return _settings().liquidationDelay();
+    }
+
+    function liquidationRatio() public view returns (uint256) {
+        return _settings().liquidationRatio();
+    }
+
+    function liquidationPenalty() public view returns (uint256) {
+        return _settings().liquidationPenalty();
+    }
+
+    function getLiquidationDeadlineForAccount(address account)
+        external
+        view
+        returns (uint256)
+    {
+        return liquidationEntries[account].deadline;
+    }
+
+    function isOpenForLiquidation(address account) external view returns (bool) {
+        // closed once the account is back to the issuance ratio
+        if (
+            _issuer().collateralisationRatio(account) <=
+            _settings().issuanceRatio()
+        ) {
+            return false;
+        }
+        uint256 deadline = liquidationEntries[account].deadline;
+        return deadline > 0 && now > deadline;
+    }
+
+    // sUSD to burn so that the account gets back to the issuance ratio after paying the penalty
+    function calculateAmountToFixCollateral(
+        uint256 debtBalance,
+        uint256 collateral
+    ) external view returns (uint256) {
+        uint256 ratio = _settings().issuanceRatio();
+        uint256 unit = SafeDecimalMath.unit();
+
+        uint256 dividend = debtBalance.sub(collateral.multiplyDecimal(ratio));
+        uint256 divisor =
+            unit.sub(unit.add(liquidationPenalty()).multiplyDecimal(ratio));
+
+        return dividend.divideDecimal(divisor);
+    }
+
+    function flagAccountForLiquidation(address account) external {
+        require(
+            liquidationEntries[account].deadline == 0,
+            "Account already flagged for liquidation"
+        );
+        require(
+            _issuer().collateralisationRatio(account) >= liquidationRatio(),
+            "Account issuance ratio is less than liquidation ratio"
+        );
+
+        uint256 deadline = now.add(liquidationDelay());
+        liquidationEntries[account] = LiquidationEntry(deadline, msg.sender);
+        emit AccountFlaggedForLiquidation(account, deadline);
+    }
+
+    function removeAccountInLiquidation(address account) external {
+        require(msg.sender == address(_issuer()), "Issuer only");
+        _removeLiquidationEntry(account);
+    }
+
+    function checkAndRemoveAccountInLiquidation(address account) external {
+        if (
+            liquidationEntries[account].deadline > 0 &&
+            _issuer().collateralisationRatio(account) <=
+            _settings().issuanceRatio()
+        ) {
+            _removeLiquidationEntry(account);
+        }
+    }
+
+    function _removeLiquidationEntry(address account) internal {
+        if (liquidationEntries[account].deadline == 0) {
+            return;
+        }
+        delete liquidationEntries[account];
+        emit AccountRemovedFromLiquidation(account, now);
+    }
+
+    function _issuer() internal view returns (MockIssuer) {
+        return MockIssuer(requireAndGetAddress("Issuer"));
+    }
+
+    function _settings() internal view returns (MockSystemSettings) {
+        return MockSystemSettings(requireAndGetAddress("SystemSettings"));
+    }
+}
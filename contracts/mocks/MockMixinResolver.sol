@@ -0,0 +1,41 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+import "../../interfaces/IAddressResolver.sol";
+
+contract Owned {
+    address public owner;
+
+    constructor(address _owner) public {
+        owner = _owner;
+    }
+
+    modifier onlyOwner {
+        require(
+            msg.sender == owner,
+            "Only the contract owner may perform this action"
+        );
+        _;
+    }
+}
+
+// Mocks find each other through the resolver, like Synthetix contracts do
+abstract contract MockMixinResolver is Owned {
+    IAddressResolver public resolver;
+
+    constructor(address _owner, address _resolver) public Owned(_owner) {
+        resolver = IAddressResolver(_resolver);
+    }
+
+    function requireAndGetAddress(bytes32 name)
+        internal
+        view
+        returns (address)
+    {
+        return
+            resolver.requireAndGetAddress(
+                name,
+                string(abi.encodePacked("Missing address: ", name))
+            );
+    }
+}
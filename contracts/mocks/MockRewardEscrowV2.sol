@@ -0,0 +1,248 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+import {SafeMath} from "@openzeppelin/contracts/math/SafeMath.sol";
+import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+
+import "./MockMixinResolver.sol";
+import "./MockIssuer.sol";
+
+// escrowed rewards vest in full at the end of their entry.
+// Accounts without debt can be merged while the merging window is open
+contract MockRewardEscrowV2 is MockMixinResolver {
+    using SafeMath for uint256;
+
+    struct VestingEntry {
+        uint64 endTime;
+        uint256 escrowAmount;
+    }
+
+    uint256 public nextEntryId = 1;
+    uint256 public totalEscrowedBalance;
+
+    mapping(address => mapping(uint256 => VestingEntry))
+        public vestingSchedules;
+    mapping(address => uint256[]) internal accountVestingEntryIDs;
+    mapping(address => uint256) public totalEscrowedAccountBalance;
+    mapping(address => uint256) public totalVestedAccountBalance;
+
+    uint256 public accountMergingDuration = 1 weeks;
+    uint256 public accountMergingStartTime;
+    mapping(address => address) public nominatedReceiver;
+
+    event VestingEntryCreated(
+        address indexed beneficiary,
+        uint256 time,
+        uint256 value,
+        uint256 duration,
+        uint256 entryID
+    );
+    event Vested(address indexed beneficiary, uint256 time, uint256 value);
+    event AccountMergingStarted(uint256 time, uint256 endTime);
+    event NominateAccountToMerge(address indexed account, address destination);
+    event AccountMerged(
+        address indexed accountToMerge,
+        address destinationAddress,
+        uint256 escrowAmountMerged,
+        uint256[] entryIDs,
+        uint256 time
+    );
+
+    constructor(address _owner, address _resolver)
+        public
+        MockMixinResolver(_owner, _resolver)
+    {}
+
+    function balanceOf(address account) external view returns (uint256) {
+        return totalEscrowedAccountBalance[account];
+    }
+
+    function numVestingEntries(address account)
+        external
+        view
+        returns (uint256)
+    {
+        return accountVestingEntryIDs[account].length;
+    }
+
+    function getAccountVestingEntryIDs(
+        address account,
+        uint256 index,
+        uint256 pageSize
+    ) external view returns (uint256[] memory page) {
+        uint256[] storage ids = accountVestingEntryIDs[account];
+        uint256 endIndex = index.add(pageSize);
+        if (endIndex > ids.length) {
+            endIndex = ids.length;
+        }
+        if (endIndex <= index) {
+            return new uint256[](0);
+        }
+        page = new uint256[](endIndex - index);
+        for (uint256 i = 0; i < page.length; i++) {
+            page[i] = ids[index + i];
+        }
+    }
+
+    function getVestingEntry(address account, uint256 entryID)
+        external
+        view
+        returns (uint64 endTime, uint256 escrowAmount)
+    {
+        VestingEntry memory entry = vestingSchedules[account][entryID];
+        return (entry.endTime, entry.escrowAmount);
+    }
+
+    function getVestingEntryClaimable(address account, uint256 entryID)
+        public
+        view
+        returns (uint256)
+    {
+        VestingEntry memory entry = vestingSchedules[account][entryID];
+        if (entry.escrowAmount == 0 || now < entry.endTime) {
+            return 0;
+        }
+        return entry.escrowAmount;
+    }
+
+    function getVestingQuantity(address account, uint256[] calldata entryIDs)
+        external
+        view
+        returns (uint256 total)
+    {
+        for (uint256 i = 0; i < entryIDs.length; i++) {
+            total = total.add(getVestingEntryClaimable(account, entryIDs[i]));
+        }
+    }
+
+    function appendVestingEntry(
+        address account,
+        uint256 quantity,
+        uint256 duration
+    ) external {
+        require(
+            msg.sender == requireAndGetAddress("FeePool"),
+            "Only the FeePool can perform this action"
+        );
+        require(quantity != 0, "Quantity cannot be zero");
+
+        totalEscrowedBalance = totalEscrowedBalance.add(quantity);
+        require(
+            totalEscrowedBalance <= _snx().balanceOf(address(this)),
+            "Must be enough balance in the contract to provide for the vesting entry"
+        );
+
+        uint256 entryID = nextEntryId;
+        uint256 endTime = now.add(duration);
+        vestingSchedules[account][entryID] = VestingEntry(
+            uint64(endTime),
+            quantity
+        );
+        accountVestingEntryIDs[account].push(entryID);
+        totalEscrowedAccountBalance[account] = totalEscrowedAccountBalance[
+            account
+        ]
+            .add(quantity);
+        nextEntryId = entryID.add(1);
+
+        emit VestingEntryCreated(account, now, quantity, duration, entryID);
+    }
+
+    function vest(uint256[] calldata entryIDs) external {
+        uint256 total;
+        for (uint256 i = 0; i < entryIDs.length; i++) {
+            VestingEntry storage entry =
+                vestingSchedules[msg.sender][entryIDs[i]];
+            uint256 quantity = getVestingEntryClaimable(msg.sender, entryIDs[i]);
+            if (quantity > 0) {
+                entry.escrowAmount = 0;
+                total = total.add(quantity);
+            }
+        }
+
+        if (total > 0) {
+            totalEscrowedBalance = totalEscrowedBalance.sub(total);
+            totalEscrowedAccountBalance[msg.sender] = totalEscrowedAccountBalance[
+                msg.sender
+            ]
+                .sub(total);
+            totalVestedAccountBalance[msg.sender] = totalVestedAccountBalance[
+                msg.sender
+            ]
+                .add(total);
+            _snx().transfer(msg.sender, total);
+            emit Vested(msg.sender, now, total);
+        }
+    }
+
+    function accountMergingIsOpen() public view returns (bool) {
+        return accountMergingStartTime.add(accountMergingDuration) > now;
+    }
+
+    function startMergingWindow() external onlyOwner {
+        accountMergingStartTime = now;
+        emit AccountMergingStarted(now, now.add(accountMergingDuration));
+    }
+
+    function nominateAccountToMerge(address account) external {
+        require(account != msg.sender, "Cannot nominate own account to merge");
+        require(accountMergingIsOpen(), "Account merging has ended");
+        require(
+            _issuer().debtBalanceOf(msg.sender, "sUSD") == 0,
+            "Cannot merge accounts with debt"
+        );
+        nominatedReceiver[msg.sender] = account;
+        emit NominateAccountToMerge(msg.sender, account);
+    }
+
+    // entries keep their ID, entries without escrow are ignored
+    function mergeAccount(address accountToMerge, uint256[] calldata entryIDs)
+        external
+    {
+        require(accountMergingIsOpen(), "Account merging has ended");
+        require(
+            _issuer().debtBalanceOf(accountToMerge, "sUSD") == 0,
+            "Cannot merge accounts with debt"
+        );
+        require(
+            nominatedReceiver[accountToMerge] == msg.sender,
+            "Address is not nominated to merge"
+        );
+
+        uint256 totalMerged;
+        for (uint256 i = 0; i < entryIDs.length; i++) {
+            VestingEntry memory entry =
+                vestingSchedules[accountToMerge][entryIDs[i]];
+            if (entry.escrowAmount != 0) {
+                vestingSchedules[msg.sender][entryIDs[i]] = entry;
+                totalMerged = totalMerged.add(entry.escrowAmount);
+                accountVestingEntryIDs[msg.sender].push(entryIDs[i]);
+                delete vestingSchedules[accountToMerge][entryIDs[i]];
+            }
+        }
+
+        totalEscrowedAccountBalance[
+            accountToMerge
+        ] = totalEscrowedAccountBalance[accountToMerge].sub(totalMerged);
+        totalEscrowedAccountBalance[msg.sender] = totalEscrowedAccountBalance[
+            msg.sender
+        ]
+            .add(totalMerged);
+
+        emit AccountMerged(
+            accountToMerge,
+            msg.sender,
+            totalMerged,
+            entryIDs,
+            now
+        );
+    }
+
+    function _issuer() internal view returns (MockIssuer) {
+        return MockIssuer(requireAndGetAddress("Issuer"));
+    }
+
+    function _snx() internal view returns (IERC20) {
+        return IERC20(requireAndGetAddress("Synthetix"));
+    }
+}
@@ -0,0 +1,154 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+import {
+    SafeERC20,
+    SafeMath,
+    IERC20
+} from "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
+
+// Uniswap V2 style router: constant product pools (0.3% fee) held by the router itself
+contract MockRouter {
+    using SafeERC20 for IERC20;
+    using SafeMath for uint256;
+
+    address public immutable WETH;
+
+    // reserves[tokenA][tokenB] is the balance of tokenA in the tokenA/tokenB pool
+    mapping(address => mapping(address => uint256)) public reserves;
+
+    constructor(address _weth) public {
+        WETH = _weth;
+    }
+
+    function addLiquidity(
+        address tokenA,
+        address tokenB,
+        uint256 amountA,
+        uint256 amountB
+    ) external {
+        IERC20(tokenA).safeTransferFrom(msg.sender, address(this), amountA);
+        IERC20(tokenB).safeTransferFrom(msg.sender, address(this), amountB);
+        reserves[tokenA][tokenB] = reserves[tokenA][tokenB].add(amountA);
+        reserves[tokenB][tokenA] = reserves[tokenB][tokenA].add(amountB);
+    }
+
+    function getAmountOut(
+        uint256 amountIn,
+        uint256 reserveIn,
+        uint256 reserveOut
+    ) public pure returns (uint256) {
+        require(amountIn > 0, "UniswapV2Library: INSUFFICIENT_INPUT_AMOUNT");
+        require(
+            reserveIn > 0 && reserveOut > 0,
+            "UniswapV2Library: INSUFFICIENT_LIQUIDITY"
+        );
+        uint256 amountInWithFee = amountIn.mul(997);
+        return
+            amountInWithFee.mul(reserveOut).div(
+                reserveIn.mul(1000).add(amountInWithFee)
+            );
+    }
+
+    function getAmountIn(
+        uint256 amountOut,
+        uint256 reserveIn,
+        uint256 reserveOut
+    ) public pure returns (uint256) {
+        require(amountOut > 0, "UniswapV2Library: INSUFFICIENT_OUTPUT_AMOUNT");
+        require(
+            reserveIn > 0 && reserveOut > amountOut,
+            "UniswapV2Library: INSUFFICIENT_LIQUIDITY"
+        );
+        return
+            reserveIn.mul(amountOut).mul(1000).div(
+                reserveOut.sub(amountOut).mul(997)
+            ).add(1);
+    }
+
+    function getAmountsOut(uint256 amountIn, address[] memory path)
+        public
+        view
+        returns (uint256[] memory amounts)
+    {
+        require(path.length >= 2, "UniswapV2Library: INVALID_PATH");
+        amounts = new uint256[](path.length);
+        amounts[0] = amountIn;
+        for (uint256 i = 0; i < path.length - 1; i++) {
+            amounts[i + 1] = getAmountOut(
+                amounts[i],
+                reserves[path[i]][path[i + 1]],
+                reserves[path[i + 1]][path[i]]
+            );
+        }
+    }
+
+    function getAmountsIn(uint256 amountOut, address[] memory path)
+        public
+        view
+        returns (uint256[] memory amounts)
+    {
+        require(path.length >= 2, "UniswapV2Library: INVALID_PATH");
+        amounts = new uint256[](path.length);
+        amounts[amounts.length - 1] = amountOut;
+        for (uint256 i = path.length - 1; i > 0; i--) {
+            amounts[i - 1] = getAmountIn(
+                amounts[i],
+                reserves[path[i - 1]][path[i]],
+                reserves[path[i]][path[i - 1]]
+            );
+        }
+    }
+
+    function swapExactTokensForTokens(
+        uint256 amountIn,
+        uint256 amountOutMin,
+        address[] calldata path,
+        address to,
+        uint256 deadline
+    ) external returns (uint256[] memory amounts) {
+        require(deadline >= block.timestamp, "UniswapV2Router: EXPIRED");
+        amounts = getAmountsOut(amountIn, path);
+        require(
+            amounts[amounts.length - 1] >= amountOutMin,
+            "UniswapV2Router: INSUFFICIENT_OUTPUT_AMOUNT"
+        );
+        _swap(amounts, path, to);
+    }
+
+    function swapTokensForExactTokens(
+        uint256 amountOut,
+        uint256 amountInMax,
+        address[] calldata path,
+        address to,
+        uint256 deadline
+    ) external returns (uint256[] memory amounts) {
+        require(deadline >= block.timestamp, "UniswapV2Router: EXPIRED");
+        amounts = getAmountsIn(amountOut, path);
+        require(
+            amounts[0] <= amountInMax,
+            "UniswapV2Router: EXCESSIVE_INPUT_AMOUNT"
+        );
+        _swap(amounts, path, to);
+    }
+
+    function _swap(
+        uint256[] memory amounts,
+        address[] memory path,
+        address to
+    ) internal {
+        IERC20(path[0]).safeTransferFrom(msg.sender, address(this), amounts[0]);
+        for (uint256 i = 0; i < path.length - 1; i++) {
+            address input = path[i];
+            address output = path[i + 1];
+            reserves[input][output] = reserves[input][output].add(amounts[i]);
+            reserves[output][input] = reserves[output][input].sub(
+                amounts[i + 1]
+            );
+        }
+        IERC20(path[path.length - 1]).safeTransfer(
+            to,
+            amounts[amounts.length - 1]
+        );
+    }
+}
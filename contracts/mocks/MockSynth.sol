@@ -0,0 +1,45 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+import "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+
+import "./MockMixinResolver.sol";
+
+// sUSD, sBTC, sETH... Only Synthetix contracts (and the owner, to seed the debt pool) mint and burn them
+contract MockSynth is ERC20, MockMixinResolver {
+    bytes32 public currencyKey;
+
+    constructor(
+        address _owner,
+        address _resolver,
+        string memory _name,
+        string memory _symbol,
+        bytes32 _currencyKey
+    ) public ERC20(_name, _symbol) MockMixinResolver(_owner, _resolver) {
+        currencyKey = _currencyKey;
+    }
+
+    modifier onlyInternalContracts {
+        require(
+            msg.sender == owner ||
+                msg.sender == requireAndGetAddress("Issuer") ||
+                msg.sender == requireAndGetAddress("FeePool"),
+            "Only internal contracts allowed"
+        );
+        _;
+    }
+
+    function issue(address account, uint256 amount)
+        external
+        onlyInternalContracts
+    {
+        _mint(account, amount);
+    }
+
+    function burn(address account, uint256 amount)
+        external
+        onlyInternalContracts
+    {
+        _burn(account, amount);
+    }
+}
@@ -0,0 +1,179 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+import "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+
+import "./MockMixinResolver.sol";
+import "./MockIssuer.sol";
+
+// the SNX token and the staking entry point (issue, burn, liquidate), which forwards to the Issuer
+// SNX that backs debt can't be transferred
+contract MockSynthetix is ERC20, MockMixinResolver {
+    event AccountLiquidated(
+        address indexed account,
+        uint256 snxRedeemed,
+        uint256 amountLiquidated,
+        address liquidator
+    );
+
+    constructor(address _owner, address _resolver)
+        public
+        ERC20("Synthetix Network Token", "SNX")
+        MockMixinResolver(_owner, _resolver)
+    {}
+
+    // staking rewards are minted by the FeePool into the RewardEscrowV2
+    function mint(address account, uint256 amount) external {
+        require(
+            msg.sender == owner ||
+                msg.sender == requireAndGetAddress("FeePool"),
+            "Only the owner or the FeePool can mint"
+        );
+        _mint(account, amount);
+    }
+
+    // ********************** ERC20 **********************
+
+    function transfer(address to, uint256 value)
+        public
+        override
+        returns (bool)
+    {
+        _canTransfer(msg.sender, value);
+        return super.transfer(to, value);
+    }
+
+    function transferFrom(
+        address from,
+        address to,
+        uint256 value
+    ) public override returns (bool) {
+        _canTransfer(from, value);
+        return super.transferFrom(from, to, value);
+    }
+
+    function _canTransfer(address account, uint256 value) internal view {
+        if (_issuer().debtShares(account) > 0) {
+            (uint256 transferable, bool anyRateIsInvalid) =
+                _issuer().transferableSynthetixAndAnyRateIsInvalid(
+                    account,
+                    balanceOf(account)
+                );
+            require(
+                value <= transferable,
+                "Cannot transfer staked or escrowed SNX"
+            );
+            require(!anyRateIsInvalid, "A synth or SNX rate is invalid");
+        }
+    }
+
+    // ********************** VIEWS **********************
+
+    function availableCurrencyKeys() external view returns (bytes32[] memory) {
+        return _issuer().availableCurrencyKeys();
+    }
+
+    function availableSynthCount() external view returns (uint256) {
+        return _issuer().availableSynthCount();
+    }
+
+    function anySynthOrSNXRateIsInvalid() external view returns (bool) {
+        return _issuer().anySynthOrSNXRateIsInvalid();
+    }
+
+    function collateral(address account) external view returns (uint256) {
+        return _issuer().collateral(account);
+    }
+
+    function collateralisationRatio(address account)
+        external
+        view
+        returns (uint256)
+    {
+        return _issuer().collateralisationRatio(account);
+    }
+
+    function debtBalanceOf(address account, bytes32 currencyKey)
+        external
+        view
+        returns (uint256)
+    {
+        return _issuer().debtBalanceOf(account, currencyKey);
+    }
+
+    function maxIssuableSynths(address account)
+        external
+        view
+        returns (uint256)
+    {
+        return _issuer().maxIssuableSynths(account);
+    }
+
+    function remainingIssuableSynths(address account)
+        external
+        view
+        returns (
+            uint256 maxIssuable,
+            uint256 alreadyIssued,
+            uint256 totalSystemDebt
+        )
+    {
+        return _issuer().remainingIssuableSynths(account);
+    }
+
+    function transferableSynthetix(address account)
+        external
+        view
+        returns (uint256 transferable)
+    {
+        (transferable, ) = _issuer().transferableSynthetixAndAnyRateIsInvalid(
+            account,
+            balanceOf(account)
+        );
+    }
+
+    // ********************** STAKING **********************
+
+    function issueSynths(uint256 amount) external {
+        _issuer().issueSynths(msg.sender, amount);
+    }
+
+    function issueMaxSynths() external {
+        _issuer().issueMaxSynths(msg.sender);
+    }
+
+    function burnSynths(uint256 amount) external {
+        _issuer().burnSynths(msg.sender, amount);
+    }
+
+    function burnSynthsToTarget() external {
+        _issuer().burnSynthsToTarget(msg.sender);
+    }
+
+    function liquidateDelinquentAccount(address account, uint256 susdAmount)
+        external
+        returns (bool)
+    {
+        (uint256 totalRedeemed, uint256 amountLiquidated) =
+            _issuer().liquidateDelinquentAccount(
+                account,
+                susdAmount,
+                msg.sender
+            );
+
+        emit AccountLiquidated(
+            account,
+            totalRedeemed,
+            amountLiquidated,
+            msg.sender
+        );
+
+        // reverts if the SNX to redeem is escrowed
+        _transfer(account, msg.sender, totalRedeemed);
+        return true;
+    }
+
+    function _issuer() internal view returns (MockIssuer) {
+        return MockIssuer(requireAndGetAddress("Issuer"));
+    }
+}
@@ -0,0 +1,58 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+import "./MockMixinResolver.sol";
+
+// defaults are the mainnet values at the time of writing
+contract MockSystemSettings is Owned {
+    uint256 public rateStalePeriod = 25 hours;
+    uint256 public debtSnapshotStaleTime = 43_800;
+    uint256 public issuanceRatio = 0.2e18; // 500% c-ratio
+    uint256 public targetThreshold = 0.01e18;
+    uint256 public minimumStakeTime = 1 days;
+    uint256 public feePeriodDuration = 1 weeks;
+    uint256 public liquidationDelay = 3 days;
+    uint256 public liquidationRatio = 0.5e18; // 200% c-ratio
+    uint256 public liquidationPenalty = 0.1e18;
+
+    constructor(address _owner) public Owned(_owner) {}
+
+    function setRateStalePeriod(uint256 period) external onlyOwner {
+        rateStalePeriod = period;
+    }
+
+    function setDebtSnapshotStaleTime(uint256 _seconds) external onlyOwner {
+        debtSnapshotStaleTime = _seconds;
+    }
+
+    function setIssuanceRatio(uint256 _issuanceRatio) external onlyOwner {
+        issuanceRatio = _issuanceRatio;
+    }
+
+    function setTargetThreshold(uint256 _targetThreshold) external onlyOwner {
+        targetThreshold = _targetThreshold;
+    }
+
+    function setMinimumStakeTime(uint256 _seconds) external onlyOwner {
+        minimumStakeTime = _seconds;
+    }
+
+    function setFeePeriodDuration(uint256 _feePeriodDuration)
+        external
+        onlyOwner
+    {
+        feePeriodDuration = _feePeriodDuration;
+    }
+
+    function setLiquidationDelay(uint256 time) external onlyOwner {
+        liquidationDelay = time;
+    }
+
+    function setLiquidationRatio(uint256 _liquidationRatio) external onlyOwner {
+        liquidationRatio = _liquidationRatio;
+    }
+
+    function setLiquidationPenalty(uint256 penalty) external onlyOwner {
+        liquidationPenalty = penalty;
+    }
+}
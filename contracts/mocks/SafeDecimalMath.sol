@@ -0,0 +1,56 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+import {SafeMath} from "@openzeppelin/contracts/math/SafeMath.sol";
+
+// Synthetix's fixed point (18 decimals) helpers, the mocks round exactly like Synthetix
+library SafeDecimalMath {
+    using SafeMath for uint256;
+
+    uint256 public constant UNIT = 1e18;
+    uint256 public constant PRECISE_UNIT = 1e27;
+
+    function unit() internal pure returns (uint256) {
+        return UNIT;
+    }
+
+    function multiplyDecimal(uint256 x, uint256 y)
+        internal
+        pure
+        returns (uint256)
+    {
+        return x.mul(y) / UNIT;
+    }
+
+    function multiplyDecimalRound(uint256 x, uint256 y)
+        internal
+        pure
+        returns (uint256)
+    {
+        uint256 quotientTimesTen = x.mul(y) / (UNIT / 10);
+        if (quotientTimesTen % 10 >= 5) {
+            quotientTimesTen += 10;
+        }
+        return quotientTimesTen / 10;
+    }
+
+    function divideDecimal(uint256 x, uint256 y)
+        internal
+        pure
+        returns (uint256)
+    {
+        return x.mul(UNIT).div(y);
+    }
+
+    function divideDecimalRound(uint256 x, uint256 y)
+        internal
+        pure
+        returns (uint256)
+    {
+        uint256 resultTimesTen = x.mul(UNIT * 10).div(y);
+        if (resultTimesTen % 10 >= 5) {
+            resultTimesTen += 10;
+        }
+        return resultTimesTen / 10;
+    }
+}
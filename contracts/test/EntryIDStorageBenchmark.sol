@@ -0,0 +1,44 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+import "../EntryIDQueue.sol";
+
+// Storage layouts used by Strategy to track escrow entries, isolated to compare their gas costs.
+// Both expose the same claim/vest operations and the same read API
+
+// uint256[] plus a cursor (previous Strategy layout)
+contract ArrayEntryIDs {
+    uint256 public entryIDIndex = 0;
+    uint256[] public entryIDs;
+
+    function claim(uint256 _entryID) external {
+        entryIDs.push(_entryID);
+    }
+
+    function vest(uint256 _count) external {
+        entryIDIndex = entryIDIndex + _count;
+    }
+}
+
+// packed queue (current Strategy layout)
+contract PackedEntryIDs {
+    using EntryIDQueue for EntryIDQueue.Queue;
+
+    EntryIDQueue.Queue private entryIDQueue;
+
+    function claim(uint256 _entryID) external {
+        entryIDQueue.push(_entryID);
+    }
+
+    function vest(uint256 _count) external {
+        entryIDQueue.advance(_count);
+    }
+
+    function entryIDs(uint256 _index) external view returns (uint256) {
+        return entryIDQueue.at(_index);
+    }
+
+    function entryIDIndex() external view returns (uint256) {
+        return entryIDQueue.head;
+    }
+}
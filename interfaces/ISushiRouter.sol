@@ -2,6 +2,8 @@
 pragma solidity 0.6.12;
 
 interface ISushiRouter {
+    function WETH() external view returns (address);
+
     function swapExactTokensForTokens(
         uint256,
         uint256,
@@ -22,4 +24,9 @@ interface ISushiRouter {
         external
         view
         returns (uint256[] memory amounts);
+
+    function getAmountsIn(uint256 amountOut, address[] memory path)
+        external
+        view
+        returns (uint256[] memory amounts);
 }
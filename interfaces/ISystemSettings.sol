@@ -0,0 +1,23 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.6.12;
+
+interface ISystemSettings {
+    // Views
+    function rateStalePeriod() external view returns (uint256);
+
+    function debtSnapshotStaleTime() external view returns (uint256);
+
+    function issuanceRatio() external view returns (uint256);
+
+    function targetThreshold() external view returns (uint256);
+
+    function minimumStakeTime() external view returns (uint256);
+
+    function feePeriodDuration() external view returns (uint256);
+
+    function liquidationDelay() external view returns (uint256);
+
+    function liquidationRatio() external view returns (uint256);
+
+    function liquidationPenalty() external view returns (uint256);
+}
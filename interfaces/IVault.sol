@@ -4,6 +4,8 @@ pragma solidity 0.6.12;
 import {IERC20} from "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
 
 interface IVault is IERC20 {
+    function token() external view returns (address);
+
     function deposit() external;
 
     function pricePerShare() external view returns (uint256);
@@ -51,8 +51,30 @@ def main():
     symbol: '{vault.symbol()}'
     """
     )
+    susd_vault = get_address(
+        "sUSD Vault: ", default="0xa5cA62D95D24A4a350983D5B8ac4EB8638887396"
+    )
+    read_proxy = get_address(
+        "Synthetix ReadProxyAddressResolver: ",
+        default="0x4E3b31eB0E5CB73641EE1E65E7dCEFe520bA3ef2",
+    )
+    uniswap = get_address(
+        "Uniswap router: ", default="0x7a250d5630B4cF539739dF2C5dAcb4c659F2488D"
+    )
+    sushiswap = get_address(
+        "Sushiswap router: ", default="0xd9e1cE17f2641f24aE83637ab66a2cca9C378B9F"
+    )
+
     publish_source = click.confirm("Verify source on etherscan?")
     if input("Deploy Strategy? y/[N]: ").lower() != "y":
         return
 
-    strategy = Strategy.deploy(vault, {"from": dev}, publish_source=publish_source)
+    strategy = Strategy.deploy(
+        vault,
+        susd_vault,
+        read_proxy,
+        uniswap,
+        sushiswap,
+        {"from": dev},
+        publish_source=publish_source,
+    )
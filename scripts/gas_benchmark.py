@@ -0,0 +1,144 @@
+"""
+Gas benchmark for the Strategy hot paths (harvest, tend and vault withdraw).
+
+Run it on a mainnet fork once per revision and compare the reports:
+
+    brownie run gas_benchmark main before --network mainnet-fork
+    # ...checkout the new revision...
+    brownie run gas_benchmark main after before --network mainnet-fork
+
+The Strategy and SnxOracle constructors gained arguments over time: the deployment
+follows the ABI of the checked out revision, so both sides run the same scenario.
+"""
+import json
+from pathlib import Path
+
+from brownie import Contract, SnxOracle, Strategy, Wei, accounts, chain, config, project
+from eth_abi import encode_single
+
+REPORTS_DIR = Path("reports") / "gas"
+
+SUSD_VAULT = "0xa5cA62D95D24A4a350983D5B8ac4EB8638887396"
+READ_PROXY = "0x4E3b31eB0E5CB73641EE1E65E7dCEFe520bA3ef2"
+UNISWAP = "0x7a250d5630B4cF539739dF2C5dAcb4c659F2488D"
+SUSHISWAP = "0xd9e1cE17f2641f24aE83637ab66a2cca9C378B9F"
+EXCHANGE_RATES = "0xd69b189020EF614796578AfE4d10378c5e7e1138"
+SNX = "0xc011a73ee8576fb46f5e1c5751ca3b9fe0af2a6f"
+SUSD = "0x57Ab1ec28D129707052df4dF418D58a2D46d5f51"
+SNX_WHALE = "0xA1d7b2d891e3A1f9ef4bBC5be20630C2FEB1c470"
+SUSD_WHALE = "0x49BE88F0fcC3A8393a59d3688480d7D253C37D2A"
+
+
+def _bytes32(name):
+    return encode_single("bytes32", name.encode())
+
+
+def _constructor_args(container, *args):
+    # the leading arguments the constructor of this revision takes
+    return args[: len(container.deploy.abi["inputs"])]
+
+
+def deploy():
+    Vault = project.load(
+        Path.home() / ".brownie" / "packages" / config["dependencies"][0]
+    ).Vault
+    gov, rewards, guardian, strategist = accounts[0:4]
+    snx = Contract(SNX)
+
+    vault = guardian.deploy(Vault)
+    vault.initialize(snx, gov, rewards, "", "", guardian)
+    vault.setDepositLimit(2 ** 256 - 1, {"from": gov})
+    vault.setPerformanceFee(0, {"from": gov})
+    vault.setManagementFee(0, {"from": gov})
+
+    susd_vault = Contract(SUSD_VAULT)
+    susd_vault.setDepositLimit(2 ** 256 - 1, {"from": susd_vault.governance()})
+
+    strategy = strategist.deploy(
+        Strategy,
+        *_constructor_args(Strategy, vault, susd_vault, READ_PROXY, UNISWAP, SUSHISWAP),
+    )
+    vault.addStrategy(strategy, 10_000, 0, 2 ** 256 - 1, 0, {"from": gov})
+
+    # same oracle surgery as tests/conftest.py so prices can be moved freely
+    exchange_rates = Contract(EXCHANGE_RATES)
+    er_owner = accounts.at(exchange_rates.owner(), force=True)
+    resolver = Contract(Contract(READ_PROXY).target())
+    synthetix = resolver.getAddress(_bytes32("Synthetix"))
+    oracle = gov.deploy(
+        SnxOracle, *_constructor_args(SnxOracle, exchange_rates, synthetix)
+    )
+    exchange_rates.setOracle(oracle, {"from": er_owner})
+    for key in ("SNX", "sBTC", "sETH"):
+        if exchange_rates.aggregators(_bytes32(key)) != "0x" + "00" * 20:
+            exchange_rates.removeAggregator(_bytes32(key), {"from": er_owner})
+
+    settings = Contract(resolver.getAddress(_bytes32("SystemSettings")))
+    settings.setRateStalePeriod(24 * 3600 * 30, {"from": settings.owner()})
+    settings.setDebtSnapshotStaleTime(24 * 3600 * 30, {"from": settings.owner()})
+
+    return vault, strategy, oracle, susd_vault
+
+
+def run_scenario():
+    vault, strategy, oracle, susd_vault = deploy()
+    gov, bob = accounts[0], accounts[7]
+    snx, susd = Contract(SNX), Contract(SUSD)
+    gas = {}
+
+    snx.transfer(bob, Wei("1000 ether"), {"from": accounts.at(SNX_WHALE, force=True)})
+    snx.approve(vault, 2 ** 256 - 1, {"from": bob})
+    vault.deposit({"from": bob})
+    oracle.updateSnxPrice(Wei("20 ether"), {"from": gov})
+
+    gas["harvest_invest"] = strategy.harvest({"from": gov}).gas_used
+    chain.sleep(86400 + 1)
+    chain.mine()
+
+    susd.transfer(
+        susd_vault, Wei("1000 ether"), {"from": accounts.at(SUSD_WHALE, force=True)}
+    )
+    gas["harvest_profit"] = strategy.harvest({"from": gov}).gas_used
+
+    # the profit harvest issued: burns are blocked for minimumStakeTime after it
+    chain.sleep(86400 + 1)
+    chain.mine()
+
+    # move the price out of the healthy range so tend has to repay debt
+    oracle.updateSnxPrice(Wei("15 ether"), {"from": gov})
+    gas["tend_repay"] = strategy.tend({"from": gov}).gas_used
+    gas["tend_idle"] = strategy.tend({"from": gov}).gas_used
+
+    chain.sleep(86400 + 1)
+    chain.mine()
+    gas["withdraw"] = vault.withdraw(
+        vault.balanceOf(bob), bob, 10_000, {"from": bob}
+    ).gas_used
+    return gas
+
+
+def compare(before, after):
+    print(f"{'step':<16}{'before':>12}{'after':>12}{'delta':>10}")
+    for step, gas_after in after.items():
+        gas_before = before.get(step)
+        if gas_before is None:
+            print(f"{step:<16}{'-':>12}{gas_after:>12}{'-':>10}")
+            continue
+        delta = (gas_after - gas_before) / gas_before * 100
+        print(f"{step:<16}{gas_before:>12}{gas_after:>12}{delta:>9.1f}%")
+
+
+def main(label="current", baseline=None):
+    gas = run_scenario()
+
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    # reports/gas/<network>.json are the baselines of tests/test_gas.py
+    with (REPORTS_DIR / f"benchmark-{label}.json").open("w") as fp:
+        json.dump(gas, fp, indent=2)
+
+    if baseline is None:
+        print(json.dumps(gas, indent=2))
+        return
+
+    with (REPORTS_DIR / f"benchmark-{baseline}.json").open() as fp:
+        compare(json.load(fp), gas)
@@ -0,0 +1,351 @@
+"""
+Index the logs of Strategy and Vault deployments into SQLite.
+
+Logs are read with `eth_getLogs` over block ranges that grow while they are cheap
+and shrink when the node refuses or times out. Every event of the ABIs gets its own
+table (one column per argument, `PositionUpdated` unpacked, see
+scripts/position_log.py) indexed by block number and by strategy. The cursor is
+saved with each range, so the indexer resumes where it stopped, and it rewinds
+`--reorg-depth` blocks when the hash of its last block changes.
+
+    python -m scripts.indexer --db strategy.sqlite3 --from-block 12500000 \\
+        --strategy 0x... --vault 0x...
+
+The ABIs are read from the brownie build folders (run `brownie compile` first).
+Amounts are stored as decimal TEXT, since they do not fit in SQLite integers.
+`--parquet DIR` also exports every table to Parquet (requires pyarrow) once the
+indexer has caught up with the chain.
+"""
+import argparse
+import json
+import logging
+import sqlite3
+import time
+from pathlib import Path
+
+from eth_abi import decode_abi, decode_single
+from eth_utils import event_abi_to_log_topic, to_checksum_address
+from web3 import Web3
+
+from scripts.position_log import LAYOUT, decode
+
+log = logging.getLogger("indexer")
+
+STRATEGY_ABI = Path("build") / "contracts" / "Strategy.json"
+VAULT_ABI = (
+    Path.home()
+    / ".brownie"
+    / "packages"
+    / "iearn-finance"
+    / "yearn-vaults@0.3.5"
+    / "build"
+    / "contracts"
+    / "Vault.json"
+)
+
+# columns of every event table, before the event arguments
+LOG_COLUMNS = ("block_number", "log_index", "tx_hash", "address", "strategy")
+
+
+def load_abi(path):
+    with Path(path).open() as fp:
+        return json.load(fp)["abi"]
+
+
+class EventDecoder:
+    def __init__(self, abis):
+        self.events = {}  # topic -> event ABI
+        for abi in abis:
+            for item in abi:
+                if item["type"] == "event" and not item.get("anonymous"):
+                    self.events[event_abi_to_log_topic(item)] = item
+
+        # one table per event, overloaded names get the topic as a suffix
+        names = [event["name"] for event in self.events.values()]
+        self.tables = {
+            topic: event["name"]
+            if names.count(event["name"]) == 1
+            else f"{event['name']}_{topic[:4].hex()}"
+            for topic, event in self.events.items()
+        }
+
+    @property
+    def topics(self):
+        return [Web3.toHex(topic) for topic in self.events]
+
+    def columns(self, event):
+        if event["name"] == "PositionUpdated":
+            return [name for word in LAYOUT for name, _ in word]
+        # the `strategy` argument of vault events is the strategy column
+        return [
+            arg["name"] for arg in event["inputs"] if arg["name"] not in LOG_COLUMNS
+        ]
+
+    def decode(self, entry):
+        """
+        Returns (table, {column: value}) of a log, or None if it is not known.
+        """
+        topics = [bytes(topic) for topic in entry["topics"]]
+        event = self.events.get(topics[0]) if topics else None
+        if event is None:
+            return None
+
+        indexed = [arg for arg in event["inputs"] if arg["indexed"]]
+        data = [arg for arg in event["inputs"] if not arg["indexed"]]
+        values = {
+            arg["name"]: decode_single(arg["type"], topic)
+            for arg, topic in zip(indexed, topics[1:])
+        }
+        decoded = decode_abi([arg["type"] for arg in data], bytes(entry["data"]))
+        values.update((arg["name"], value) for arg, value in zip(data, decoded))
+
+        if event["name"] == "PositionUpdated":
+            values = decode(values["packed"]).dict()
+        table = self.tables[topics[0]]
+        return table, {name: _column(value) for name, value in values.items()}
+
+
+def _column(value):
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, bytes):
+        return Web3.toHex(value)
+    if isinstance(value, (list, tuple)):
+        return json.dumps([_column(v) for v in value])
+    if isinstance(value, str) and value.startswith("0x") and len(value) == 42:
+        return to_checksum_address(value)
+    return value
+
+
+class Store:
+    def __init__(self, path, decoder, strategies=()):
+        self.db = sqlite3.connect(str(path))
+        self.decoder = decoder
+        self.strategies = {to_checksum_address(s) for s in strategies}
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS cursor ("
+            "id INTEGER PRIMARY KEY CHECK (id = 0), block INTEGER, hash TEXT)"
+        )
+        for topic, event in decoder.events.items():
+            self._create_table(decoder.tables[topic], event)
+        self.db.commit()
+
+    def _create_table(self, name, event):
+        columns = ", ".join(
+            [
+                "block_number INTEGER",
+                "log_index INTEGER",
+                "tx_hash TEXT",
+                "address TEXT",
+                "strategy TEXT",
+                *(f'"{c}"' for c in self.decoder.columns(event)),
+            ]
+        )
+        self.db.execute(
+            f'CREATE TABLE IF NOT EXISTS "{name}" ('
+            f"{columns}, PRIMARY KEY (block_number, log_index))"
+        )
+        self.db.execute(
+            f'CREATE INDEX IF NOT EXISTS "{name}_strategy" '
+            f'ON "{name}" (strategy, block_number)'
+        )
+
+    def cursor(self):
+        row = self.db.execute("SELECT block, hash FROM cursor").fetchone()
+        return (None, None) if row is None else row
+
+    def append(self, logs, block, block_hash):
+        """
+        Insert the decoded `logs` and move the cursor to `block`, atomically.
+        """
+        rows = {}
+        for entry in logs:
+            decoded = self.decoder.decode(entry)
+            if decoded is None:
+                continue
+            table, values = decoded
+            address = to_checksum_address(entry["address"])
+            # vault events name the strategy they are about
+            strategy = values.pop("strategy", None)
+            if strategy is None and address in self.strategies:
+                strategy = address
+            row = (
+                entry["blockNumber"],
+                entry["logIndex"],
+                Web3.toHex(entry["transactionHash"]),
+                address,
+                strategy,
+                *values.values(),
+            )
+            rows.setdefault(table, []).append(row)
+
+        with self.db:
+            for name, table_rows in rows.items():
+                placeholders = ", ".join("?" * len(table_rows[0]))
+                self.db.executemany(
+                    f'INSERT OR REPLACE INTO "{name}" VALUES ({placeholders})',
+                    table_rows,
+                )
+            self._set_cursor(block, block_hash)
+        return sum(len(table_rows) for table_rows in rows.values())
+
+    def rewind(self, block, block_hash):
+        """
+        Drop everything after `block` (chain reorganisation).
+        """
+        with self.db:
+            for table in self.decoder.tables.values():
+                self.db.execute(
+                    f'DELETE FROM "{table}" WHERE block_number > ?', (block,)
+                )
+            self._set_cursor(block, block_hash)
+
+    def _set_cursor(self, block, block_hash):
+        self.db.execute(
+            "INSERT OR REPLACE INTO cursor VALUES (0, ?, ?)", (block, block_hash)
+        )
+
+    def export_parquet(self, directory):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in self.decoder.tables.values():
+            query = self.db.execute(f'SELECT * FROM "{name}" ORDER BY block_number')
+            columns = [c[0] for c in query.description]
+            rows = query.fetchall()
+            table = pa.table(
+                {c: [row[i] for row in rows] for i, c in enumerate(columns)}
+            )
+            pq.write_table(table, directory / f"{name}.parquet")
+
+
+class Indexer:
+    def __init__(
+        self,
+        web3,
+        store,
+        addresses,
+        from_block=0,
+        reorg_depth=12,
+        min_range=1,
+        max_range=100_000,
+        max_logs=5_000,
+    ):
+        self.web3 = web3
+        self.store = store
+        self.addresses = [to_checksum_address(address) for address in addresses]
+        self.from_block = from_block
+        self.reorg_depth = reorg_depth
+        self.min_range = min_range
+        self.max_range = max_range
+        self.max_logs = max_logs
+        self.range = min_range
+        self.blocks = 0
+        self.logs = 0
+
+    def _block_hash(self, number):
+        return Web3.toHex(self.web3.eth.getBlock(number)["hash"])
+
+    def _check_reorg(self):
+        block, block_hash = self.store.cursor()
+        if block is None:
+            return self.from_block - 1
+        if block >= self.from_block and self._block_hash(block) != block_hash:
+            block = max(block - self.reorg_depth, self.from_block - 1)
+            log.warning("reorg: rewinding to block %d", block)
+            self.store.rewind(block, self._block_hash(block) if block >= 0 else None)
+        return block
+
+    def step(self, block, head):
+        """
+        Index the range of blocks after `block` up to `head`. Returns the last indexed
+        block.
+        """
+        start = block + 1
+        end = min(start + self.range - 1, head)
+        try:
+            logs = self.web3.eth.getLogs(
+                {
+                    "fromBlock": start,
+                    "toBlock": end,
+                    "address": self.addresses,
+                    "topics": [self.store.decoder.topics],
+                }
+            )
+        except Exception as exc:
+            # too many results, timeout...: retry a smaller range
+            if self.range == self.min_range:
+                raise
+            self.range = max(self.range // 2, self.min_range)
+            log.info("%s, range down to %d blocks", exc, self.range)
+            return block
+
+        self.logs += self.store.append(logs, end, self._block_hash(end))
+        self.blocks += end - start + 1
+        if len(logs) < self.max_logs // 2:
+            self.range = min(self.range * 2, self.max_range)
+        elif len(logs) > self.max_logs:
+            self.range = max(self.range // 2, self.min_range)
+        return end
+
+    def catch_up(self):
+        """
+        Index up to the current head of the chain.
+        """
+        head = self.web3.eth.blockNumber
+        # a reorg can only reach the last blocks, the ones indexed before
+        block = self._check_reorg()
+        while block < head:
+            block = self.step(block, head)
+        return block
+
+    def run(self, poll_interval=5.0):
+        while True:
+            started, blocks = time.perf_counter(), self.blocks
+            block = self.catch_up()
+            if self.blocks > blocks:
+                log.info(
+                    "indexed up to block %d, %.0f blocks/s, %d logs so far",
+                    block,
+                    (self.blocks - blocks) / (time.perf_counter() - started),
+                    self.logs,
+                )
+            time.sleep(poll_interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rpc", default="http://127.0.0.1:8545")
+    parser.add_argument("--db", type=Path, default=Path("strategy-logs.sqlite3"))
+    parser.add_argument("--strategy", action="append", default=[])
+    parser.add_argument("--vault", action="append", default=[])
+    parser.add_argument("--from-block", type=int, default=0)
+    parser.add_argument("--reorg-depth", type=int, default=12)
+    parser.add_argument("--max-range", type=int, default=100_000)
+    parser.add_argument("--poll-interval", type=float, default=5.0)
+    parser.add_argument("--strategy-abi", type=Path, default=STRATEGY_ABI)
+    parser.add_argument("--vault-abi", type=Path, default=VAULT_ABI)
+    parser.add_argument("--parquet", type=Path, help="export the tables to Parquet")
+    args = parser.parse_args()
+    if not args.strategy and not args.vault:
+        parser.error("nothing to index, use --strategy and/or --vault")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    decoder = EventDecoder([load_abi(args.strategy_abi), load_abi(args.vault_abi)])
+    store = Store(args.db, decoder, args.strategy)
+    indexer = Indexer(
+        Web3(Web3.HTTPProvider(args.rpc)),
+        store,
+        args.strategy + args.vault,
+        from_block=args.from_block,
+        reorg_depth=args.reorg_depth,
+        max_range=args.max_range,
+    )
+    if args.parquet is not None:
+        indexer.catch_up()
+        store.export_parquet(args.parquet)
+    indexer.run(args.poll_interval)
@@ -0,0 +1,52 @@
+"""
+Blocks per second of scripts/indexer.py against a local chain seeded with harvests.
+
+Deploys the mock system (scripts/mock_system.py), runs `harvests` harvests of the
+Strategy with the SNX price moving every day, then indexes the whole chain into an
+in-memory store, once with the default adaptive ranges and once with ranges capped
+at 100 blocks:
+
+    brownie run indexer_benchmark main 2000
+"""
+import time
+
+from brownie import Strategy, Wei, accounts, chain, web3
+
+from scripts.indexer import EventDecoder, Indexer, Store
+from scripts.mock_system import deploy_local_strategy
+
+# both sides of the healthy range of the target ratio, so harvests issue and repay
+SNX_PRICES = ("20 ether", "22 ether", "20 ether", "18 ether")
+
+
+def seed(strategy, oracle, harvests):
+    gov = accounts[0]
+    for i in range(harvests):
+        oracle.updateSnxPrice(Wei(SNX_PRICES[i % len(SNX_PRICES)]), {"from": gov})
+        strategy.harvest({"from": gov})
+        chain.sleep(86400 + 1)
+
+
+def index(addresses, abis, from_block, **options):
+    store = Store(":memory:", EventDecoder(abis), [addresses[0]])
+    indexer = Indexer(web3, store, addresses, from_block=from_block, **options)
+    started = time.perf_counter()
+    indexer.catch_up()
+    elapsed = time.perf_counter() - started
+    return indexer.blocks / elapsed, indexer.logs / elapsed, indexer.logs
+
+
+def main(harvests=2000):
+    local = deploy_local_strategy()
+    vault, strategy, oracle = local.vault, local.strategy, local.oracle
+    start = web3.eth.blockNumber
+    seed(strategy, oracle, int(harvests))
+    print(f"{int(harvests)} harvests, blocks {start} to {web3.eth.blockNumber}")
+
+    addresses = [strategy.address, vault.address]
+    abis = [Strategy.abi, vault.abi]
+    for label, options in (("adaptive", {}), ("100 blocks", {"max_range": 100})):
+        blocks, logs, total = index(addresses, abis, start, **options)
+        print(
+            f"{label:<12}{blocks:>10.0f} blocks/s{logs:>10.0f} logs/s  ({total} logs)"
+        )
@@ -0,0 +1,324 @@
+"""
+Keeper daemon that tends and harvests many Strategy deployments.
+
+It polls the chain for new blocks, reads `tendTrigger`/`harvestTrigger` of every
+strategy in a single JSON-RPC batch per block, queues the due actions by priority
+and sends `tend()`/`harvest()` with locally pipelined nonces. The same batch reads
+`isResolverCached`, which harvest does not check in full, and sends `rebuildCache()`
+first when a Synthetix contract was upgraded. Receipts are awaited
+concurrently, so a slow transaction never delays the next block.
+
+    python scripts/keeper.py keeper.json
+
+keeper.json:
+
+    {
+        "rpc": "http://127.0.0.1:8545",
+        "keeper": "0x...",
+        "pollInterval": 1.0,
+        "gasLimit": 3000000,
+        "strategies": [{"address": "0x...", "callCost": 0}]
+    }
+
+`callCost` is the cost of a harvest in want (SNX wei): `harvestTrigger` only fires
+when the fees, rewards, vested escrow and sUSD vault profit it would collect are
+worth `profitFactor` times more.
+
+`keeper` must be unlocked on the node (ganache/anvil). To sign locally instead,
+set the KEEPER_PRIVATE_KEY environment variable.
+
+Every cycle logs the block, the number of HTTP requests and JSON-RPC calls it took
+and the latency from seeing the block to submitting its transactions.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+
+import aiohttp
+from eth_abi import decode_single, encode_single
+from eth_account import Account
+from eth_utils import function_signature_to_4byte_selector, to_checksum_address
+
+log = logging.getLogger("keeper")
+
+IS_RESOLVER_CACHED = function_signature_to_4byte_selector("isResolverCached()")
+TEND_TRIGGER = function_signature_to_4byte_selector("tendTrigger(uint256)")
+HARVEST_TRIGGER = function_signature_to_4byte_selector("harvestTrigger(uint256)")
+TEND = function_signature_to_4byte_selector("tend()")
+HARVEST = function_signature_to_4byte_selector("harvest()")
+REBUILD_CACHE = function_signature_to_4byte_selector("rebuildCache()")
+SELECTORS = {"rebuild": REBUILD_CACHE, "harvest": HARVEST, "tend": TEND}
+
+# lower runs first: tend and harvest must not run on retired Synthetix contracts, and
+# a harvest also adjusts the position, so it supersedes a tend
+PRIORITY = {"rebuild": 0, "harvest": 1, "tend": 2}
+
+
+class RpcError(Exception):
+    pass
+
+
+class RpcClient:
+    def __init__(self, session, url):
+        self.session = session
+        self.url = url
+        self.requests = 0  # HTTP round trips
+        self.calls = 0  # JSON-RPC calls
+        self._ids = itertools.count()
+
+    async def batch(self, calls):
+        payload = [
+            {
+                "jsonrpc": "2.0",
+                "id": next(self._ids),
+                "method": method,
+                "params": params,
+            }
+            for method, params in calls
+        ]
+        self.requests += 1
+        self.calls += len(payload)
+        async with self.session.post(self.url, json=payload) as response:
+            replies = await response.json()
+        # a node that rejects the whole batch answers with a single error object
+        if not isinstance(replies, list):
+            raise RpcError(replies.get("error", replies))
+        replies = {reply["id"]: reply for reply in replies}
+        # replies can come back in any order
+        return [replies[request["id"]] for request in payload]
+
+    async def call(self, method, *params):
+        (reply,) = await self.batch([(method, list(params))])
+        if "error" in reply:
+            raise RpcError(reply["error"])
+        return reply["result"]
+
+
+@dataclass
+class StrategyConfig:
+    address: str
+    call_cost: int = 0
+
+
+@dataclass
+class Action:
+    kind: str
+    strategy: str
+    block: int  # where its trigger fired
+
+
+class Keeper:
+    def __init__(self, rpc, strategies, keeper, private_key=None, **options):
+        self.rpc = rpc
+        self.strategies = strategies
+        self.keeper = keeper
+        self.private_key = private_key
+        self.poll_interval = options.get("pollInterval", 1.0)
+        self.gas_limit = options.get("gasLimit", 3_000_000)
+
+        self.queue = []  # actions due in this block
+        self.queued = set()  # (strategy, kind) in the queue
+        self.in_flight = set()  # strategies with a pending transaction
+        self.receipts = set()  # receipt tasks
+        self.nonce = None
+        self.gas_price = None
+        self.chain_id = None
+
+    async def run(self):
+        self.chain_id = int(await self.rpc.call("eth_chainId"), 16)
+        await self._sync_nonce()
+        last_block = None
+        while True:
+            block = int(await self.rpc.call("eth_blockNumber"), 16)
+            if block != last_block:
+                last_block = block
+                await self.cycle(block)
+            await asyncio.sleep(self.poll_interval)
+
+    async def cycle(self, block):
+        started = time.perf_counter()
+        requests, calls = self.rpc.requests, self.rpc.calls
+
+        await self._read_triggers(block)
+        due = len(self.queue)
+        sent = await self._submit_due()
+
+        log.info(
+            "block %d: %d due, %d sent, %d in flight, %d http requests, "
+            "%d rpc calls, %.1f ms",
+            block,
+            due,
+            sent,
+            len(self.in_flight),
+            self.rpc.requests - requests,
+            self.rpc.calls - calls,
+            (time.perf_counter() - started) * 1000,
+        )
+
+    async def _read_triggers(self, block):
+        calls = []
+        for strategy in self.strategies:
+            call_cost = encode_single("uint256", strategy.call_cost)
+            for data in (
+                IS_RESOLVER_CACHED,
+                TEND_TRIGGER + call_cost,
+                HARVEST_TRIGGER + call_cost,
+            ):
+                tx = {"to": strategy.address, "data": _hex(data)}
+                calls.append(("eth_call", [tx, hex(block)]))
+
+        replies = await self.rpc.batch(calls)
+        for i, strategy in enumerate(self.strategies):
+            cached, tend, harvest = replies[3 * i : 3 * i + 3]
+            if "error" not in cached and not _is_true(cached):
+                self._schedule("rebuild", strategy.address, block)
+            if _is_true(harvest):
+                self._schedule("harvest", strategy.address, block)
+            elif _is_true(tend):
+                self._schedule("tend", strategy.address, block)
+
+    def _schedule(self, kind, strategy, block):
+        if strategy in self.in_flight or (strategy, kind) in self.queued:
+            return
+        self.queued.add((strategy, kind))
+        self.queue.append(Action(kind, strategy, block))
+
+    async def _submit_due(self):
+        sent = 0
+        if self.queue:
+            self.gas_price = int(await self.rpc.call("eth_gasPrice"), 16)
+        # every trigger is read again next block, nothing is carried over
+        due = sorted(self.queue, key=lambda action: PRIORITY[action.kind])
+        self.queue = []
+        self.queued.clear()
+        for action in due:
+            # a tend queued behind a harvest of the same strategy is stale
+            if action.strategy in self.in_flight:
+                continue
+            try:
+                tx_hash = await self._send(action)
+            except RpcError as e:
+                log.error("%s %s failed: %s", action.kind, action.strategy, e)
+                await self._sync_nonce()
+                continue
+            sent += 1
+            self.in_flight.add(action.strategy)
+            task = asyncio.ensure_future(
+                self._wait_receipt(action, tx_hash, time.perf_counter())
+            )
+            self.receipts.add(task)
+            task.add_done_callback(self.receipts.discard)
+        return sent
+
+    async def _send(self, action):
+        tx = {
+            "from": self.keeper,
+            "to": action.strategy,
+            "data": _hex(SELECTORS[action.kind]),
+            "gas": self.gas_limit,
+            "gasPrice": self.gas_price,
+            "nonce": self.nonce,
+        }
+        tx_hash = await send_transaction(self.rpc, tx, self.private_key, self.chain_id)
+        # the next transaction does not wait for this one to be mined
+        self.nonce += 1
+        log.info("%s %s sent: %s", action.kind, action.strategy, tx_hash)
+        return tx_hash
+
+    async def _wait_receipt(self, action, tx_hash, sent_at):
+        try:
+            while True:
+                receipt = await self.rpc.call("eth_getTransactionReceipt", tx_hash)
+                if receipt is not None:
+                    break
+                await asyncio.sleep(self.poll_interval)
+        except RpcError as e:
+            # its trigger is read again on the next block
+            log.error(
+                "%s %s receipt of %s failed: %s",
+                action.kind,
+                action.strategy,
+                tx_hash,
+                e,
+            )
+            return
+        finally:
+            self.in_flight.discard(action.strategy)
+
+        log.info(
+            "%s %s %s in block %d (queued at %d), gas used %d, %.1f s",
+            action.kind,
+            action.strategy,
+            "mined" if int(receipt["status"], 16) else "reverted",
+            int(receipt["blockNumber"], 16),
+            action.block,
+            int(receipt["gasUsed"], 16),
+            time.perf_counter() - sent_at,
+        )
+
+    async def _sync_nonce(self):
+        self.nonce = int(
+            await self.rpc.call("eth_getTransactionCount", self.keeper, "pending"), 16
+        )
+
+
+async def send_transaction(rpc, tx, private_key=None, chain_id=None):
+    """
+    Send `tx` from an unlocked account (ganache/anvil) or signed with `private_key`.
+    """
+    if private_key is None:
+        tx = {k: hex(v) if isinstance(v, int) else v for k, v in tx.items()}
+        return await rpc.call("eth_sendTransaction", tx)
+    tx = {k: v for k, v in tx.items() if k != "from"}
+    tx["chainId"] = chain_id
+    signed = Account.sign_transaction(tx, private_key)
+    return await rpc.call("eth_sendRawTransaction", _hex(signed.rawTransaction))
+
+
+def _hex(data):
+    return "0x" + bytes(data).hex()
+
+
+def _is_true(reply):
+    if "error" in reply:
+        log.warning("trigger call failed: %s", reply["error"])
+        return False
+    return decode_single("bool", bytes.fromhex(reply["result"][2:]))
+
+
+def load_config(path):
+    with open(path) as fp:
+        config = json.load(fp)
+    strategies = [
+        StrategyConfig(to_checksum_address(s["address"]), int(s.get("callCost", 0)))
+        for s in config.pop("strategies")
+    ]
+    return config, strategies
+
+
+async def main(config_path):
+    config, strategies = load_config(config_path)
+    private_key = os.environ.get("KEEPER_PRIVATE_KEY")
+    keeper = config.pop("keeper", None)
+    if private_key is not None:
+        keeper = Account.from_key(private_key).address
+    else:
+        keeper = to_checksum_address(keeper)
+
+    async with aiohttp.ClientSession() as session:
+        rpc = RpcClient(session, config.pop("rpc", "http://127.0.0.1:8545"))
+        log.info("keeping %d strategies from %s", len(strategies), keeper)
+        await Keeper(rpc, strategies, keeper, private_key, **config).run()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("config", help="path to the keeper JSON config")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    asyncio.run(main(args.config))
@@ -0,0 +1,200 @@
+"""
+Local Synthetix + Uniswap stack (contracts/mocks) so Strategy runs without a mainnet fork.
+
+    from scripts.mock_system import deploy_mock_system
+
+    system = deploy_mock_system(owner, snx_whale, susd_whale)
+    Strategy.deploy(
+        vault, susd_vault, system.read_proxy, system.uniswap, system.sushiswap, ...
+    )
+
+The debt pool starts at 10M sUSD: 30% sUSD, 30% sBTC (60 BTC at 50k) and 40% sETH
+(2000 ETH at 2k), owned by stakers outside the tests. Moving the BTC and ETH prices
+moves the debt of every staker, like on mainnet. The owner is the oracle until it is
+replaced (see tests/conftest.py::snx_oracle).
+
+Scripts that need a running Strategy on top of it use `deploy_local_strategy()`.
+"""
+from pathlib import Path
+from types import SimpleNamespace
+
+from brownie import (
+    MockAddressResolver,
+    MockDebtCache,
+    MockERC20,
+    MockExchangeRates,
+    MockFeePool,
+    MockIssuer,
+    MockLiquidations,
+    MockReadProxy,
+    MockRewardEscrowV2,
+    MockRouter,
+    MockSynth,
+    MockSynthetix,
+    MockSystemSettings,
+    MockWETH,
+    SnxOracle,
+    Strategy,
+    Wei,
+    accounts,
+    chain,
+    config,
+    project,
+)
+from eth_abi import encode_single
+
+# holds the synths backing the debt of the stakers outside the tests
+NETWORK = "0x000000000000000000000000000000000000dEaD"
+
+PRICES = {"SNX": "20 ether", "sBTC": "50000 ether", "sETH": "2000 ether"}
+FEES_PER_PERIOD = Wei("1000000 ether")  # sUSD
+REWARDS_PER_PERIOD = Wei("1000000 ether")  # SNX
+
+
+def _bytes32(name):
+    return encode_single("bytes32", name.encode())
+
+
+def deploy_mock_system(owner, snx_whale, susd_whale):
+    tx = {"from": owner}
+
+    resolver = MockAddressResolver.deploy(owner, tx)
+    read_proxy = MockReadProxy.deploy(owner, resolver, tx)
+    settings = MockSystemSettings.deploy(owner, tx)
+    exchange_rates = MockExchangeRates.deploy(owner, owner, resolver, tx)
+    synthetix = MockSynthetix.deploy(owner, resolver, tx)
+    issuer = MockIssuer.deploy(owner, resolver, tx)
+    debt_cache = MockDebtCache.deploy(owner, resolver, tx)
+    fee_pool = MockFeePool.deploy(owner, resolver, tx)
+    reward_escrow = MockRewardEscrowV2.deploy(owner, resolver, tx)
+    liquidations = MockLiquidations.deploy(owner, resolver, tx)
+    synths = {
+        key: MockSynth.deploy(owner, resolver, f"Synth {key}", key, _bytes32(key), tx)
+        for key in ("sUSD", "sBTC", "sETH")
+    }
+
+    contracts = {
+        "SystemSettings": settings,
+        "ExchangeRates": exchange_rates,
+        "Synthetix": synthetix,
+        "Issuer": issuer,
+        "DebtCache": debt_cache,
+        "FeePool": fee_pool,
+        "RewardEscrowV2": reward_escrow,
+        "Liquidations": liquidations,
+    }
+    contracts.update({f"Synth{key}": synth for key, synth in synths.items()})
+    resolver.importAddresses(
+        [_bytes32(name) for name in contracts], list(contracts.values()), tx
+    )
+    for synth in synths.values():
+        issuer.addSynth(synth, tx)
+
+    exchange_rates.updateRates(
+        [_bytes32(key) for key in PRICES],
+        [Wei(price) for price in PRICES.values()],
+        chain.time(),
+        tx,
+    )
+    fee_pool.setPeriodDistributions(FEES_PER_PERIOD, REWARDS_PER_PERIOD, tx)
+
+    weth = MockWETH.deploy(tx)
+    usdc = MockERC20.deploy("USD Coin", "USDC", 6, tx)
+    uniswap = MockRouter.deploy(weth, tx)
+    sushiswap = MockRouter.deploy(weth, tx)
+    susd = synths["sUSD"]
+
+    # 3M sUSD: 1M for the whale, 2M in pools. SNX and WETH are not part of the debt
+    synths["sBTC"].issue(NETWORK, Wei("60 ether"), tx)
+    synths["sETH"].issue(NETWORK, Wei("2000 ether"), tx)
+    susd.issue(susd_whale, Wei("1000000 ether"), tx)
+    synthetix.mint(snx_whale, Wei("1000000 ether"), tx)
+
+    # SNX at 20 sUSD and ETH at 2000 sUSD on both venues, sushiswap is half as deep
+    pools = [
+        (uniswap, susd, weth, "1000000 ether", "500 ether"),
+        (uniswap, weth, synthetix, "500 ether", "50000 ether"),
+        (uniswap, susd, usdc, "500000 ether", 500_000 * 10 ** 6),
+        (uniswap, usdc, weth, 500_000 * 10 ** 6, "250 ether"),
+        (sushiswap, susd, weth, "500000 ether", "250 ether"),
+        (sushiswap, weth, synthetix, "250 ether", "25000 ether"),
+    ]
+    for router, token_a, token_b, amount_a, amount_b in pools:
+        amount_a, amount_b = Wei(amount_a), Wei(amount_b)
+        for token, amount in ((token_a, amount_a), (token_b, amount_b)):
+            if token == susd:
+                susd.issue(owner, amount, tx)
+            elif token == synthetix:
+                synthetix.mint(owner, amount, tx)
+            else:
+                token.mint(owner, amount, tx)
+            token.approve(router, amount, tx)
+        router.addLiquidity(token_a, token_b, amount_a, amount_b, tx)
+
+    issuer.importDebt(NETWORK, debt_cache.currentDebt()[0], tx)
+    debt_cache.takeDebtSnapshot(tx)
+
+    return SimpleNamespace(
+        resolver=resolver,
+        read_proxy=read_proxy,
+        settings=settings,
+        exchange_rates=exchange_rates,
+        synthetix=synthetix,
+        issuer=issuer,
+        debt_cache=debt_cache,
+        fee_pool=fee_pool,
+        reward_escrow=reward_escrow,
+        liquidations=liquidations,
+        susd=susd,
+        synths=synths,
+        weth=weth,
+        usdc=usdc,
+        uniswap=uniswap,
+        sushiswap=sushiswap,
+    )
+
+
+def deploy_local_strategy(deposit="1000 ether"):
+    """
+    Mock system, SnxOracle as the oracle, SNX and sUSD vaults and the Strategy, with
+    `deposit` SNX deposited by accounts[0] (governance). Rates and debt snapshots
+    stay valid for 30 days.
+    """
+    Vault = project.load(
+        Path.home() / ".brownie" / "packages" / config["dependencies"][0]
+    ).Vault
+    gov, rewards, guardian, strategist, snx_whale, susd_whale = accounts[0:6]
+    system = deploy_mock_system(gov, snx_whale, susd_whale)
+    system.settings.setRateStalePeriod(24 * 3600 * 30, {"from": gov})
+    system.settings.setDebtSnapshotStaleTime(24 * 3600 * 30, {"from": gov})
+    oracle = gov.deploy(SnxOracle, system.exchange_rates, system.synthetix)
+    system.exchange_rates.setOracle(oracle, {"from": gov})
+
+    vaults = []
+    for token in (system.synthetix, system.susd):
+        vault = guardian.deploy(Vault)
+        vault.initialize(token, gov, rewards, "", "", guardian)
+        vault.setDepositLimit(2 ** 256 - 1, {"from": gov})
+        vaults.append(vault)
+    vault, susd_vault = vaults
+
+    strategy = strategist.deploy(
+        Strategy,
+        vault,
+        susd_vault,
+        system.read_proxy,
+        system.uniswap,
+        system.sushiswap,
+    )
+    vault.addStrategy(strategy, 10_000, 0, 2 ** 256 - 1, 0, {"from": gov})
+
+    system.synthetix.transfer(gov, Wei(deposit), {"from": snx_whale})
+    system.synthetix.approve(vault, 2 ** 256 - 1, {"from": gov})
+    vault.deposit({"from": gov})
+    return SimpleNamespace(
+        system=system,
+        oracle=oracle,
+        vault=vault,
+        susd_vault=susd_vault,
+        strategy=strategy,
+    )
@@ -0,0 +1,71 @@
+"""
+Decode the `PositionUpdated` events of the Strategy.
+
+Every harvest logs the position at the end of `prepareReturn` and of
+`adjustPosition` (tend only logs the latter), packed in four words to keep the log
+cheap. The history of a strategy is rebuilt from its logs alone:
+
+    from scripts.position_log import position_updates
+
+    for update in position_updates(tx):
+        update.debt, update.current_ratio, update.fees_claimed
+"""
+from dataclasses import dataclass, fields
+
+PREPARE_RETURN = 1
+ADJUST_POSITION = 2
+
+# (name, bits) of every packed word, from the most significant bits
+LAYOUT = (
+    (("debt", 96), ("collateral", 96), ("current_ratio", 64)),
+    (("unlocked_want", 96), ("escrowed_want", 96), ("issuance_ratio", 64)),
+    (("susd_in_vault", 96), ("snx_rate", 96), ("target_ratio", 64)),
+    (
+        ("fees_claimed", 96),
+        ("rewards_claimed", 96),
+        ("entries_vested", 56),
+        ("phase", 8),
+    ),
+)
+
+
+@dataclass
+class PositionUpdate:
+    debt: int
+    collateral: int
+    current_ratio: int
+    unlocked_want: int
+    escrowed_want: int
+    issuance_ratio: int
+    susd_in_vault: int
+    snx_rate: int
+    target_ratio: int
+    fees_claimed: int
+    rewards_claimed: int
+    entries_vested: int
+    phase: int
+
+    def dict(self):
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+
+def decode(packed):
+    """
+    Decode the `packed` words of one PositionUpdated event.
+    """
+    values = {}
+    for word, layout in zip(packed, LAYOUT):
+        shift = 256
+        for name, bits in layout:
+            shift -= bits
+            values[name] = (int(word) >> shift) & ((1 << bits) - 1)
+    return PositionUpdate(**values)
+
+
+def position_updates(tx):
+    """
+    PositionUpdated events of a brownie transaction, in order.
+    """
+    if "PositionUpdated" not in tx.events:
+        return []
+    return [decode(event["packed"]) for event in tx.events["PositionUpdated"]]
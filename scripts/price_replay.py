@@ -0,0 +1,108 @@
+"""
+Replay historical SNX/BTC/ETH prices against the Strategy on a local chain.
+
+Every row of the CSV (`snx`, `btc` and `eth` columns, as simulation/replay.py) is a
+tick: the chain moves `step_hours` forward and SnxOracle updates every rate in a
+single transaction. The DebtCache snapshot, which the debt of every staker is
+computed from, is only taken again when the synth prices moved the debt pool by more
+than `snapshot_bps` or when it would go stale. The keeper harvests and tends on their
+triggers:
+
+    brownie run price_replay main prices.csv 1
+
+Deploys the mock system (scripts/mock_system.py) and a Strategy with 1000 SNX first.
+"""
+import csv
+import time
+
+from brownie import Wei, accounts, chain
+
+from scripts.mock_system import deploy_local_strategy
+
+# CSV column of the rates of SnxOracle.currencyKeys(), other synths use their key
+COLUMNS = {"SNX": "snx", "sBTC": "btc", "sETH": "eth"}
+MAX_BPS = 10_000
+
+
+def load_ticks(path):
+    with open(path, newline="") as fp:
+        return [{k: float(v) for k, v in row.items()} for row in csv.DictReader(fp)]
+
+
+class PriceReplay:
+    def __init__(self, oracle, debt_cache, settings, snapshot_bps=10):
+        self.oracle = oracle
+        self.debt_cache = debt_cache
+        self.snapshot_bps = snapshot_bps
+        self.stale_time = settings.debtSnapshotStaleTime()
+        self.keys = [bytes(key).rstrip(b"\0").decode() for key in oracle.currencyKeys()]
+        self.columns = [COLUMNS.get(key, key) for key in self.keys]
+        self.snapshot_rates = None
+        self.snapshot_time = None
+        self.ticks = 0
+        self.snapshots = 0
+
+    def _debt_moved(self, rates):
+        # relative move of the debt of the synths since the snapshot, approximated by
+        # the largest relative move of a synth rate
+        moves = (
+            abs(rate - last) * MAX_BPS / last
+            for key, rate, last in zip(self.keys, rates, self.snapshot_rates)
+            if key != "SNX"
+        )
+        return max(moves, default=0) > self.snapshot_bps
+
+    def tick(self, prices, step):
+        chain.sleep(step)
+        rates = [Wei(f"{prices[column]:.18f} ether") for column in self.columns]
+        self.oracle.updateAllPrices(rates, {"from": accounts[0]})
+        self.ticks += 1
+
+        now = chain.time()
+        if (
+            self.snapshot_rates is None
+            or self._debt_moved(rates)
+            # one tick ahead, the snapshot has to be valid until the next update
+            or now + step >= self.snapshot_time + self.stale_time
+        ):
+            self.debt_cache.takeDebtSnapshot({"from": accounts[0]})
+            self.snapshot_rates = rates
+            self.snapshot_time = now
+            self.snapshots += 1
+
+
+def main(path, step_hours=1, call_cost=0, snapshot_bps=10):
+    ticks = load_ticks(path)
+    local = deploy_local_strategy()
+    strategy, system = local.strategy, local.system
+    replay = PriceReplay(
+        local.oracle, system.debt_cache, system.settings, int(snapshot_bps)
+    )
+    missing = set(replay.columns) - set(ticks[0])
+    if missing:
+        raise ValueError(f"{path} has no {', '.join(sorted(missing))} column")
+
+    keeper = accounts[0]
+    step = int(float(step_hours) * 3600)
+    call_cost = int(call_cost)
+    harvests = tends = 0
+    started = time.perf_counter()
+    for prices in ticks:
+        replay.tick(prices, step)
+        if strategy.harvestTrigger(call_cost):
+            strategy.harvest({"from": keeper})
+            harvests += 1
+        elif strategy.tendTrigger(call_cost):
+            strategy.tend({"from": keeper})
+            tends += 1
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"{replay.ticks} ticks ({replay.ticks * step / 86400:.0f} days) in "
+        f"{elapsed:.0f}s, {replay.ticks / elapsed:.1f} ticks/s"
+    )
+    print(f"{replay.snapshots} debt snapshots, {harvests} harvests, {tends} tends")
+    print(
+        f"debt ratio {strategy.getCurrentRatio() / 1e18:.4f}, "
+        f"total assets {strategy.estimatedTotalAssets() / 1e18:.2f} SNX"
+    )
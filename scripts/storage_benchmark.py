@@ -0,0 +1,95 @@
+"""
+Storage reads of the Strategy in its tend and harvest paths, on the local mocks.
+
+Every SLOAD of the Strategy's own storage is taken from the transaction trace. Since
+EIP-2929 the first read of a slot in a transaction costs 2100 gas (cold) and the next
+ones 100 (warm), so the distinct slots read are what a storage layout changes:
+
+    brownie run storage_benchmark main before
+    # ...checkout the new revision...
+    brownie run storage_benchmark main after before
+"""
+import json
+from pathlib import Path
+
+from brownie import Wei, accounts, chain
+
+from scripts.mock_system import deploy_local_strategy
+
+REPORTS_DIR = Path("reports") / "gas"
+
+COLD_SLOAD = 2100
+WARM_SLOAD = 100
+
+
+def storage_reads(tx, address):
+    """
+    Distinct slots and total SLOADs of the storage of `address` in `tx`.
+    """
+    slots = set()
+    loads = 0
+    for step in tx.trace:
+        if step["op"] == "SLOAD" and step["address"] == address:
+            slots.add(int(step["stack"][-1], 16))
+            loads += 1
+    return {
+        "slots": len(slots),
+        "sloads": loads,
+        "gas": len(slots) * COLD_SLOAD + (loads - len(slots)) * WARM_SLOAD,
+    }
+
+
+def run_scenario():
+    local = deploy_local_strategy()
+    strategy, oracle, system = local.strategy, local.oracle, local.system
+    gov, susd_whale = accounts[0], accounts[5]
+    steps = {}
+
+    def record(step, tx):
+        steps[step] = storage_reads(tx, strategy.address)
+
+    record("harvest_invest", strategy.harvest({"from": gov}))
+    chain.sleep(86400 + 1)
+    chain.mine()
+
+    system.susd.transfer(local.susd_vault, Wei("1000 ether"), {"from": susd_whale})
+    record("harvest_profit", strategy.harvest({"from": gov}))
+    record("tend_idle", strategy.tend({"from": gov}))
+
+    chain.sleep(86400 + 1)
+    chain.mine()
+    oracle.updateSnxPrice(Wei("15 ether"), {"from": gov})
+    record("tend_repay", strategy.tend({"from": gov}))
+    oracle.updateSnxPrice(Wei("25 ether"), {"from": gov})
+    record("tend_issue", strategy.tend({"from": gov}))
+    return steps
+
+
+def compare(before, after):
+    print(f"{'step':<16}{'slots':>12}{'sloads':>12}{'SLOAD gas':>16}")
+    for step, reads in after.items():
+        previous = before.get(step)
+        if previous is None:
+            print(
+                f"{step:<16}{reads['slots']:>12}{reads['sloads']:>12}{reads['gas']:>16}"
+            )
+            continue
+        columns = [
+            f"{previous[key]} -> {reads[key]}" for key in ("slots", "sloads", "gas")
+        ]
+        print(f"{step:<16}{columns[0]:>12}{columns[1]:>12}{columns[2]:>16}")
+
+
+def main(label="current", baseline=None):
+    steps = run_scenario()
+
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    with (REPORTS_DIR / f"storage-{label}.json").open("w") as fp:
+        json.dump(steps, fp, indent=2)
+
+    if baseline is None:
+        print(json.dumps(steps, indent=2))
+        return
+
+    with (REPORTS_DIR / f"storage-{baseline}.json").open() as fp:
+        compare(json.load(fp), steps)
@@ -0,0 +1,97 @@
+"""
+Read the full state of one or many Strategy deployments in a single eth_call.
+
+Every view is encoded into one Multicall `aggregate` call, so a snapshot costs one
+JSON-RPC round trip no matter how many strategies are read:
+
+    from scripts.strategy_state import read_state, read_states
+
+    state = read_state(strategy)
+    states = read_states([strategy, other], block=12_000_000)
+
+The canonical mainnet Multicall is used when it exists on the connected chain,
+otherwise one is deployed from `accounts[0]` (development / local chains).
+"""
+from dataclasses import dataclass, fields
+
+from brownie import Multicall, accounts, web3
+
+MULTICALL = "0xeefBa1e63905eF1D7ACbA5a8513c70307C1cE441"
+
+# StrategyState field -> Strategy view
+VIEWS = {
+    "debt": "balanceOfDebt",
+    "current_ratio": "getCurrentRatio",
+    "issuance_ratio": "getIssuanceRatio",
+    "target_ratio": "getTargetRatio",
+    "balance_of_want": "balanceOfWant",
+    "balance_of_susd": "balanceOfSusd",
+    "balance_of_susd_in_vault": "balanceOfSusdInVault",
+    "balance_of_escrowed_want": "balanceOfEscrowedWant",
+    "estimated_total_assets": "estimatedTotalAssets",
+}
+
+_multicall = {}  # chain id -> Multicall
+
+
+@dataclass
+class StrategyState:
+    __slots__ = ("address", "block") + tuple(VIEWS)
+
+    address: str
+    block: int
+    debt: int
+    current_ratio: int
+    issuance_ratio: int
+    target_ratio: int
+    balance_of_want: int
+    balance_of_susd: int
+    balance_of_susd_in_vault: int
+    balance_of_escrowed_want: int
+    estimated_total_assets: int
+
+    def dict(self):
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+
+def get_multicall():
+    chain_id = web3.eth.chainId
+    if chain_id not in _multicall:
+        if web3.eth.getCode(MULTICALL):
+            _multicall[chain_id] = Multicall.at(MULTICALL)
+        else:
+            _multicall[chain_id] = Multicall.deploy({"from": accounts[0]})
+    multicall = _multicall[chain_id]
+    # a reverted snapshot can take a locally deployed one with it
+    if not web3.eth.getCode(multicall.address):
+        del _multicall[chain_id]
+        return get_multicall()
+    return multicall
+
+
+def read_states(strategies, block=None):
+    """
+    Read every view of `strategies` in one call, at `block` if given (else latest).
+    """
+    calls = [
+        (strategy.address, getattr(strategy, view).encode_input())
+        for strategy in strategies
+        for view in VIEWS.values()
+    ]
+    block_number, results = get_multicall().aggregate.call(
+        calls, block_identifier=block
+    )
+
+    states = []
+    for i, strategy in enumerate(strategies):
+        chunk = results[i * len(VIEWS) : (i + 1) * len(VIEWS)]
+        values = [
+            getattr(strategy, view).decode_output(data)
+            for view, data in zip(VIEWS.values(), chunk)
+        ]
+        states.append(StrategyState(strategy.address, block_number, *values))
+    return states
+
+
+def read_state(strategy, block=None):
+    return read_states([strategy], block)[0]
@@ -0,0 +1,416 @@
+"""
+Liquidation-risk watchdog for one Strategy.
+
+Once SNX falls far enough for the debt ratio of the strategy to reach Synthetix's
+liquidation ratio, anyone can flag it with `Liquidations.flagAccountForLiquidation`
+and it has three days to fix its c-ratio. The watchdog follows new heads and the logs
+of ExchangeRates, DebtCache and the Strategy, and keeps the debt ratio up to date from
+them instead of calling the Strategy views on every block:
+
+- `RatesUpdated` of SNX moves the value of the collateral
+- `DebtCacheSnapshotTaken` revalues the debt pool, and the debt of the strategy with
+  it (by the `DebtCacheUpdated` of the same snapshot)
+- any Strategy log, a mined transaction of the watchdog and every `refreshBlocks`
+  heads read the position again (`getPositionSnapshot`, one batch)
+
+It sends `tend()` when the ratio crosses `targetRatio + repayRatioThreshold`, and
+`manuallyRepayDebt` down to the target ratio when it gets within `liquidationBuffer`
+of the liquidation ratio, regardless of `minRebalanceInterval` (`sender` must be the
+strategist or governance for it). Each level fires once until the ratio is back under
+it. The latency from receiving the update to submitting the transaction is logged.
+
+    python scripts/watchdog.py watchdog.json
+
+watchdog.json:
+
+    {
+        "rpc": "http://127.0.0.1:8545",
+        "ws": "ws://127.0.0.1:8546",
+        "sender": "0x...",
+        "strategy": "0x...",
+        "liquidationBuffer": 0.1,
+        "refreshBlocks": 100,
+        "gasLimit": 3000000
+    }
+
+Without `ws`, heads and logs are polled every `pollInterval` seconds over `rpc`.
+As for the keeper, `sender` must be unlocked on the node unless KEEPER_PRIVATE_KEY
+is set.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+
+import aiohttp
+from eth_abi import decode_abi, decode_single, encode_single
+from eth_account import Account
+from eth_utils import function_signature_to_4byte_selector, keccak, to_checksum_address
+
+from scripts.keeper import RpcClient, RpcError, _hex, send_transaction
+
+log = logging.getLogger("watchdog")
+
+GET_POSITION_SNAPSHOT = function_signature_to_4byte_selector("getPositionSnapshot()")
+REPAY_RATIO_THRESHOLD = function_signature_to_4byte_selector("repayRatioThreshold()")
+RESOLVER = function_signature_to_4byte_selector("resolver()")
+GET_ADDRESS = function_signature_to_4byte_selector("getAddress(bytes32)")
+CACHE_INFO = function_signature_to_4byte_selector("cacheInfo()")
+LIQUIDATION_RATIO = function_signature_to_4byte_selector("liquidationRatio()")
+TEND = function_signature_to_4byte_selector("tend()")
+MANUALLY_REPAY_DEBT = function_signature_to_4byte_selector("manuallyRepayDebt(uint256)")
+
+RATES_UPDATED = "0x" + keccak(text="RatesUpdated(bytes32[],uint256[])").hex()
+DEBT_CACHE_UPDATED = "0x" + keccak(text="DebtCacheUpdated(uint256)").hex()
+DEBT_SNAPSHOT_TAKEN = "0x" + keccak(text="DebtCacheSnapshotTaken(uint256)").hex()
+
+# Strategy.PositionSnapshot, 11 words
+POSITION_SNAPSHOT = "(" + ",".join(["uint256"] * 11) + ")"
+WEI = 10 ** 18
+
+
+@dataclass
+class Update:
+    kind: str  # "head" or "log"
+    block: int
+    seen_at: float  # time.perf_counter() when it was received
+    log: dict = None
+
+
+@dataclass
+class RiskState:
+    debt: int = 0  # sUSD
+    collateral: int = 0  # SNX, includes escrowed SNX
+    snx_rate: int = 0
+    target_ratio: int = 0
+    repay_threshold: int = 0
+    liquidation_ratio: int = 0
+    cached_debt: int = 0  # of the debt pool (DebtCache)
+    block: int = 0  # of the last read of the position
+
+    def current_ratio(self):
+        # as Strategy._refreshPosition: debt (in SNX) / collateral
+        if self.collateral == 0 or self.snx_rate == 0:
+            return 0
+        return self.debt * WEI // self.snx_rate * WEI // self.collateral
+
+    def target_debt(self):
+        # as Strategy.getTargetDebt
+        return self.target_ratio * (self.collateral * self.snx_rate // WEI) // WEI
+
+
+class Watchdog:
+    def __init__(self, rpc, strategy, sender, private_key=None, **options):
+        self.rpc = rpc
+        self.strategy = strategy
+        self.sender = sender
+        self.private_key = private_key
+        self.liquidation_buffer = options.get("liquidationBuffer", 0.1)
+        self.refresh_blocks = options.get("refreshBlocks", 100)
+        self.poll_interval = options.get("pollInterval", 1.0)
+        self.gas_limit = options.get("gasLimit", 3_000_000)
+
+        self.state = RiskState()
+        self.previous_cached_debt = None
+        self.contracts = {}  # Synthetix name -> address
+        self.last_block = None
+        self.stale = False  # the position has to be read again
+        self.armed = {"tend": True, "repay": True}
+        self.in_flight = None  # kind of the pending transaction
+        self.receipts = set()  # receipt tasks
+        self.latencies = []  # (kind, block, seconds from the update to submission)
+        self.nonce = None
+        self.gas_price = None
+        self.chain_id = None
+
+    async def setup(self):
+        self.chain_id = int(await self.rpc.call("eth_chainId"), 16)
+        await self._sync_nonce()
+        (resolver,) = await self._calls([(self.strategy, RESOLVER)])
+        names = ("ExchangeRates", "DebtCache", "SystemSettings")
+        replies = await self._calls(
+            [
+                (
+                    _address(resolver),
+                    GET_ADDRESS + encode_single("bytes32", name.encode()),
+                )
+                for name in names
+            ]
+        )
+        self.contracts = {name: _address(reply) for name, reply in zip(names, replies)}
+        self.last_block = int(await self.rpc.call("eth_blockNumber"), 16)
+        await self.refresh(self.last_block)
+
+    async def refresh(self, block):
+        position, threshold, cache_info, liquidation_ratio = await self._calls(
+            [
+                (self.strategy, GET_POSITION_SNAPSHOT),
+                (self.strategy, REPAY_RATIO_THRESHOLD),
+                (self.contracts["DebtCache"], CACHE_INFO),
+                (self.contracts["SystemSettings"], LIQUIDATION_RATIO),
+            ],
+            block,
+        )
+        debt, collateral, _, _, target_ratio, snx_rate = decode_single(
+            POSITION_SNAPSHOT, position
+        )[:6]
+        self.state = RiskState(
+            debt=debt,
+            collateral=collateral,
+            snx_rate=snx_rate,
+            target_ratio=target_ratio,
+            repay_threshold=decode_single("uint256", threshold),
+            liquidation_ratio=decode_single("uint256", liquidation_ratio),
+            cached_debt=decode_single("(uint256,uint256,bool,bool)", cache_info)[0],
+            block=block,
+        )
+        self.stale = False
+        # the debt read includes every snapshot up to the block
+        self.previous_cached_debt = None
+        # the next transaction does not wait for a gas price
+        self.gas_price = int(await self.rpc.call("eth_gasPrice"), 16)
+
+    async def poll(self):
+        """
+        Handle the logs and the head of the blocks mined since the last poll.
+        """
+        block = int(await self.rpc.call("eth_blockNumber"), 16)
+        if block <= self.last_block:
+            return
+        logs = await self.rpc.call(
+            "eth_getLogs",
+            {
+                "fromBlock": hex(self.last_block + 1),
+                "toBlock": hex(block),
+                "address": self._watched(),
+            },
+        )
+        seen_at = time.perf_counter()
+        for entry in logs:
+            await self.on_update(
+                Update("log", int(entry["blockNumber"], 16), seen_at, entry)
+            )
+        await self.on_update(Update("head", block, seen_at))
+
+    async def subscribe(self, session, url):
+        """
+        Handle new heads and logs as the node pushes them (eth_subscribe).
+        """
+        async with session.ws_connect(url) as ws:
+            subscriptions = {}
+            for request_id, params in enumerate(
+                (["newHeads"], ["logs", {"address": self._watched()}])
+            ):
+                await ws.send_json(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": request_id,
+                        "method": "eth_subscribe",
+                        "params": params,
+                    }
+                )
+            async for message in ws:
+                seen_at = time.perf_counter()
+                data = json.loads(message.data)
+                if "id" in data:
+                    subscriptions[data["result"]] = "head" if data["id"] == 0 else "log"
+                    continue
+                kind = subscriptions.get(data["params"]["subscription"])
+                result = data["params"]["result"]
+                if kind == "head":
+                    await self.on_update(
+                        Update(kind, int(result["number"], 16), seen_at)
+                    )
+                elif kind == "log":
+                    await self.on_update(
+                        Update(kind, int(result["blockNumber"], 16), seen_at, result)
+                    )
+
+    async def on_update(self, update):
+        if update.kind == "head":
+            self.last_block = max(self.last_block, update.block)
+            if self.stale or update.block - self.state.block >= self.refresh_blocks:
+                await self.refresh(update.block)
+        else:
+            await self._apply_log(update)
+        await self.check(update)
+
+    async def check(self, update):
+        state = self.state
+        ratio = state.current_ratio()
+        repay_at = int(state.liquidation_ratio * (1 - self.liquidation_buffer))
+        tend_at = state.target_ratio + state.repay_threshold
+        if ratio < repay_at:
+            self.armed["repay"] = True
+        if ratio <= tend_at:
+            self.armed["tend"] = True
+        if self.in_flight is not None:
+            return
+
+        if ratio >= repay_at and self.armed["repay"]:
+            amount = state.debt - min(state.debt, state.target_debt())
+            data = MANUALLY_REPAY_DEBT + encode_single("uint256", amount)
+            await self._send("repay", data, update, ratio)
+        elif ratio > tend_at and self.armed["tend"]:
+            await self._send("tend", TEND, update, ratio)
+
+    async def _apply_log(self, update):
+        entry = update.log
+        if entry.get("removed"):
+            # reorg: read the position again on the next head
+            self.stale = True
+            return
+        # the last read of the position already includes it
+        if update.block <= self.state.block:
+            return
+
+        address = to_checksum_address(entry["address"])
+        topic = entry["topics"][0] if entry["topics"] else None
+        data = bytes.fromhex(entry["data"][2:])
+        if address == self.strategy:
+            await self.refresh(update.block)
+        elif address == self.contracts["ExchangeRates"] and topic == RATES_UPDATED:
+            for key, rate in zip(*decode_abi(["bytes32[]", "uint256[]"], data)):
+                if key.rstrip(b"\0") == b"SNX":
+                    self.state.snx_rate = rate
+        elif address == self.contracts["DebtCache"] and topic == DEBT_CACHE_UPDATED:
+            self.previous_cached_debt = self.state.cached_debt
+            self.state.cached_debt = decode_single("uint256", data)
+        elif address == self.contracts["DebtCache"] and topic == DEBT_SNAPSHOT_TAKEN:
+            # issues and burns of other stakers also update the cached debt, but they
+            # do not change the debt of the strategy: only snapshots revalue it
+            if self.previous_cached_debt:
+                self.state.debt = (
+                    self.state.debt
+                    * self.state.cached_debt
+                    // self.previous_cached_debt
+                )
+            self.previous_cached_debt = None
+
+    async def _send(self, kind, data, update, ratio):
+        tx = {
+            "from": self.sender,
+            "to": self.strategy,
+            "data": _hex(data),
+            "gas": self.gas_limit,
+            "gasPrice": self.gas_price,
+            "nonce": self.nonce,
+        }
+        try:
+            tx_hash = await send_transaction(
+                self.rpc, tx, self.private_key, self.chain_id
+            )
+        except RpcError as e:
+            log.error("%s failed: %s", kind, e)
+            await self._sync_nonce()
+            return
+        latency = time.perf_counter() - update.seen_at
+        self.nonce += 1
+        self.armed[kind] = False
+        self.in_flight = kind
+        self.latencies.append((kind, update.block, latency))
+        log.info(
+            "%s sent at debt ratio %.4f on the %s of block %d, %.1f ms after it: %s",
+            kind,
+            ratio / WEI,
+            update.kind,
+            update.block,
+            latency * 1000,
+            tx_hash,
+        )
+
+        task = asyncio.ensure_future(self._wait_receipt(kind, tx_hash))
+        self.receipts.add(task)
+        task.add_done_callback(self.receipts.discard)
+
+    async def _wait_receipt(self, kind, tx_hash):
+        try:
+            while True:
+                receipt = await self.rpc.call("eth_getTransactionReceipt", tx_hash)
+                if receipt is not None:
+                    break
+                await asyncio.sleep(self.poll_interval)
+            block = int(receipt["blockNumber"], 16)
+            await self.refresh(block)
+        except RpcError as e:
+            # read the position again on the next head
+            log.error("%s receipt of %s failed: %s", kind, tx_hash, e)
+            self.stale = True
+            return
+        finally:
+            self.in_flight = None
+
+        log.info(
+            "%s %s in block %d, debt ratio %.4f",
+            kind,
+            "mined" if int(receipt["status"], 16) else "reverted",
+            block,
+            self.state.current_ratio() / WEI,
+        )
+
+    async def _calls(self, calls, block=None):
+        tag = "latest" if block is None else hex(block)
+        replies = await self.rpc.batch(
+            [("eth_call", [{"to": to, "data": _hex(data)}, tag]) for to, data in calls]
+        )
+        for reply in replies:
+            if "error" in reply:
+                raise RpcError(reply["error"])
+        return [bytes.fromhex(reply["result"][2:]) for reply in replies]
+
+    async def _sync_nonce(self):
+        self.nonce = int(
+            await self.rpc.call("eth_getTransactionCount", self.sender, "pending"), 16
+        )
+
+    def _watched(self):
+        return [
+            self.strategy,
+            self.contracts["ExchangeRates"],
+            self.contracts["DebtCache"],
+        ]
+
+
+def _address(word):
+    return to_checksum_address(decode_single("address", word))
+
+
+async def main(config_path):
+    with open(config_path) as fp:
+        config = json.load(fp)
+    strategy = to_checksum_address(config.pop("strategy"))
+    private_key = os.environ.get("KEEPER_PRIVATE_KEY")
+    sender = config.pop("sender", None)
+    if private_key is not None:
+        sender = Account.from_key(private_key).address
+    else:
+        sender = to_checksum_address(sender)
+    ws = config.pop("ws", None)
+
+    async with aiohttp.ClientSession() as session:
+        rpc = RpcClient(session, config.pop("rpc", "http://127.0.0.1:8545"))
+        watchdog = Watchdog(rpc, strategy, sender, private_key, **config)
+        await watchdog.setup()
+        log.info(
+            "watching %s from %s, debt ratio %.4f",
+            strategy,
+            sender,
+            watchdog.state.current_ratio() / WEI,
+        )
+        if ws is not None:
+            await watchdog.subscribe(session, ws)
+        else:
+            while True:
+                await watchdog.poll()
+                await asyncio.sleep(watchdog.poll_interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("config", help="path to the watchdog JSON config")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    asyncio.run(main(args.config))
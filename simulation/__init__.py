@@ -0,0 +1,22 @@
+"""
+Monte Carlo model of the Strategy to size `targetRatioMultiplier` and `ratioThreshold`.
+
+It replays the harvest logic of contracts/Strategy.sol (the `adjustPosition` bands,
+the 50% cash rule of `claimProfits` and the sell-want fallback of `repayDebt`) and
+the Synthetix debt pool, fees, escrow and liquidations over correlated SNX/BTC/ETH
+price paths. Every path is a row of NumPy arrays, so a step costs the same few
+vector operations whatever the number of paths:
+
+    from simulation import PricePaths, StrategyParams, simulate
+
+    paths = PricePaths.gbm(n_paths=20_000, n_steps=365, seed=1)
+    result = simulate(paths, StrategyParams(target_ratio_multiplier=15_000))
+    result.summary()["p_liquidation"]
+
+Parameter grids run in a process pool, see `run_grid` and `python -m simulation`.
+Amounts are floats in token units (not wei) and ratios are fractions (not 1e18).
+The strategy is assumed small next to the debt pool and the swap pools.
+"""
+from .grid import run_grid
+from .model import MarketParams, SimulationResult, StrategyParams, simulate
+from .paths import PricePaths
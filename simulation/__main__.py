@@ -0,0 +1,78 @@
+"""
+Liquidation risk and returns over a grid of targetRatioMultiplier x ratioThreshold.
+
+    python -m simulation --paths 20000 --days 365 \
+        --multipliers 11000 12500 15000 --thresholds 1e15 1e16
+"""
+import argparse
+import itertools
+
+from .grid import run_grid
+from .model import MarketParams, StrategyParams
+from .paths import DAY
+
+COLUMNS = (
+    "p_liquidation",
+    "liquidated_want",
+    "p_snx_sold",
+    "total_assets",
+    "total_assets_p5",
+    "max_ratio_p95",
+    "repays",
+    "paths_per_second",
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--paths", type=int, default=10_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--harvest-hours", type=int, default=24)
+    parser.add_argument(
+        "--multipliers", type=int, nargs="+", default=[11_000, 12_500, 15_000]
+    )
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[1e15, 1e16])
+    parser.add_argument("--fees-apr", type=float, default=0.1)
+    parser.add_argument("--rewards-apr", type=float, default=0.3)
+    parser.add_argument("--vault-apr", type=float, default=0.1)
+    args = parser.parse_args()
+
+    grid = [
+        StrategyParams(
+            target_ratio_multiplier=multiplier,
+            issue_ratio_threshold=threshold / 1e18,
+            repay_ratio_threshold=threshold / 1e18,
+            harvest_interval=args.harvest_hours * 3600,
+        )
+        for multiplier, threshold in itertools.product(
+            args.multipliers, args.thresholds
+        )
+    ]
+    market = MarketParams(
+        fees_apr=args.fees_apr, rewards_apr=args.rewards_apr, vault_apr=args.vault_apr
+    )
+    dt = DAY if args.harvest_hours % 24 == 0 else 3600
+    results = run_grid(
+        grid,
+        n_paths=args.paths,
+        n_steps=args.days * DAY // dt,
+        dt=dt,
+        seed=args.seed,
+        market=market,
+        processes=args.processes,
+    )
+
+    print(
+        f"{'multiplier':>10} {'threshold':>10} " + " ".join(f"{c:>16}" for c in COLUMNS)
+    )
+    for params, summary in results:
+        print(
+            f"{params.target_ratio_multiplier:>10} {params.repay_ratio_threshold * 1e18:>10.0e} "
+            + " ".join(f"{summary[c]:>16.4g}" for c in COLUMNS)
+        )
+
+
+if __name__ == "__main__":
+    main()
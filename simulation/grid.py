@@ -0,0 +1,36 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .model import MarketParams, simulate
+from .paths import DAY, PricePaths
+
+
+def _run_point(strategy, market, n_paths, n_steps, dt, seed, deposit, path_kwargs):
+    # every point regenerates the same paths from the seed (common random numbers),
+    # so differences between points come from the parameters only
+    paths = PricePaths.gbm(n_paths, n_steps, dt, seed=seed, **path_kwargs)
+    started = time.perf_counter()
+    summary = simulate(paths, strategy, market, deposit).summary()
+    summary["paths_per_second"] = n_paths / (time.perf_counter() - started)
+    return summary
+
+
+def run_grid(
+    grid,
+    n_paths=10_000,
+    n_steps=365,
+    dt=DAY,
+    seed=0,
+    market=MarketParams(),
+    deposit=1_000.0,
+    processes=None,
+    **path_kwargs,
+):
+    """
+    Simulate every StrategyParams of `grid` in a process pool.
+    Returns (params, summary) pairs in the order of `grid`.
+    """
+    args = (market, n_paths, n_steps, dt, seed, deposit, path_kwargs)
+    with ProcessPoolExecutor(processes) as executor:
+        futures = [executor.submit(_run_point, params, *args) for params in grid]
+        return [(params, future.result()) for params, future in zip(grid, futures)]
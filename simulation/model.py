@@ -0,0 +1,385 @@
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+
+from .paths import DAY, YEAR
+
+WEEK = 7 * DAY
+MAX_BPS = 10_000
+# claimProfits only claims if burning debt down to the issuance ratio takes at most
+# this share of the cash (sUSD in the strategy and in the sUSD vault)
+CLAIM_MAX_CASH = 0.5
+
+
+@dataclass(frozen=True)
+class StrategyParams:
+    target_ratio_multiplier: int = 12_500  # BPS of the issuance ratio
+    issue_ratio_threshold: float = 1e15 / 1e18
+    repay_ratio_threshold: float = 1e15 / 1e18
+    min_rebalance_interval: int = 0  # seconds between two issues or two repays
+    min_issue: float = 50.0  # MIN_ISSUE, in sUSD
+    harvest_interval: int = DAY  # seconds, a multiple of PricePaths.dt
+
+    @property
+    def target_ratio(self):
+        return self.target_ratio_multiplier / MAX_BPS
+
+
+@dataclass(frozen=True)
+class MarketParams:
+    # Synthetix
+    issuance_ratio: float = 0.2
+    minimum_stake_time: int = DAY
+    liquidation_ratio: float = 0.5
+    liquidation_penalty: float = 0.1
+    liquidation_delay: int = 3 * DAY
+    fee_period: int = WEEK
+    escrow_duration: int = 52 * WEEK
+    # sUSD, sBTC and sETH share of the debt pool (as in scripts/mock_system.py)
+    debt_pool: tuple = (0.3, 0.3, 0.4)
+    # yearly fees (sUSD) per sUSD of debt and rewards (SNX) per SNX of collateral
+    fees_apr: float = 0.0
+    rewards_apr: float = 0.0
+    # yearly yield of the sUSD vault
+    vault_apr: float = 0.0
+    # swaps execute at the oracle price minus the pool fee (no price impact)
+    swap_fee: float = 0.003
+
+
+@dataclass
+class SimulationResult:
+    # want + escrowed want + (sUSD + sUSD in vault - debt) in want, at the last step
+    total_assets: np.ndarray
+    final_ratio: np.ndarray
+    max_ratio: np.ndarray
+    liquidations: np.ndarray
+    liquidated_want: np.ndarray  # seized by liquidators, penalty included
+    snx_sold: np.ndarray  # sold by repayDebt when sUSD was not enough
+    repays: np.ndarray
+    issues: np.ndarray
+    skipped_claims: np.ndarray  # claims skipped by the 50% cash rule
+
+    def summary(self):
+        return {
+            "p_liquidation": float(np.mean(self.liquidations > 0)),
+            "liquidated_want": float(np.mean(self.liquidated_want)),
+            "p_snx_sold": float(np.mean(self.snx_sold > 0)),
+            "snx_sold": float(np.mean(self.snx_sold)),
+            "total_assets": float(np.mean(self.total_assets)),
+            "total_assets_p5": float(np.percentile(self.total_assets, 5)),
+            "max_ratio_p95": float(np.percentile(self.max_ratio, 95)),
+            "repays": float(np.mean(self.repays)),
+            "issues": float(np.mean(self.issues)),
+            "skipped_claims": float(np.mean(self.skipped_claims)),
+        }
+
+
+class _Position:
+    # one entry per path
+    __slots__ = (
+        "want",
+        "escrowed",
+        "shares",  # of the debt pool, debt = shares * debt index
+        "susd",
+        "vault",  # sUSD in the sUSD vault
+        "fees",  # claimable sUSD fees
+        "rewards",  # claimable SNX rewards
+        "last_issue",
+        "last_issue_action",  # lastIssueTime
+        "last_repay_action",  # lastRepayTime
+        "flagged_at",
+        "liquidations",
+        "liquidated_want",
+        "snx_sold",
+        "repays",
+        "issues",
+        "skipped_claims",
+    )
+
+    def __init__(self, n_paths):
+        for name in self.__slots__:
+            setattr(self, name, np.zeros(n_paths))
+        self.last_issue[:] = -np.inf
+        self.last_issue_action[:] = -np.inf
+        self.last_repay_action[:] = -np.inf
+        self.flagged_at[:] = np.inf
+
+
+class _Model:
+    """
+    Strategy (harvest) and Synthetix (debt pool, fees, escrow, liquidations) on
+    every path at once. Methods are named after the contract functions they model.
+    """
+
+    def __init__(self, n_paths, strategy, market):
+        self.strategy = strategy
+        self.market = market
+        self.p = _Position(n_paths)
+        self.entries = deque()  # [end time, want per path] of the escrow entries
+        self.max_ratio = None
+        self.now = 0
+        self.snx = None
+        self.index = None
+
+    def set_prices(self, now, snx, index):
+        self.now, self.snx, self.index = now, snx, index
+
+    # ********************** SYNTHETIX **********************
+
+    def debt(self):
+        return self.p.shares * self.index
+
+    def collateral(self):
+        return self.p.want + self.p.escrowed
+
+    def current_ratio(self):
+        collateral = self.collateral()
+        return np.divide(
+            self.debt() / self.snx,
+            collateral,
+            out=np.zeros_like(collateral),
+            where=collateral > 0,
+        )
+
+    def unlocked_want(self):
+        # transferableSynthetix: escrowed want is locked first
+        locked = self.debt() / (self.market.issuance_ratio * self.snx)
+        return np.maximum(self.p.want - np.maximum(locked - self.p.escrowed, 0), 0)
+
+    def can_burn(self):
+        return self.now >= self.p.last_issue + self.market.minimum_stake_time
+
+    def issue(self, amount):
+        self.p.shares += amount / self.index
+        self.p.susd += amount
+        self.p.last_issue = np.where(amount > 0, self.now, self.p.last_issue)
+
+    def burn(self, amount):
+        amount = np.minimum(amount, self.debt())
+        self.p.shares -= amount / self.index
+        self.p.susd -= amount
+        # Liquidations.checkAndRemoveAccountInLiquidation
+        fixed = (amount > 0) & (self.current_ratio() <= self.market.issuance_ratio)
+        self.p.flagged_at[fixed] = np.inf
+
+    def close_fee_period(self):
+        years = self.market.fee_period / YEAR
+        # only the last closed period can be claimed
+        self.p.fees = self.debt() * self.market.fees_apr * years
+        self.p.rewards = self.collateral() * self.market.rewards_apr * years
+
+    def liquidate(self):
+        m, p = self.market, self.p
+        ratio = self.current_ratio()
+        # liquidators flag every account under the liquidation ratio right away
+        flag = (ratio >= m.liquidation_ratio) & np.isinf(p.flagged_at)
+        p.flagged_at[flag] = self.now
+
+        open_ = (self.now >= p.flagged_at + m.liquidation_delay) & (
+            ratio > m.issuance_ratio
+        )
+        if not open_.any():
+            return
+        # calculateAmountToFixCollateral: back to the issuance ratio
+        debt = self.debt()
+        fix = (debt - m.issuance_ratio * self.collateral() * self.snx) / (
+            1 - (1 + m.liquidation_penalty) * m.issuance_ratio
+        )
+        amount = np.where(open_, np.minimum(fix, debt), 0)
+        redeemed = np.minimum(amount * (1 + m.liquidation_penalty) / self.snx, p.want)
+        p.shares -= amount / self.index
+        p.want -= redeemed
+        p.liquidated_want += redeemed
+        p.liquidations += open_
+        p.flagged_at[open_] = np.inf
+
+    # ********************** VENUES **********************
+
+    def withdraw_from_susd_vault(self, amount):
+        # don't leave less than MIN_ISSUE sUSD in the vault
+        vault = self.p.vault
+        withdraw_all = (amount > vault) | (vault - amount <= self.strategy.min_issue)
+        amount = np.where(amount > 0, np.where(withdraw_all, vault, amount), 0)
+        self.p.vault -= amount
+        self.p.susd += amount
+
+    def buy_want_with_susd(self, amount):
+        self.p.want += amount * (1 - self.market.swap_fee) / self.snx
+        self.p.susd -= amount
+
+    def buy_susd_with_want(self, amount):
+        sold = amount / (self.snx * (1 - self.market.swap_fee))
+        self.p.want -= sold
+        self.p.snx_sold += sold
+        self.p.susd += amount
+
+    def susd_for_want(self, amount):
+        return amount * self.snx * (1 - self.market.swap_fee)
+
+    # ********************** STRATEGY **********************
+
+    def harvest(self):
+        claimed = self.claim_profits()
+        self.adjust_position()
+
+        # escrow entries and vesting only move want from escrow to balance, done
+        # after adjustPosition as neither the collateral nor the debt change
+        if claimed.any():
+            self.entries.append([self.now + self.market.escrow_duration, claimed])
+        self.vest_rewards_entries()
+
+    def claim_profits(self):
+        p = self.p
+        available = (p.fees > 0) | (p.rewards > 0)
+        if available.any():
+            claimed = self.claim_fees(available)
+        else:
+            claimed = np.zeros_like(p.want)
+
+        # profits of the sUSD vault
+        debt = self.debt()
+        self.withdraw_from_susd_vault(np.where(debt < p.vault, p.vault - debt, 0))
+        self.buy_want_with_susd(p.susd.copy())
+        return claimed
+
+    def claim_fees(self, available):
+        p = self.p
+        debt = self.debt()
+        target_debt = self.market.issuance_ratio * self.collateral() * self.snx
+        required_payment = debt - target_debt
+        max_cash = (p.susd + p.vault) * CLAIM_MAX_CASH
+        claim = available & ((required_payment <= 0) | (required_payment <= max_cash))
+        p.skipped_claims += available & ~claim
+
+        # burnSynthsToTarget in claimProfits (not subject to the minimum stake time)
+        to_burn = np.where(claim, np.maximum(required_payment, 0), 0)
+        self.withdraw_from_susd_vault(np.where(to_burn > p.susd, to_burn - p.susd, 0))
+        self.burn(to_burn)
+        p.susd += np.where(claim, p.fees, 0)
+        claimed = np.where(claim, p.rewards, 0)
+        p.escrowed += claimed
+        p.fees[claim] = 0
+        p.rewards[claim] = 0
+        return claimed
+
+    def vest_rewards_entries(self):
+        while self.entries and self.entries[0][0] <= self.now:
+            _, amounts = self.entries.popleft()
+            self.p.escrowed -= amounts
+            self.p.want += amounts
+
+    def adjust_position(self):
+        s, p = self.strategy, self.p
+        issuance_ratio = self.market.issuance_ratio
+        target_ratio = issuance_ratio * s.target_ratio
+        ratio = self.current_ratio()
+        debt = self.debt()
+        collateral_value = self.collateral() * self.snx
+
+        repay = (ratio > target_ratio) & (
+            ratio - target_ratio >= s.repay_ratio_threshold
+        )
+        can_repay = self.now >= p.last_repay_action + s.min_rebalance_interval
+        repaid = self.repay_debt(
+            np.where(repay & can_repay, debt - target_ratio * collateral_value, 0)
+        )
+        p.last_repay_action[repaid] = self.now
+
+        max_synths = issuance_ratio * collateral_value
+        issue = (
+            ~repay
+            & (issuance_ratio > ratio)
+            & (issuance_ratio - ratio >= s.issue_ratio_threshold)
+            & (self.now >= p.last_issue_action + s.min_rebalance_interval)
+            & (max_synths - debt >= s.min_issue)
+        )
+        self.issue(np.where(issue, max_synths - debt, 0))
+        p.issues += issue
+        p.last_issue_action[issue] = self.now
+
+        # deposit sUSD in the sUSD vault
+        deposit = np.where(p.susd >= s.min_issue, p.susd, 0)
+        p.susd -= deposit
+        p.vault += deposit
+
+    def repay_debt(self, amount):
+        # returns the paths where debt was repaid
+        p = self.p
+        repaying = amount > 0
+        if not repaying.any():
+            return repaying
+        debt = self.debt()
+        amount = np.minimum(debt, amount)
+        # repay the full debt instead of leaving dust
+        amount = np.where(
+            (debt > amount) & (debt - amount <= self.strategy.min_issue), debt, amount
+        )
+        # _planDeleverage: nothing moves during the minimum stake time
+        amount = np.where(self.can_burn(), amount, 0)
+        self.withdraw_from_susd_vault(np.where(amount > p.susd, amount - p.susd, 0))
+
+        # not enough sUSD: sell unlocked want for the rest and burn once, or if
+        # too little want is unlocked burn the sUSD first to unlock more
+        shortfall = np.where(amount > p.susd, amount - p.susd, 0)
+        sell_first = self.susd_for_want(self.unlocked_want()) >= shortfall
+        repaid = np.where(sell_first, 0, p.susd)
+        self.burn(repaid)
+        self.buy_susd_with_want(
+            np.minimum(self.susd_for_want(self.unlocked_want()), shortfall)
+        )
+        self.burn(np.minimum(amount - repaid, p.susd))
+        p.repays += repaying
+        return amount > 0
+
+    def result(self):
+        p = self.p
+        cash = (p.susd + p.vault - self.debt()) / self.snx
+        return SimulationResult(
+            total_assets=np.maximum(self.collateral() + cash, 0),
+            final_ratio=self.current_ratio(),
+            max_ratio=self.max_ratio,
+            liquidations=p.liquidations,
+            liquidated_want=p.liquidated_want,
+            snx_sold=p.snx_sold,
+            repays=p.repays,
+            issues=p.issues,
+            skipped_claims=p.skipped_claims,
+        )
+
+
+def simulate(paths, strategy=StrategyParams(), market=MarketParams(), deposit=1_000.0):
+    """
+    Run the strategy with `deposit` want over every path of `paths`.
+
+    The deposit is invested by a harvest at step 0. Every step accrues the sUSD
+    vault yield and closes the fee period when it ends. Liquidators then act on the
+    new prices, and the keeper harvests every `strategy.harvest_interval`.
+    """
+    if strategy.harvest_interval % paths.dt:
+        raise ValueError("harvest_interval must be a multiple of the step")
+    harvest_every = strategy.harvest_interval // paths.dt
+    # one contiguous row per step
+    snx = np.ascontiguousarray(paths.snx.T)
+    index = np.ascontiguousarray(paths.debt_index(market.debt_pool).T)
+
+    model = _Model(paths.n_paths, strategy, market)
+    model.p.want[:] = deposit
+    model.set_prices(0, snx[0], index[0])
+    model.harvest()
+    model.max_ratio = model.current_ratio()
+
+    vault_growth = 1 + market.vault_apr * paths.dt / YEAR
+    for step in range(1, paths.n_steps + 1):
+        now = step * paths.dt
+        model.set_prices(now, snx[step], index[step])
+        model.p.vault *= vault_growth
+        if now // market.fee_period > (now - paths.dt) // market.fee_period:
+            model.close_fee_period()
+
+        np.maximum(model.max_ratio, model.current_ratio(), out=model.max_ratio)
+        model.liquidate()
+        if step % harvest_every == 0:
+            model.harvest()
+
+    return model.result()
@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+DAY = 24 * 3600
+YEAR = 365 * DAY
+
+# same starting prices as scripts/mock_system.py
+SPOT = (20.0, 50_000.0, 2_000.0)  # SNX, BTC, ETH in sUSD
+# annualized, rough figures of 2020-2021
+VOL = (1.2, 0.8, 0.9)
+CORR = ((1.0, 0.6, 0.7), (0.6, 1.0, 0.8), (0.7, 0.8, 1.0))
+
+
+@dataclass
+class PricePaths:
+    """
+    SNX, BTC and ETH prices in sUSD, one row per path and one column per step.
+    Column 0 holds the prices of the first harvest.
+    """
+
+    snx: np.ndarray
+    btc: np.ndarray
+    eth: np.ndarray
+    dt: int = DAY  # seconds between steps
+
+    @property
+    def n_paths(self):
+        return self.snx.shape[0]
+
+    @property
+    def n_steps(self):
+        return self.snx.shape[1] - 1
+
+    @classmethod
+    def from_prices(cls, snx, btc=None, eth=None, dt=DAY):
+        """
+        Explicit scenario(s). A 1-D sequence is a single path, BTC and ETH stay at
+        their spot price when not given.
+        """
+        snx = np.atleast_2d(np.asarray(snx, dtype=float))
+        btc = np.full_like(snx, SPOT[1]) if btc is None else btc
+        eth = np.full_like(snx, SPOT[2]) if eth is None else eth
+        btc, eth = (
+            np.broadcast_to(np.atleast_2d(np.asarray(p, dtype=float)), snx.shape)
+            for p in (btc, eth)
+        )
+        return cls(snx, btc, eth, dt)
+
+    @classmethod
+    def gbm(
+        cls,
+        n_paths,
+        n_steps,
+        dt=DAY,
+        spot=SPOT,
+        vol=VOL,
+        drift=(0.0, 0.0, 0.0),
+        corr=CORR,
+        seed=None,
+    ):
+        """
+        Correlated geometric brownian motions (annualized `vol` and `drift`).
+        """
+        rng = np.random.default_rng(seed)
+        vol, drift = np.asarray(vol), np.asarray(drift)
+        years = dt / YEAR
+
+        z = rng.standard_normal((n_paths, n_steps, 3)) @ np.linalg.cholesky(corr).T
+        z *= vol * np.sqrt(years)
+        z += (drift - vol ** 2 / 2) * years
+        log_prices = np.zeros((n_paths, n_steps + 1, 3))
+        np.cumsum(z, axis=1, out=log_prices[:, 1:])
+        prices = np.exp(log_prices, out=log_prices)
+        prices *= spot
+        return cls(prices[..., 0], prices[..., 1], prices[..., 2], dt)
+
+    def debt_index(self, debt_pool):
+        """
+        Debt per debt share, 1 at the first step. `debt_pool` is the share of
+        sUSD, sBTC and sETH in the debt pool at the first step.
+        """
+        w_susd, w_btc, w_eth = debt_pool
+        return (
+            w_susd
+            + w_btc * self.btc / self.btc[:, :1]
+            + w_eth * self.eth / self.eth[:, :1]
+        )
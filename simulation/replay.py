@@ -0,0 +1,94 @@
+"""
+Issue and repay actions of the Strategy over a recorded price series.
+
+Replays the prices of a CSV file (`snx` column, optional `btc` and `eth` columns,
+one row per `--step-hours`) with every combination of issue threshold, repay
+threshold and min rebalance interval, the keeper harvesting at every row:
+
+    python -m simulation.replay prices.csv --issue-thresholds 1e15 1e16 \\
+        --repay-thresholds 1e15 1e16 --intervals 0 86400
+
+Thresholds are in 1e18 (as setRatioThresholds) and intervals in seconds.
+"""
+import argparse
+import csv
+import itertools
+import time
+
+from .model import MarketParams, StrategyParams, simulate
+from .paths import PricePaths
+
+COLUMNS = ("issues", "repays", "actions", "snx_sold", "total_assets", "max_ratio_p95")
+
+
+def load_prices(path, step):
+    with open(path, newline="") as fp:
+        rows = list(csv.DictReader(fp))
+    columns = {
+        name: [float(row[name]) for row in rows]
+        for name in ("snx", "btc", "eth")
+        if name in rows[0]
+    }
+    return PricePaths.from_prices(dt=step, **columns)
+
+
+def replay(paths, grid, market=MarketParams()):
+    """
+    Returns (params, summary) for every StrategyParams of `grid`.
+    """
+    results = []
+    for params in grid:
+        summary = simulate(paths, params, market).summary()
+        summary["actions"] = summary["issues"] + summary["repays"]
+        results.append((params, summary))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("prices", help="CSV with snx[,btc,eth] columns")
+    parser.add_argument("--step-hours", type=int, default=1)
+    parser.add_argument("--multiplier", type=int, default=12_500)
+    parser.add_argument("--issue-thresholds", type=float, nargs="+", default=[1e15])
+    parser.add_argument("--repay-thresholds", type=float, nargs="+", default=[1e15])
+    parser.add_argument("--intervals", type=int, nargs="+", default=[0])
+    args = parser.parse_args()
+
+    step = args.step_hours * 3600
+    paths = load_prices(args.prices, step)
+    grid = [
+        StrategyParams(
+            target_ratio_multiplier=args.multiplier,
+            issue_ratio_threshold=issue / 1e18,
+            repay_ratio_threshold=repay / 1e18,
+            min_rebalance_interval=interval,
+            harvest_interval=step,
+        )
+        for issue, repay, interval in itertools.product(
+            args.issue_thresholds, args.repay_thresholds, args.intervals
+        )
+    ]
+
+    started = time.perf_counter()
+    results = replay(paths, grid)
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"{'issue':>8} {'repay':>8} {'interval':>9} "
+        + " ".join(f"{c:>14}" for c in COLUMNS)
+    )
+    for params, summary in results:
+        print(
+            f"{params.issue_ratio_threshold * 1e18:>8.0e} "
+            f"{params.repay_ratio_threshold * 1e18:>8.0e} "
+            f"{params.min_rebalance_interval:>9} "
+            + " ".join(f"{summary[c]:>14.4g}" for c in COLUMNS)
+        )
+    print(
+        f"{paths.n_steps} steps x {len(grid)} configurations in {elapsed:.2f}s "
+        f"({paths.n_steps * len(grid) / elapsed:.0f} steps/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,130 +1,295 @@
 import pytest
-from brownie import config, Contract
+from brownie import (
+    Wei,
+    config,
+    Contract,
+    interface,
+    network,
+    MockDebtCache,
+    MockExchangeRates,
+    MockFeePool,
+    MockIssuer,
+    MockLiquidations,
+    MockSynthetix,
+    MockSystemSettings,
+)
 from eth_abi import encode_single
 
+from scripts.mock_system import deploy_mock_system
 
-@pytest.fixture
+# On the development network the tests run against the mocks in contracts/mocks,
+# on mainnet-fork against the live Synthetix, Uniswap and Sushiswap contracts
+READ_PROXY = "0x4E3b31eB0E5CB73641EE1E65E7dCEFe520bA3ef2"
+UNISWAP = "0x7a250d5630B4cF539739dF2C5dAcb4c659F2488D"
+SUSHISWAP = "0xd9e1cE17f2641f24aE83637ab66a2cca9C378B9F"
+
+# longer than the 52 weeks escrowed rewards stay locked, so that tests can move time
+# freely without the rates or the debt snapshot going stale
+STALE_PERIOD = 60 * 7 * 24 * 3600
+
+MOCKS = {
+    "SystemSettings": MockSystemSettings,
+    "ExchangeRates": MockExchangeRates,
+    "DebtCache": MockDebtCache,
+    "FeePool": MockFeePool,
+    "Issuer": MockIssuer,
+    "Synthetix": MockSynthetix,
+    "Liquidations": MockLiquidations,
+}
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--update-gas-baseline",
+        action="store_true",
+        help="write the gas used by tests/test_gas.py as the new baseline",
+    )
+
+
+def is_forked():
+    return "fork" in network.show_active()
+
+
+def synthetix_contract(resolver, name):
+    address = resolver.getAddress(encode_single("bytes32", name.encode()))
+    if is_forked():
+        return Contract(address)
+    return MOCKS[name].at(address)
+
+
+# Deployments are module scoped: brownie resets the chain before each module and
+# fn_isolation reverts to the state left by the module fixtures after every test
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+@pytest.fixture(scope="module")
+def mock_system(gov, snx_whale, susd_whale):
+    if is_forked():
+        yield None
+    else:
+        yield deploy_mock_system(gov, snx_whale, susd_whale)
+
+
+@pytest.fixture(scope="session")
 def gov(accounts):
     yield accounts[0]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def rewards(accounts):
     yield accounts[1]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def guardian(accounts):
     yield accounts[2]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def management(accounts):
     yield accounts[3]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def strategist(accounts):
     yield accounts[4]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def keeper(accounts):
     yield accounts[5]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def alice(accounts):
     yield accounts[6]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def bob(accounts):
     yield accounts[7]
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def token(snx):
     yield snx
 
 
-@pytest.fixture
-def amount(accounts, token):
+@pytest.fixture(scope="module")
+def amount(accounts, token, snx_whale):
     amount = 10_000 * 10 ** token.decimals()
     # In order to get some funds for the token you are about to use,
     # it impersonate an exchange address to use it's funds.
-    reserve = accounts.at("0xd551234ae421e3bcba99a0da6d736074f22192ff", force=True)
+    if is_forked():
+        reserve = accounts.at("0xd551234ae421e3bcba99a0da6d736074f22192ff", force=True)
+    else:
+        reserve = snx_whale
     token.transfer(accounts[0], amount, {"from": reserve})
     yield amount
 
 
-@pytest.fixture
-def weth():
-    yield Contract("0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2")
+@pytest.fixture(scope="module")
+def weth(mock_system):
+    if is_forked():
+        yield Contract("0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2")
+    else:
+        yield mock_system.weth
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def weth_amout(gov, weth):
     weth_amout = 10 ** weth.decimals()
     gov.transfer(weth, weth_amout)
     yield weth_amout
 
 
-@pytest.fixture
-def susd():
-    yield Contract("0x57Ab1ec28D129707052df4dF418D58a2D46d5f51")
+@pytest.fixture(scope="module")
+def usdc(mock_system):
+    if is_forked():
+        yield Contract("0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48")
+    else:
+        yield mock_system.usdc
 
 
-@pytest.fixture
-def snx():
-    yield Contract("0xc011a73ee8576fb46f5e1c5751ca3b9fe0af2a6f")
+@pytest.fixture(scope="module")
+def susd(mock_system):
+    if is_forked():
+        yield Contract("0x57Ab1ec28D129707052df4dF418D58a2D46d5f51")
+    else:
+        yield mock_system.susd
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
+def snx(mock_system):
+    if is_forked():
+        yield Contract("0xc011a73ee8576fb46f5e1c5751ca3b9fe0af2a6f")
+    else:
+        yield mock_system.synthetix
+
+
+@pytest.fixture(scope="session")
 def susd_whale(accounts):
-    yield accounts.at("0x49BE88F0fcC3A8393a59d3688480d7D253C37D2A", force=True)
+    if is_forked():
+        yield accounts.at("0x49BE88F0fcC3A8393a59d3688480d7D253C37D2A", force=True)
+    else:
+        yield accounts[9]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def snx_whale(accounts):
-    yield accounts.at("0xA1d7b2d891e3A1f9ef4bBC5be20630C2FEB1c470", force=True)
+    if is_forked():
+        yield accounts.at("0xA1d7b2d891e3A1f9ef4bBC5be20630C2FEB1c470", force=True)
+    else:
+        yield accounts[8]
 
 
-@pytest.fixture
-def snx_oracle(gov, accounts, SnxOracle):
-    exchange_rate = Contract("0xd69b189020EF614796578AfE4d10378c5e7e1138")
-    er_gov = accounts.at(exchange_rate.owner(), force=True)
-    new_oracle = gov.deploy(SnxOracle, "0xd69b189020EF614796578AfE4d10378c5e7e1138")
-    exchange_rate.setOracle(new_oracle, {"from": er_gov})
+@pytest.fixture(scope="module")
+def read_proxy(mock_system):
+    if is_forked():
+        yield interface.IReadProxy(READ_PROXY)
+    else:
+        yield mock_system.read_proxy
+
+
+@pytest.fixture(scope="module")
+def uniswap(mock_system):
+    yield UNISWAP if is_forked() else mock_system.uniswap
+
+
+@pytest.fixture(scope="module")
+def sushiswap(mock_system):
+    yield SUSHISWAP if is_forked() else mock_system.sushiswap
+
+
+@pytest.fixture(scope="module")
+def resolver(read_proxy, mock_system):
+    if is_forked():
+        yield Contract(read_proxy.target())
+    else:
+        yield mock_system.resolver
+
+
+@pytest.fixture(scope="module")
+def system_settings(resolver):
+    yield synthetix_contract(resolver, "SystemSettings")
+
+
+@pytest.fixture(scope="module")
+def exchange_rates(resolver):
+    yield synthetix_contract(resolver, "ExchangeRates")
+
+
+@pytest.fixture(scope="module")
+def debt_cache(resolver):
+    yield synthetix_contract(resolver, "DebtCache")
+
+
+@pytest.fixture(scope="module")
+def fee_pool(resolver):
+    yield synthetix_contract(resolver, "FeePool")
+
+
+@pytest.fixture(scope="module")
+def reward_escrow(resolver):
+    yield synthetix_contract(resolver, "RewardEscrowV2")
+
+
+@pytest.fixture(scope="module")
+def issuer(resolver):
+    yield synthetix_contract(resolver, "Issuer")
+
+
+@pytest.fixture(scope="module")
+def synthetix(resolver):
+    yield synthetix_contract(resolver, "Synthetix")
+
+
+@pytest.fixture(scope="module")
+def liquidations(resolver):
+    yield synthetix_contract(resolver, "Liquidations")
+
+
+@pytest.fixture(scope="module")
+def snx_oracle(gov, accounts, SnxOracle, exchange_rates, synthetix):
+    er_gov = accounts.at(exchange_rates.owner(), force=True)
+    new_oracle = gov.deploy(SnxOracle, exchange_rates, synthetix)
+    exchange_rates.setOracle(new_oracle, {"from": er_gov})
 
     if (
-        exchange_rate.aggregators(encode_single("bytes32", b"SNX"))
+        exchange_rates.aggregators(encode_single("bytes32", b"SNX"))
         == "0x0000000000000000000000000000000000000000"
     ):
         yield new_oracle
     else:
         # If we don't remove the aggregator prices update through oracle are not considered
-        exchange_rate.removeAggregator(
+        exchange_rates.removeAggregator(
             encode_single("bytes32", b"SNX"), {"from": er_gov}
         )
-        exchange_rate.removeAggregator(
+        exchange_rates.removeAggregator(
             encode_single("bytes32", b"sBTC"), {"from": er_gov}
         )
-        exchange_rate.removeAggregator(
+        exchange_rates.removeAggregator(
             encode_single("bytes32", b"sETH"), {"from": er_gov}
         )
         yield new_oracle
 
 
-@pytest.fixture
-def susd_vault(accounts):
-    vault = Contract("0xa5cA62D95D24A4a350983D5B8ac4EB8638887396")
-    susd_gov = accounts.at(vault.governance(), force=True)
+@pytest.fixture(scope="module")
+def susd_vault(pm, accounts, gov, rewards, guardian, susd):
+    if is_forked():
+        vault = Contract("0xa5cA62D95D24A4a350983D5B8ac4EB8638887396")
+        susd_gov = accounts.at(vault.governance(), force=True)
+    else:
+        vault = guardian.deploy(pm(config["dependencies"][0]).Vault)
+        vault.initialize(susd, gov, rewards, "", "", guardian)
+        susd_gov = gov
     vault.setDepositLimit(2 ** 256 - 1, {"from": susd_gov})
     yield vault
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def vault(pm, gov, rewards, guardian, management, token):
     Vault = pm(config["dependencies"][0]).Vault
     vault = guardian.deploy(Vault)
@@ -136,9 +301,66 @@ def vault(pm, gov, rewards, guardian, management, token):
     yield vault
 
 
-@pytest.fixture
-def strategy(strategist, keeper, vault, Strategy, gov, susd_vault):
-    strategy = strategist.deploy(Strategy, vault, susd_vault)
+@pytest.fixture(scope="module")
+def strategy(
+    strategist,
+    keeper,
+    vault,
+    Strategy,
+    gov,
+    susd_vault,
+    read_proxy,
+    uniswap,
+    sushiswap,
+):
+    strategy = strategist.deploy(
+        Strategy, vault, susd_vault, read_proxy, uniswap, sushiswap
+    )
     strategy.setKeeper(keeper)
     vault.addStrategy(strategy, 10_000, 0, 2 ** 256 - 1, 0, {"from": gov})
     yield strategy
+
+
+@pytest.fixture(scope="module")
+def stale_period(system_settings):
+    owner = system_settings.owner()
+    system_settings.setRateStalePeriod(STALE_PERIOD, {"from": owner})
+    system_settings.setDebtSnapshotStaleTime(STALE_PERIOD, {"from": owner})
+
+
+def _deposit(snx, snx_whale, bob, vault):
+    # bob deposits 1000 SNX
+    deposit = Wei("1000 ether")
+    snx.transfer(bob, deposit, {"from": snx_whale})
+    snx.approve(vault, 2 ** 256 - 1, {"from": bob})
+    vault.deposit({"from": bob})
+    return deposit
+
+
+def _invest(snx_oracle, strategy, gov):
+    # first harvest with an SNX price of 20
+    snx_oracle.updateSnxPrice(Wei("20 ether"), {"from": gov})
+    strategy.harvest({"from": gov})
+
+
+@pytest.fixture
+def deposit(snx, snx_whale, bob, vault):
+    yield _deposit(snx, snx_whale, bob, vault)
+
+
+@pytest.fixture
+def invested(stale_period, deposit, snx_oracle, strategy, gov):
+    _invest(snx_oracle, strategy, gov)
+    yield deposit
+
+
+# Same state as invested, built once per module: fn_isolation reverts every test to
+# it. Only for modules where every test starts invested, since the tests that do not
+# request it would see it too
+@pytest.fixture(scope="module")
+def invested_module(
+    stale_period, snx, snx_whale, bob, vault, snx_oracle, strategy, gov
+):
+    deposit = _deposit(snx, snx_whale, bob, vault)
+    _invest(snx_oracle, strategy, gov)
+    yield deposit
@@ -1,38 +1,10 @@
 import brownie
-from brownie import Wei, Contract
-from eth_abi import encode_single
+from brownie import Wei
 
 
 def test_debt_increases(
-    snx,
-    chain,
-    gov,
-    vault,
-    strategy,
-    susd,
-    susd_vault,
-    susd_whale,
-    snx_whale,
-    bob,
-    snx_oracle,
+    snx, chain, gov, vault, strategy, bob, snx_oracle, debt_cache, invested_module
 ):
-    chain.snapshot()
-    # Move stale period to 6 days
-    resolver = Contract(strategy.resolver())
-    settings = Contract(
-        resolver.getAddress(encode_single("bytes32", b"SystemSettings"))
-    )
-    settings.setRateStalePeriod(24 * 3600 * 6, {"from": settings.owner()})
-    settings.setDebtSnapshotStaleTime(24 * 3600 * 6, {"from": settings.owner()})
-
-    snx.transfer(bob, Wei("1000 ether"), {"from": snx_whale})
-    snx.approve(vault, 2 ** 256 - 1, {"from": bob})
-    vault.deposit({"from": bob})
-
-    # Invest with an SNX price of 20
-    snx_oracle.updateSnxPrice(Wei("20 ether"), {"from": gov})
-    strategy.harvest({"from": gov})
-
     chain.sleep(86400 + 1)  # just over 24h
     chain.mine()
 
@@ -41,22 +13,12 @@ def test_debt_increases(
     assert strategy.balanceOfSusdInVault() > 0
 
     # debt pool value increases (main assets are ETH and WBTC so increasing its price increases debt pool value)
-    debtCache = Contract(resolver.getAddress(encode_single("bytes32", b"DebtCache")))
-
-    # done to cache from infura
-    try:
-        print("Taking Debt Snapshot, this will take a while...")
-        debtCache.takeDebtSnapshot({"from": debtCache.owner()})
-    except:
-        print(
-            "Failed. This is expected due to timeout but it is useful to cache, next call will go through"
-        )
 
     previous_debt = strategy.balanceOfDebt()
 
     snx_oracle.updateBTCPrice(Wei("70000 ether"), {"from": gov})
     snx_oracle.updateETHPrice(Wei("2500 ether"), {"from": gov})
-    debtCache.takeDebtSnapshot({"from": debtCache.owner()})
+    debt_cache.takeDebtSnapshot({"from": debt_cache.owner()})
 
     # check that our debt has increased when debt pool value has increased
     assert strategy.balanceOfDebt() > previous_debt
@@ -79,7 +41,7 @@ def test_debt_increases(
     # increase debt pool value up to the point that debt ratio is unhealthy
     snx_oracle.updateBTCPrice(Wei("120000 ether"), {"from": gov})
     snx_oracle.updateETHPrice(Wei("3500 ether"), {"from": gov})
-    debtCache.takeDebtSnapshot({"from": debtCache.owner()})
+    debt_cache.takeDebtSnapshot({"from": debt_cache.owner()})
 
     # the strategy should repay debt and get to targetRatio without selling
     previous_snx = snx.balanceOf(strategy)
@@ -107,39 +69,11 @@ def test_debt_increases(
 
     # bob lost SNX
     assert snx.balanceOf(bob) < Wei("1000 ether")
-    chain.revert()
 
 
 def test_debt_decreases(
-    snx,
-    chain,
-    gov,
-    vault,
-    strategy,
-    susd,
-    susd_vault,
-    susd_whale,
-    snx_whale,
-    bob,
-    snx_oracle,
+    snx, chain, gov, vault, strategy, bob, snx_oracle, debt_cache, invested_module
 ):
-    chain.snapshot()
-
-    # Move stale period to 6 days
-    resolver = Contract(strategy.resolver())
-    settings = Contract(
-        resolver.getAddress(encode_single("bytes32", b"SystemSettings"))
-    )
-    settings.setRateStalePeriod(24 * 3600 * 6, {"from": settings.owner()})
-    settings.setDebtSnapshotStaleTime(24 * 3600 * 6, {"from": settings.owner()})
-
-    snx.transfer(bob, Wei("1000 ether"), {"from": snx_whale})
-    snx.approve(vault, 2 ** 256 - 1, {"from": bob})
-    vault.deposit({"from": bob})
-
-    # Invest with an SNX price of 20
-    snx_oracle.updateSnxPrice(Wei("20 ether"), {"from": gov})
-    strategy.harvest({"from": gov})
 
     chain.sleep(86400 + 1)  # just over 24h
     chain.mine()
@@ -151,20 +85,10 @@ def test_debt_decreases(
     previous_debt = strategy.balanceOfDebt()
 
     # debt pool value decreases (main assets are ETH and WBTC so decreasing its price decreases debt pool value)
-    debtCache = Contract(resolver.getAddress(encode_single("bytes32", b"DebtCache")))
-
-    # done to cache from infura
-    try:
-        print("Taking Debt Snapshot, this will take a while...")
-        debtCache.takeDebtSnapshot({"from": debtCache.owner()})
-    except:
-        print(
-            "Failed. This is expected due to timeout but it is useful to cache, next call will go through"
-        )
 
     snx_oracle.updateBTCPrice(Wei("30000 ether"), {"from": gov})
     snx_oracle.updateETHPrice(Wei("1500 ether"), {"from": gov})
-    debtCache.takeDebtSnapshot({"from": debtCache.owner()})
+    debt_cache.takeDebtSnapshot({"from": debt_cache.owner()})
 
     # check that our debt has decreased when debt pool value has increased
     assert strategy.balanceOfDebt() < previous_debt
@@ -173,7 +97,12 @@ def test_debt_decreases(
     assert strategy.getCurrentRatio() < strategy.getIssuanceRatio()
     assert strategy.getCurrentRatio() < strategy.getTargetRatio()
 
-    # harvesting should issue more debt
+    # harvesting should issue more debt, which pays for selling the sUSD vault profit
+    flows = strategy.getSusdFlows().dict()
+    assert flows["vaultProfit"] == Wei("4000 ether") - strategy.balanceOfDebt()
+    assert flows["toIssue"] == flows["vaultProfit"]
+    assert flows["fromVault"] == flows["toDeposit"] == 0
+
     previous_ratio = strategy.getCurrentRatio()
     previous_debt = strategy.balanceOfDebt()
     previous_vault_balance = snx.balanceOf(vault)
@@ -196,4 +125,3 @@ def test_debt_decreases(
 
     # bob earned SNX
     assert snx.balanceOf(bob) > Wei("1000 ether")
-    chain.revert()
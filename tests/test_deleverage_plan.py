@@ -0,0 +1,66 @@
+from brownie import Wei
+
+
+def test_plan_during_minimum_stake_time(gov, strategy, invested_module):
+    debt = strategy.balanceOfDebt()
+    plan = strategy.getDeleveragePlan(debt).dict()
+    assert plan["amountToRepay"] == debt
+    assert not plan["canBurn"]
+    assert plan["fromVault"] == 0
+
+    # nothing is withdrawn nor sold when the debt can't be burnt
+    previous_vault_balance = strategy.balanceOfSusdInVault()
+    strategy.manuallyRepayDebt(debt, {"from": gov})
+    assert strategy.balanceOfDebt() == debt
+    assert strategy.balanceOfSusdInVault() == previous_vault_balance
+    assert strategy.balanceOfWant() == Wei("1000 ether")
+
+
+def test_plan_repays_from_vault(chain, gov, strategy, invested_module):
+    chain.sleep(86400 + 1)  # just over 24h
+    chain.mine()
+
+    plan = strategy.getDeleveragePlan(Wei("1000 ether")).dict()
+    assert plan["canBurn"]
+    assert plan["fromVault"] == Wei("1000 ether")
+    assert plan["burnBeforeSwap"] == 0
+    assert plan["wantToSell"] == 0
+    assert plan["burnAfterSwap"] == Wei("1000 ether")
+
+    # repaying almost all the debt repays all of it
+    debt = strategy.balanceOfDebt()
+    plan = strategy.getDeleveragePlan(debt - Wei("10 ether")).dict()
+    assert plan["amountToRepay"] == debt
+
+    strategy.manuallyRepayDebt(Wei("1000 ether"), {"from": gov})
+    # the vault can return a few wei less (share rounding)
+    assert (
+        Wei("1000 ether") - 10 <= debt - strategy.balanceOfDebt() <= Wei("1000 ether")
+    )
+    assert strategy.balanceOfWant() == Wei("1000 ether")
+
+
+def test_plan_burn_sell_burn(
+    chain, gov, strategy, snx_oracle, debt_cache, invested_module
+):
+    chain.sleep(86400 + 1)  # just over 24h
+    chain.mine()
+
+    # the debt grows over the sUSD in the vault and no want is unlocked
+    snx_oracle.updateBTCPrice(Wei("120000 ether"), {"from": gov})
+    snx_oracle.updateETHPrice(Wei("3500 ether"), {"from": gov})
+    debt_cache.takeDebtSnapshot({"from": debt_cache.owner()})
+
+    debt = strategy.balanceOfDebt()
+    in_vault = strategy.balanceOfSusdInVault()
+    plan = strategy.getDeleveragePlan(debt).dict()
+    assert plan["fromVault"] == in_vault
+    assert plan["burnBeforeSwap"] == in_vault
+    assert 0 < plan["wantToSell"] < Wei("1000 ether")
+    assert plan["susdToBuy"] == debt - in_vault
+    assert plan["burnAfterSwap"] == plan["susdToBuy"]
+
+    strategy.manuallyRepayDebt(debt, {"from": gov})
+    assert strategy.balanceOfDebt() == 0
+    assert strategy.balanceOfSusdInVault() == 0
+    assert Wei("1000 ether") - plan["wantToSell"] <= strategy.balanceOfWant()
@@ -0,0 +1,58 @@
+import brownie
+import pytest
+
+# one claim per weekly fee period, entries vest 52 weeks later
+CYCLES = 120
+VESTING_LAG = 52
+
+
+def run_cycles(storage, account):
+    gas = 0
+    for cycle in range(CYCLES):
+        gas += storage.claim(1_000 + cycle, {"from": account}).gas_used
+        if cycle >= VESTING_LAG:
+            gas += storage.vest(1, {"from": account}).gas_used
+    return gas
+
+
+@pytest.fixture
+def array_ids(gov, ArrayEntryIDs):
+    yield gov.deploy(ArrayEntryIDs)
+
+
+@pytest.fixture
+def packed_ids(gov, PackedEntryIDs):
+    yield gov.deploy(PackedEntryIDs)
+
+
+def test_packed_queue_read_api(gov, array_ids, packed_ids):
+    for storage in (array_ids, packed_ids):
+        for entry_id in range(1, 11):
+            storage.claim(entry_id, {"from": gov})
+        storage.vest(3, {"from": gov})
+
+    assert packed_ids.entryIDIndex() == array_ids.entryIDIndex() == 3
+    # entries that are still to vest read the same
+    for i in range(3, 10):
+        assert packed_ids.entryIDs(i) == array_ids.entryIDs(i)
+
+    # a fully vested slot is pruned
+    packed_ids.vest(2, {"from": gov})
+    assert packed_ids.entryIDs(0) == 0
+
+    with brownie.reverts():
+        packed_ids.entryIDs(10)
+    with brownie.reverts():
+        packed_ids.vest(6, {"from": gov})
+    with brownie.reverts():
+        packed_ids.claim(2 ** 64, {"from": gov})
+
+
+def test_packed_queue_gas(gov, array_ids, packed_ids):
+    array_gas = run_cycles(array_ids, gov)
+    packed_gas = run_cycles(packed_ids, gov)
+    print(
+        f"{CYCLES} claim/vest cycles: array {array_gas} gas, packed {packed_gas} gas "
+        f"({(packed_gas - array_gas) / array_gas:.1%})"
+    )
+    assert packed_gas < array_gas
@@ -0,0 +1,228 @@
+import os
+
+import pytest
+from brownie import Wei, chain, config
+from brownie.test import strategy
+from eth_abi import encode_single
+
+# Random sequences of the actions of the other tests. The test is split in shards so
+# that pytest-xdist spreads them over its workers, each with its own local chain:
+#
+#   FUZZ_SHARDS=32 FUZZ_EXAMPLES=100 brownie test tests/test_fuzz_strategy.py -n auto
+#
+# Hypothesis draws a new seed for every shard, so they explore different sequences.
+SHARDS = int(os.environ.get("FUZZ_SHARDS", 8))
+EXAMPLES = int(os.environ.get("FUZZ_EXAMPLES", 25))
+STEPS = int(os.environ.get("FUZZ_STEPS", 20))
+
+WEEK = 7 * 24 * 3600
+
+
+class StrategyStateMachine:
+
+    # prices stay in a range where the sUSD vault can always repay the debt (the debt
+    # pool grows at most 35% while SNX drops at most 65%), so that a revert is a bug
+    st_snx_price = strategy("uint256", min_value="12 ether", max_value="35 ether")
+    st_btc_price = strategy("uint256", min_value="25000 ether", max_value="75000 ether")
+    st_eth_price = strategy("uint256", min_value="1000 ether", max_value="3000 ether")
+    st_amount = strategy("uint256", min_value="1 ether", max_value="500 ether")
+    st_percent = strategy("uint256", min_value=1, max_value=100)
+    st_bob = strategy("bool")
+    st_days = strategy("uint256", min_value=1, max_value=30)
+
+    def __init__(
+        cls,
+        Vault,
+        strategy,
+        vault,
+        snx,
+        susd,
+        snx_oracle,
+        debt_cache,
+        fee_pool,
+        issuer,
+        snx_whale,
+        gov,
+        rewards,
+        guardian,
+        alice,
+        bob,
+    ):
+        cls.Vault = Vault
+        cls.strategy = strategy
+        cls.vault = vault
+        cls.snx = snx
+        cls.susd = susd
+        cls.snx_oracle = snx_oracle
+        cls.debt_cache = debt_cache
+        cls.fee_pool = fee_pool
+        cls.issuer = issuer
+        cls.snx_whale = snx_whale
+        cls.gov = gov
+        cls.rewards = rewards
+        cls.guardian = guardian
+        cls.users = (alice, bob)
+
+    def setup(self):
+        # state_machine reverts to the module state before every example
+        for user in self.users:
+            self.snx.transfer(user, Wei("1000 ether"), {"from": self.snx_whale})
+            self.snx.approve(self.vault, 2 ** 256 - 1, {"from": user})
+        self.prices = {
+            "snx": Wei("20 ether"),
+            "btc": Wei("50000 ether"),
+            "eth": Wei("2000 ether"),
+        }
+        self._update_rates()
+
+    def _update_rates(self):
+        # after moving time, or the rates and the debt snapshot go stale
+        self.snx_oracle.updateRates(
+            [encode_single("bytes32", key) for key in (b"SNX", b"sBTC", b"sETH")],
+            [self.prices["snx"], self.prices["btc"], self.prices["eth"]],
+            {"from": self.gov},
+        )
+        self.debt_cache.takeDebtSnapshot({"from": self.debt_cache.owner()})
+
+    def _sleep(self, seconds):
+        chain.sleep(seconds)
+        chain.mine(1)
+        self._update_rates()
+
+    def rule_deposit(self, st_bob, st_amount):
+        user = self.users[st_bob]
+        amount = min(st_amount, self.snx.balanceOf(user))
+        if amount > 0:
+            self.vault.deposit(amount, {"from": user})
+
+    def rule_withdraw(self, st_bob, st_percent):
+        user = self.users[st_bob]
+        shares = self.vault.balanceOf(user) * st_percent // 100
+        if shares == 0:
+            return
+
+        price_per_share = self.vault.pricePerShare()
+        balance = self.snx.balanceOf(user)
+        shares_before = self.vault.balanceOf(user)
+        total_loss = self.vault.strategies(self.strategy).dict()["totalLoss"]
+
+        self.vault.withdraw(shares, user, 10_000, {"from": user})
+
+        # during the minimum stake time the vault returns what is unlocked and only
+        # burns the shares of it, the rest is not lost
+        burnt = shares_before - self.vault.balanceOf(user)
+        value = burnt * price_per_share // 10 ** self.vault.decimals()
+        # no withdrawal loses more than the strategy reported to the vault
+        lost = value - (self.snx.balanceOf(user) - balance)
+        reported = self.vault.strategies(self.strategy).dict()["totalLoss"] - total_loss
+        assert lost <= reported
+
+    def rule_snx_price(self, st_snx_price):
+        self.prices["snx"] = st_snx_price
+        self._update_rates()
+
+    def rule_btc_price(self, st_btc_price):
+        self.prices["btc"] = st_btc_price
+        self._update_rates()
+
+    def rule_eth_price(self, st_eth_price):
+        self.prices["eth"] = st_eth_price
+        self._update_rates()
+
+    def rule_wait(self, st_days):
+        self._sleep(st_days * 24 * 3600)
+
+    def rule_harvest(self):
+        self.strategy.harvest({"from": self.gov})
+
+    def rule_tend(self):
+        can_burn = self.issuer.canBurnSynths(self.strategy)
+        invested = self.strategy.balanceOfWant() > 0
+
+        self.strategy.tend({"from": self.gov})
+
+        # tend repays down to the target ratio, unless the minimum stake time blocks
+        # burning (the strategy only acts outside of the repayRatioThreshold band)
+        if can_burn and invested:
+            assert (
+                self.strategy.getCurrentRatio()
+                <= self.strategy.getTargetRatio() + self.strategy.repayRatioThreshold()
+            )
+
+    def rule_close_fee_period(self):
+        self._sleep(self.fee_pool.feePeriodDuration())
+        self.fee_pool.closeCurrentFeePeriod({"from": self.gov})
+
+    def rule_vest(self):
+        # every escrow entry matures, the next harvest vests up to maxEntriesToVest
+        self._sleep(52 * WEEK)
+        vestable = self.strategy.vestableRewards()[0]
+
+        self.strategy.harvest({"from": self.gov})
+
+        vested = min(vestable, self.strategy.maxEntriesToVest())
+        assert self.strategy.vestableRewards()[0] == vestable - vested
+
+    def rule_manually_repay_debt(self, st_percent):
+        debt = self.strategy.balanceOfDebt()
+        self.strategy.manuallyRepayDebt(debt * st_percent // 100, {"from": self.gov})
+        assert self.strategy.balanceOfDebt() <= debt
+
+    def rule_migrate_susd_vault(self):
+        if self.strategy.balanceOfSusdInVault() == 0:
+            # the vault reverts when withdrawing or depositing nothing
+            return
+        new_vault = self.guardian.deploy(self.Vault)
+        new_vault.initialize(self.susd, self.gov, self.rewards, "", "", self.guardian)
+        new_vault.setDepositLimit(2 ** 256 - 1, {"from": self.gov})
+        previous_balance = self.strategy.balanceOfSusdInVault()
+
+        self.strategy.migrateSusdVault(new_vault, 10_000, {"from": self.gov})
+
+        assert self.strategy.susdVault() == new_vault
+        assert new_vault.totalAssets() == previous_balance
+
+    def invariant_entry_queue(self):
+        assert self.strategy.entryIDIndex() <= self.strategy.entryIDsLength()
+
+
+@pytest.mark.parametrize("shard", range(SHARDS))
+def test_strategy_state_machine(
+    shard,
+    state_machine,
+    pm,
+    strategy,
+    vault,
+    snx,
+    susd,
+    snx_oracle,
+    debt_cache,
+    fee_pool,
+    issuer,
+    snx_whale,
+    gov,
+    rewards,
+    guardian,
+    alice,
+    bob,
+    stale_period,
+):
+    state_machine(
+        StrategyStateMachine,
+        pm(config["dependencies"][0]).Vault,
+        strategy,
+        vault,
+        snx,
+        susd,
+        snx_oracle,
+        debt_cache,
+        fee_pool,
+        issuer,
+        snx_whale,
+        gov,
+        rewards,
+        guardian,
+        alice,
+        bob,
+        settings={"max_examples": EXAMPLES, "stateful_step_count": STEPS},
+    )
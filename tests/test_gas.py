@@ -0,0 +1,330 @@
+import json
+from pathlib import Path
+
+import pytest
+from brownie import ZERO_ADDRESS, Wei, config, network
+
+# Gas of every Strategy entry point, per scenario and per branch of the strategy logic.
+# Every transaction is checked against the baseline of the active network in the
+# `reports.gas_baseline` folder of brownie-config.yml and fails when it costs more than
+# `reports.gas_tolerance` percent over it. A step missing from the baseline fails too.
+# The tests are skipped on a network that has no baseline yet. Record one (nothing is
+# checked then) with
+#
+#   brownie test tests/test_gas.py --update-gas-baseline
+
+
+class GasReport:
+    def __init__(self, path, tolerance, update):
+        self.path = path
+        self.baseline = json.loads(path.read_text()) if path.exists() else {}
+        self.tolerance = tolerance
+        self.update = update
+        self.measured = {}
+
+    def record(self, scenario, step, tx):
+        gas_used = tx.gas_used
+        self.measured.setdefault(scenario, {})[step] = gas_used
+        if self.update:
+            return tx
+
+        if not self.path.exists():
+            pytest.skip(
+                f"no gas baseline for {network.show_active()} in {self.path}, "
+                "record it with --update-gas-baseline"
+            )
+        expected = self.baseline.get(scenario, {}).get(step)
+        if expected is None:
+            pytest.fail(
+                f"{scenario}/{step} has no gas baseline in {self.path}, "
+                "record it with --update-gas-baseline"
+            )
+        limit = expected * (100 + self.tolerance) // 100
+        assert gas_used <= limit, (
+            f"{scenario}/{step} used {gas_used} gas, "
+            f"{(gas_used - expected) / expected:.1%} over the baseline of {expected}"
+        )
+        return tx
+
+
+def susd_vault_calls(tx, susd_vault):
+    # (deposits, withdrawals) of the sUSD vault in tx, as the shares they mint and burn
+    transfers = tx.events["Transfer"] if "Transfer" in tx.events else []
+    shares = [t for t in transfers if t.address == susd_vault.address]
+    return (
+        sum(t["sender"] == ZERO_ADDRESS for t in shares),
+        sum(t["receiver"] == ZERO_ADDRESS for t in shares),
+    )
+
+
+@pytest.fixture(scope="module")
+def gas_report(request):
+    path = Path(config["reports"]["gas_baseline"]) / f"{network.show_active()}.json"
+    update = request.config.getoption("update_gas_baseline")
+    report = GasReport(path, config["reports"]["gas_tolerance"], update)
+
+    yield report
+
+    if update:
+        # merge, so that running a single test only updates its own scenario
+        baseline = dict(report.baseline, **report.measured)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+
+
+def test_gas_happy_path(
+    chain,
+    gov,
+    vault,
+    strategy,
+    susd,
+    susd_vault,
+    susd_whale,
+    bob,
+    snx_oracle,
+    stale_period,
+    deposit,
+    gas_report,
+):
+    snx_oracle.updateSnxPrice(Wei("20 ether"), {"from": gov})
+    tx = strategy.harvest({"from": gov})
+    gas_report.record("happy_path", "harvest_issue", tx)
+
+    chain.sleep(86400 + 1)
+    chain.mine(1)
+    susd.transfer(susd_vault, Wei("1000 ether"), {"from": susd_whale})
+    tx = strategy.harvest({"from": gov})
+    gas_report.record("happy_path", "harvest_profit", tx)
+
+    chain.sleep(86400 + 1)
+    chain.mine(1)
+    tx = vault.withdraw({"from": bob})
+    gas_report.record("happy_path", "withdraw_repay_from_vault", tx)
+    assert strategy.balanceOfDebt() == 0
+
+
+def test_gas_tend(chain, gov, strategy, snx_oracle, gas_report, invested):
+    chain.sleep(86400 + 1)
+    chain.mine(1)
+
+    # within the healthy range, nothing to do
+    snx_oracle.updateSnxPrice(Wei("18 ether"), {"from": gov})
+    tx = strategy.tend({"from": gov})
+    gas_report.record("tend", "tend_idle", tx)
+
+    snx_oracle.updateSnxPrice(Wei("15 ether"), {"from": gov})
+    tx = strategy.tend({"from": gov})
+    gas_report.record("tend", "tend_repay_from_vault", tx)
+    assert strategy.getCurrentRatio() == strategy.getTargetRatio()
+
+    previous_debt = strategy.balanceOfDebt()
+    snx_oracle.updateSnxPrice(Wei("25 ether"), {"from": gov})
+    tx = strategy.tend({"from": gov})
+    gas_report.record("tend", "tend_issue", tx)
+    assert strategy.balanceOfDebt() > previous_debt
+
+
+def test_gas_debt_increases(
+    snx, chain, gov, vault, strategy, bob, snx_oracle, debt_cache, gas_report, invested
+):
+    chain.sleep(86400 + 1)
+    chain.mine(1)
+
+    snx_oracle.updateBTCPrice(Wei("120000 ether"), {"from": gov})
+    snx_oracle.updateETHPrice(Wei("3500 ether"), {"from": gov})
+    debt_cache.takeDebtSnapshot({"from": debt_cache.owner()})
+
+    previous_snx = snx.balanceOf(strategy)
+    tx = strategy.harvest({"from": gov})
+    gas_report.record("debt_increases", "harvest_repay_without_selling", tx)
+    assert snx.balanceOf(strategy) == previous_snx
+
+    chain.sleep(86400 + 1)
+    chain.mine(1)
+
+    # the debt is over the sUSD in the vault: burn, sell SNX for sUSD and burn again
+    tx = vault.withdraw(vault.balanceOf(bob), bob, 10_000, {"from": bob})
+    gas_report.record("debt_increases", "withdraw_burn_sell_burn", tx)
+    assert snx.balanceOf(bob) < Wei("1000 ether")
+
+
+def test_gas_debt_decreases(
+    chain,
+    gov,
+    vault,
+    strategy,
+    susd_vault,
+    bob,
+    snx_oracle,
+    debt_cache,
+    gas_report,
+    invested,
+):
+    chain.sleep(86400 + 1)
+    chain.mine(1)
+
+    snx_oracle.updateBTCPrice(Wei("30000 ether"), {"from": gov})
+    snx_oracle.updateETHPrice(Wei("1500 ether"), {"from": gov})
+    debt_cache.takeDebtSnapshot({"from": debt_cache.owner()})
+
+    # the new debt pays for the sale of the vault profit: it was a withdrawal and a deposit
+    tx = strategy.harvest({"from": gov})
+    gas_report.record("debt_decreases", "harvest_profit_issue", tx)
+    assert susd_vault_calls(tx, susd_vault) == (0, 0)
+
+    chain.sleep(86400 + 1)
+    chain.mine(1)
+    tx = vault.withdraw({"from": bob})
+    gas_report.record("debt_decreases", "withdraw_repay_from_vault", tx)
+
+
+def test_gas_snx_rewards(
+    chain,
+    gov,
+    vault,
+    strategy,
+    susd_vault,
+    bob,
+    snx_oracle,
+    fee_pool,
+    gas_report,
+    invested,
+):
+    chain.sleep(fee_pool.feePeriodDuration())
+    chain.mine(1)
+    fee_pool.closeCurrentFeePeriod({"from": gov})
+
+    tx = strategy.harvest({"from": gov})
+    gas_report.record("snx_rewards", "harvest_claim_fees", tx)
+    assert strategy.balanceOfEscrowedWant() > 0
+    # the rewards are collateral, only the debt issued on them is deposited
+    assert susd_vault_calls(tx, susd_vault) == (1, 0)
+
+    # the escrow entry matures
+    chain.sleep(3600 * 24 * 7 * 52)
+    chain.mine(1)
+    snx_oracle.updateSnxPrice(Wei("20 ether"), {"from": gov})
+    tx = strategy.harvest({"from": gov})
+    gas_report.record("snx_rewards", "harvest_vest", tx)
+    assert strategy.balanceOfEscrowedWant() == 0
+
+    chain.sleep(86400 + 1)
+    chain.mine(1)
+    tx = vault.withdraw({"from": bob})
+    gas_report.record("snx_rewards", "withdraw_repay_from_vault", tx)
+
+
+def test_gas_burn_to_target(
+    chain,
+    gov,
+    strategy,
+    susd,
+    susd_vault,
+    susd_whale,
+    snx_oracle,
+    fee_pool,
+    gas_report,
+    invested,
+):
+    chain.sleep(fee_pool.feePeriodDuration())
+    chain.mine(1)
+    fee_pool.closeCurrentFeePeriod({"from": gov})
+
+    # 200 sUSD over the issuance ratio to burn before claiming, and sUSD vault profit
+    snx_oracle.updateSnxPrice(Wei("19 ether"), {"from": gov})
+    susd.transfer(susd_vault, Wei("1000 ether"), {"from": susd_whale})
+    flows = strategy.getSusdFlows().dict()
+    assert flows["burnToTarget"] == Wei("200 ether")
+    assert flows["vaultProfit"] > 0
+    assert flows["fromVault"] == flows["burnToTarget"] + flows["vaultProfit"]
+
+    # both come out of the vault at once: it was a withdrawal for each
+    tx = strategy.harvest({"from": gov})
+    gas_report.record("snx_rewards", "harvest_burn_to_target_profit", tx)
+    assert susd_vault_calls(tx, susd_vault)[1] == 1
+
+
+def test_gas_liquidations(
+    chain,
+    gov,
+    vault,
+    strategy,
+    susd_whale,
+    snx_whale,
+    bob,
+    snx_oracle,
+    synthetix,
+    liquidations,
+    gas_report,
+    invested,
+):
+    chain.sleep(86400 + 1)
+    chain.mine(1)
+
+    snx_oracle.updateSnxPrice(Wei("7 ether"), {"from": gov})
+    liquidations.flagAccountForLiquidation(strategy, {"from": snx_whale})
+    chain.sleep(3600 * 24 * 3 + 1)
+    chain.mine(1)
+    amount_needed = liquidations.calculateAmountToFixCollateral(
+        strategy.balanceOfDebt(), strategy.balanceOfWant() * 7
+    )
+    synthetix.liquidateDelinquentAccount(strategy, amount_needed, {"from": susd_whale})
+
+    tx = vault.withdraw(vault.balanceOf(bob), bob, 10_000, {"from": bob})
+    gas_report.record("liquidations", "withdraw_after_liquidation", tx)
+
+
+def test_gas_emergency_exit(chain, gov, strategy, gas_report, invested):
+    chain.sleep(86400 + 1)
+    chain.mine(1)
+
+    strategy.setEmergencyExit({"from": gov})
+    tx = strategy.harvest({"from": gov})
+    gas_report.record("emergency_exit", "harvest_exit", tx)
+    assert strategy.estimatedTotalAssets() == 0
+
+
+def test_gas_manually_repay_debt(chain, gov, strategy, gas_report, invested):
+    chain.sleep(86400 + 1)
+    chain.mine(1)
+
+    tx = strategy.manuallyRepayDebt(strategy.balanceOfDebt() // 2, {"from": gov})
+    gas_report.record("manual", "manually_repay_debt", tx)
+
+
+def test_gas_migrate_susd_vault(
+    chain, pm, gov, rewards, guardian, strategy, susd, gas_report, invested
+):
+    chain.sleep(86400 + 1)
+    chain.mine(1)
+
+    new_vault = guardian.deploy(pm(config["dependencies"][0]).Vault)
+    new_vault.initialize(susd, gov, rewards, "", "", guardian)
+    new_vault.setDepositLimit(2 ** 256 - 1, {"from": gov})
+
+    tx = strategy.migrateSusdVault(new_vault, 10_000, {"from": gov})
+    gas_report.record("migration", "migrate_susd_vault", tx)
+
+
+def test_gas_migration(
+    chain,
+    Strategy,
+    strategist,
+    gov,
+    vault,
+    strategy,
+    susd_vault,
+    read_proxy,
+    uniswap,
+    sushiswap,
+    gas_report,
+    invested,
+):
+    chain.sleep(86400 + 1)
+    chain.mine(1)
+
+    new_strategy = strategist.deploy(
+        Strategy, vault, susd_vault, read_proxy, uniswap, sushiswap
+    )
+    tx = strategy.migrate(new_strategy, {"from": gov})
+    gas_report.record("migration", "migrate", tx)
@@ -0,0 +1,39 @@
+from brownie import Wei
+
+
+def test_harvest_trigger_nothing_to_collect(chain, strategy, invested_module):
+    assert strategy.harvestableProfit() == 0
+    assert not strategy.harvestTrigger(0)
+
+    # still nothing to collect, but the vault needs a report once in a while
+    chain.sleep(strategy.maxReportDelay())
+    chain.mine(1)
+    assert strategy.harvestTrigger(0)
+
+
+def test_harvest_trigger_susd_vault_profit(
+    strategy, susd, susd_vault, susd_whale, invested_module
+):
+    susd.transfer(susd_vault, Wei("100 ether"), {"from": susd_whale})
+
+    # 100 sUSD at 20 sUSD per SNX
+    profit = strategy.harvestableProfit()
+    assert Wei("4.9 ether") < profit <= Wei("5 ether")
+    assert strategy.harvestTrigger(profit // strategy.profitFactor() - 1)
+    assert not strategy.harvestTrigger(profit // strategy.profitFactor() + 1)
+
+
+def test_harvest_trigger_fees(
+    chain, gov, strategy, snx_oracle, fee_pool, invested_module
+):
+    chain.sleep(fee_pool.feePeriodDuration())
+    chain.mine(1)
+    fee_pool.closeCurrentFeePeriod({"from": gov})
+    fees, rewards = fee_pool.feesAvailable(strategy)
+    assert rewards > 0
+    assert strategy.harvestableProfit() >= rewards
+
+    # burning the debt over the issuance ratio takes more than 50% of the sUSD,
+    # the harvest would not claim anything
+    snx_oracle.updateSnxPrice(Wei("9 ether"), {"from": gov})
+    assert strategy.harvestableProfit() == 0
@@ -0,0 +1,38 @@
+from brownie import Strategy, Wei, chain, web3
+
+from scripts.indexer import EventDecoder, Indexer, Store
+
+
+def test_indexer(gov, vault, strategy, snx_oracle, stale_period, deposit):
+    start = web3.eth.blockNumber
+    for price in ("20 ether", "22 ether", "18 ether"):
+        snx_oracle.updateSnxPrice(Wei(price), {"from": gov})
+        strategy.harvest({"from": gov})
+        chain.sleep(86400 + 1)
+        chain.mine()
+
+    decoder = EventDecoder([Strategy.abi, vault.abi])
+    store = Store(":memory:", decoder, [strategy.address])
+    indexer = Indexer(
+        web3, store, [strategy.address, vault.address], from_block=start, max_range=2
+    )
+    assert indexer.catch_up() == web3.eth.blockNumber
+    assert store.cursor()[0] == web3.eth.blockNumber
+
+    def count(table):
+        query = f'SELECT COUNT(*) FROM "{table}" WHERE strategy = ?'
+        return store.db.execute(query, (strategy.address,)).fetchone()[0]
+
+    assert count("Harvested") == 3
+    assert count("StrategyReported") == 3
+    assert count("PositionUpdated") == 6  # prepareReturn and adjustPosition
+
+    (debt,) = store.db.execute(
+        'SELECT debt FROM "PositionUpdated" ORDER BY block_number DESC, log_index DESC'
+    ).fetchone()
+    assert int(debt) == strategy.balanceOfDebt()
+
+    # a reorg rewinds the last blocks and indexes them again
+    store.rewind(store.cursor()[0], "0x00")
+    indexer.catch_up()
+    assert count("PositionUpdated") == 6
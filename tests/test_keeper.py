@@ -0,0 +1,44 @@
+import asyncio
+
+import aiohttp
+from brownie import Wei, web3
+from eth_abi import encode_single
+
+from scripts.keeper import Keeper, RpcClient, StrategyConfig
+
+
+async def run_cycles(strategy, keeper, blocks):
+    async with aiohttp.ClientSession() as session:
+        rpc = RpcClient(session, web3.provider.endpoint_uri)
+        daemon = Keeper(rpc, [StrategyConfig(strategy.address)], keeper.address)
+        await daemon._sync_nonce()
+        for _ in range(blocks):
+            await daemon.cycle(web3.eth.blockNumber)
+            await asyncio.gather(*daemon.receipts)
+        return daemon, rpc
+
+
+def test_keeper_harvests(gov, strategy, keeper, snx_oracle, deposit):
+    snx_oracle.updateSnxPrice(Wei("20 ether"), {"from": gov})
+    assert strategy.harvestTrigger(0)
+
+    daemon, rpc = asyncio.run(run_cycles(strategy, keeper, 2))
+
+    # the credit was taken in the first cycle and there was nothing to do in the second
+    assert strategy.balanceOfWant() == Wei("1000 ether")
+    assert not strategy.harvestTrigger(0)
+    assert not daemon.queue and not daemon.in_flight
+    # both triggers of every strategy are read in one request per block
+    assert rpc.calls > rpc.requests
+
+
+def test_keeper_rebuilds_cache(accounts, strategy, keeper, resolver, susd, deposit):
+    # a Synthetix contract upgraded behind the same resolver
+    owner = accounts.at(resolver.owner(), force=True)
+    name = encode_single("bytes32", b"FeePool")
+    resolver.importAddresses([name], [susd], {"from": owner})
+    assert not strategy.isResolverCached()
+
+    asyncio.run(run_cycles(strategy, keeper, 1))
+
+    assert strategy.isResolverCached()
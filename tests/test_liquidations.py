@@ -1,6 +1,5 @@
 import brownie
-from brownie import Wei, Contract
-from eth_abi import encode_single
+from brownie import Wei
 
 
 def test_liquidations_snx_price_change(
@@ -9,31 +8,14 @@ def test_liquidations_snx_price_change(
     gov,
     vault,
     strategy,
-    susd,
-    susd_vault,
     susd_whale,
     snx_whale,
     bob,
     snx_oracle,
+    synthetix,
+    liquidations,
+    invested_module,
 ):
-    chain.snapshot()
-    # Move stale period to 6 days
-    resolver = Contract(strategy.resolver())
-    settings = Contract(
-        resolver.getAddress(encode_single("bytes32", b"SystemSettings"))
-    )
-    settings.setRateStalePeriod(24 * 3600 * 16, {"from": settings.owner()})
-    settings.setDebtSnapshotStaleTime(24 * 3600 * 16, {"from": settings.owner()})
-
-    snx.transfer(bob, Wei("1000 ether"), {"from": snx_whale})
-    snx.approve(vault, 2 ** 256 - 1, {"from": bob})
-    # bob deposits and the price collapses
-    vault.deposit({"from": bob})
-
-    # Invest with an SNX price of 20
-    snx_oracle.updateSnxPrice(Wei("20 ether"), {"from": gov})
-    strategy.harvest({"from": gov})
-
     chain.sleep(86400 + 1)  # just over 24h
     chain.mine()
 
@@ -45,10 +27,6 @@ def test_liquidations_snx_price_change(
     snx_oracle.updateSnxPrice(Wei("7 ether"), {"from": gov})
 
     # the strategy can now be liquidated
-    synthetix = Contract(resolver.getAddress(encode_single("bytes32", b"Synthetix")))
-    liquidations = Contract(
-        resolver.getAddress(encode_single("bytes32", b"Liquidations"))
-    )
     # flag account for liquidation, then wait three days to allow the account to repay
     liquidations.flagAccountForLiquidation(strategy, {"from": snx_whale})
     chain.sleep(3600 * 24 * 3 + 1)  # a bit over 3 days (see Synthetix docs)
@@ -74,7 +52,6 @@ def test_liquidations_snx_price_change(
         < Wei("1000 ether") - snx.balanceOf(bob)
         < amount_needed * 11 / 70 * 1.001
     )  # the losses where correctly calculated
-    chain.revert()
 
 
 def test_liquidations_debt_changes(
@@ -83,63 +60,34 @@ def test_liquidations_debt_changes(
     gov,
     vault,
     strategy,
-    susd,
-    susd_vault,
     susd_whale,
     snx_whale,
     bob,
     snx_oracle,
+    debt_cache,
+    synthetix,
+    liquidations,
+    invested_module,
 ):
-    chain.snapshot()
-    # Move stale period to 16 days
-    resolver = Contract(strategy.resolver())
-    settings = Contract(
-        resolver.getAddress(encode_single("bytes32", b"SystemSettings"))
-    )
-    settings.setRateStalePeriod(24 * 3600 * 16, {"from": settings.owner()})
-    settings.setDebtSnapshotStaleTime(24 * 3600 * 16, {"from": settings.owner()})
-
-    snx.transfer(bob, Wei("1000 ether"), {"from": snx_whale})
-    snx.approve(vault, 2 ** 256 - 1, {"from": bob})
-    # bob deposits back and the debt pool skyrockets
-    vault.deposit({"from": bob})
-
-    # Invest with an SNX price of 20
-    snx_oracle.updateSnxPrice(Wei("20 ether"), {"from": gov})
-    strategy.harvest({"from": gov})
-
     chain.sleep(86400 + 1)  # just over 24h
     chain.mine()
 
     assert strategy.balanceOfWant() == Wei("1000 ether")
     assert strategy.balanceOfSusd() == 0
     assert strategy.balanceOfSusdInVault() == Wei("4000 ether")
-    # debt pool value increases (main assets are ETH and WBTC so increasing its price increases debt pool value)
-    debtCache = Contract(resolver.getAddress(encode_single("bytes32", b"DebtCache")))
 
-    # done to cache from infura
-    try:
-        print("Taking Debt Snapshot, this will take a while...")
-        debtCache.takeDebtSnapshot({"from": debtCache.owner()})
-    except:
-        print(
-            "Failed. This is expected due to timeout but it is useful to cache, next call will go through"
-        )
+    # debt pool value increases (main assets are ETH and WBTC so increasing its price increases debt pool value)
 
     # debt pool goes up to the sky
     previous_debt = strategy.balanceOfDebt()
 
     snx_oracle.updateBTCPrice(Wei("250000 ether"), {"from": gov})
     snx_oracle.updateETHPrice(Wei("10000 ether"), {"from": gov})
-    debtCache.takeDebtSnapshot({"from": debtCache.owner()})
+    debt_cache.takeDebtSnapshot({"from": debt_cache.owner()})
     print("debt", strategy.balanceOfDebt())
     # check that our debt has increased when debt pool value has increased
     assert strategy.balanceOfDebt() > previous_debt
     # the strategy can now be liquidated
-    synthetix = Contract(resolver.getAddress(encode_single("bytes32", b"Synthetix")))
-    liquidations = Contract(
-        resolver.getAddress(encode_single("bytes32", b"Liquidations"))
-    )
     # flag account for liquidation, then wait three days to allow the account to repay
     liquidations.flagAccountForLiquidation(strategy, {"from": snx_whale})
     chain.sleep(3600 * 24 * 3 + 1)  # a bit over 3 days (see Synthetix docs)
@@ -165,5 +113,3 @@ def test_liquidations_debt_changes(
         < Wei("1000 ether") - snx.balanceOf(bob)
         < amount_needed * 11 / 200 * 1.001
     )  # the losses where correctly calculated
-
-    chain.revert()
@@ -1,6 +1,5 @@
 import brownie
-from brownie import Wei, Contract, config
-from eth_abi import encode_single
+from brownie import Wei, config
 
 
 def test_migrate_investment_vault(
@@ -10,33 +9,13 @@ def test_migrate_investment_vault(
     vault,
     strategy,
     susd,
-    susd_vault,
-    susd_whale,
-    snx_whale,
     bob,
-    snx_oracle,
     guardian,
     pm,
     rewards,
     management,
+    invested,
 ):
-    chain.snapshot()
-    # Move stale period to 16 days
-    resolver = Contract(strategy.resolver())
-    settings = Contract(
-        resolver.getAddress(encode_single("bytes32", b"SystemSettings"))
-    )
-    settings.setRateStalePeriod(24 * 3600 * 16, {"from": settings.owner()})
-    settings.setDebtSnapshotStaleTime(24 * 3600 * 16, {"from": settings.owner()})
-
-    snx.transfer(bob, Wei("1000 ether"), {"from": snx_whale})
-    snx.approve(vault, 2 ** 256 - 1, {"from": bob})
-    vault.deposit({"from": bob})
-
-    # Invest with an SNX price of 20
-    snx_oracle.updateSnxPrice(Wei("20 ether"), {"from": gov})
-    strategy.harvest({"from": gov})
-
     chain.sleep(86400 + 1)  # just over 24h
     chain.mine()
 
@@ -64,4 +43,3 @@ def test_migrate_investment_vault(
     assert snx.balanceOf(vault) == 0
     assert vault.balanceOf(bob) == 0
     assert snx.balanceOf(bob) == Wei("1000 ether")
-    chain.revert()
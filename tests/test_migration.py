@@ -1,19 +1,22 @@
-from brownie import Contract
-from eth_abi import encode_single
+import brownie
+from brownie import Wei
 
 
 def test_migration(
-    token, vault, strategy, amount, Strategy, strategist, gov, susd_vault, chain
+    token,
+    vault,
+    strategy,
+    amount,
+    Strategy,
+    strategist,
+    gov,
+    susd_vault,
+    chain,
+    read_proxy,
+    uniswap,
+    sushiswap,
+    stale_period,
 ):
-    chain.snapshot()
-    # Move stale period to 6 days
-    resolver = Contract(strategy.resolver())
-    settings = Contract(
-        resolver.getAddress(encode_single("bytes32", b"SystemSettings"))
-    )
-    settings.setRateStalePeriod(24 * 3600 * 6, {"from": settings.owner()})
-    settings.setDebtSnapshotStaleTime(24 * 3600 * 6, {"from": settings.owner()})
-
     # Deposit to the vault and harvest
     token.approve(vault, amount, {"from": gov})
     vault.deposit(amount, {"from": gov})
@@ -25,7 +28,96 @@ def test_migration(
     chain.mine(1)
 
     # migrate to a new strategy
-    new_strategy = strategist.deploy(Strategy, vault, susd_vault)
+    new_strategy = strategist.deploy(
+        Strategy, vault, susd_vault, read_proxy, uniswap, sushiswap
+    )
     strategy.migrate(new_strategy, {"from": gov})
     assert token.balanceOf(new_strategy) == amount
-    chain.revert()
+
+
+def _claim_rewards(chain, gov, strategy, fee_pool, periods):
+    for i in range(periods):
+        chain.sleep(fee_pool.feePeriodDuration())
+        chain.mine(1)
+        fee_pool.closeCurrentFeePeriod({"from": gov})
+        strategy.harvest({"from": gov})
+
+
+def test_migration_merges_escrow(
+    chain,
+    Strategy,
+    strategist,
+    gov,
+    vault,
+    strategy,
+    susd_vault,
+    read_proxy,
+    uniswap,
+    sushiswap,
+    snx_oracle,
+    fee_pool,
+    reward_escrow,
+    invested,
+):
+    _claim_rewards(chain, gov, strategy, fee_pool, 3)
+    entries = [strategy.entryIDs(i) for i in range(3)]
+    escrowed = strategy.balanceOfEscrowedWant()
+    chain.sleep(86400 + 1)
+    chain.mine(1)
+
+    reward_escrow.startMergingWindow({"from": reward_escrow.owner()})
+    new_strategy = strategist.deploy(
+        Strategy, vault, susd_vault, read_proxy, uniswap, sushiswap
+    )
+    tx = vault.migrateStrategy(strategy, new_strategy, {"from": gov})
+    assert tx.events["EscrowMergeNominated"]["entries"] == 3
+    assert strategy.balanceOfDebt() == 0
+
+    # in batches, starting at the entryIDIndex of the old strategy
+    new_strategy.mergeEscrowEntries(strategy, 2, {"from": gov})
+    assert new_strategy.escrowMergeIndex() == 2
+    new_strategy.mergeEscrowEntries(strategy, 2, {"from": gov})
+    assert new_strategy.escrowMergeIndex() == 3
+    assert [new_strategy.entryIDs(i) for i in range(3)] == entries
+    assert new_strategy.balanceOfEscrowedWant() == escrowed
+    assert strategy.balanceOfEscrowedWant() == 0
+
+    # the entries vest through the new strategy
+    chain.sleep(3600 * 24 * 7 * 52)
+    chain.mine(1)
+    snx_oracle.updateSnxPrice(Wei("20 ether"), {"from": gov})
+    new_strategy.harvest({"from": gov})
+    assert new_strategy.entryIDIndex() == 3
+    assert new_strategy.balanceOfEscrowedWant() == 0
+
+
+def test_migration_without_merging_window(
+    chain,
+    Strategy,
+    strategist,
+    gov,
+    vault,
+    strategy,
+    susd_vault,
+    read_proxy,
+    uniswap,
+    sushiswap,
+    fee_pool,
+    reward_escrow,
+    invested,
+):
+    _claim_rewards(chain, gov, strategy, fee_pool, 1)
+    escrowed = strategy.balanceOfEscrowedWant()
+    chain.sleep(86400 + 1)
+    chain.mine(1)
+    assert not reward_escrow.accountMergingIsOpen()
+
+    new_strategy = strategist.deploy(
+        Strategy, vault, susd_vault, read_proxy, uniswap, sushiswap
+    )
+    tx = vault.migrateStrategy(strategy, new_strategy, {"from": gov})
+    assert "EscrowMergeNominated" not in tx.events
+    # the entries stay with the old strategy, which keeps the debt they back
+    assert strategy.balanceOfEscrowedWant() == escrowed
+    with brownie.reverts():
+        new_strategy.mergeEscrowEntries(strategy, 1, {"from": gov})
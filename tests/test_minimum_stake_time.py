@@ -0,0 +1,44 @@
+from brownie import Wei
+
+
+def test_repay_is_deferred(
+    chain, gov, snx, strategy, issuer, snx_oracle, invested_module
+):
+    burnable_at = strategy.nextBurnableTimestamp()
+    assert burnable_at == issuer.lastIssueEvent(strategy) + issuer.minimumStakeTime()
+    assert burnable_at > chain.time()
+
+    # over the target ratio, but nothing can be burnt yet
+    snx_oracle.updateSnxPrice(Wei("15 ether"), {"from": gov})
+    assert not strategy.tendTrigger(0)
+
+    previous_debt = strategy.balanceOfDebt()
+    tx = strategy.tend({"from": gov})
+    assert tx.events["RepayDeferred"]["burnableAt"] == burnable_at
+    assert strategy.balanceOfDebt() == previous_debt
+    assert snx.balanceOf(strategy) == Wei("1000 ether")
+
+    chain.sleep(burnable_at - chain.time())
+    chain.mine()
+    assert strategy.tendTrigger(0)
+    strategy.tend({"from": gov})
+    assert strategy.getCurrentRatio() == strategy.getTargetRatio()
+
+
+def test_withdraw_during_minimum_stake_time(
+    chain, gov, snx, vault, strategy, bob, snx_oracle, invested_module
+):
+    # 160 SNX of debt lock 800 SNX at the issuance ratio
+    snx_oracle.updateSnxPrice(Wei("25 ether"), {"from": gov})
+    shares = vault.balanceOf(bob)
+
+    vault.withdraw(shares, bob, 10_000, {"from": bob})
+    # bob gets the unlocked SNX and keeps the shares of the rest, nothing is lost
+    assert snx.balanceOf(bob) == Wei("200 ether")
+    assert vault.strategies(strategy).dict()["totalLoss"] == 0
+    assert vault.balanceOf(bob) == shares * 4 // 5
+
+    chain.sleep(strategy.nextBurnableTimestamp() - chain.time())
+    chain.mine()
+    vault.withdraw({"from": bob})
+    assert snx.balanceOf(bob) >= Wei("999 ether")
@@ -0,0 +1,67 @@
+from brownie import Wei
+
+from scripts.position_log import (
+    ADJUST_POSITION,
+    LAYOUT,
+    PREPARE_RETURN,
+    decode,
+    position_updates,
+)
+
+
+def test_decode():
+    values = iter(range(1, 14))
+    packed = []
+    for layout in LAYOUT:
+        word, shift = 0, 256
+        for _, bits in layout:
+            shift -= bits
+            word |= next(values) << shift
+        packed.append(word)
+    assert list(decode(packed).dict().values()) == list(range(1, 14))
+
+
+def test_harvest_logs_position(
+    gov, strategy, snx_oracle, fee_pool, chain, stale_period, deposit
+):
+    snx_oracle.updateSnxPrice(Wei("20 ether"), {"from": gov})
+    tx = strategy.harvest({"from": gov})
+
+    returned, adjusted = position_updates(tx)
+    assert returned.phase == PREPARE_RETURN
+    assert adjusted.phase == ADJUST_POSITION
+    assert returned.debt == 0
+
+    # the log has everything the views return after the harvest
+    position = strategy.getPositionSnapshot().dict()
+    assert adjusted.debt == position["debt"] == strategy.balanceOfDebt()
+    assert adjusted.collateral == position["collateral"]
+    assert adjusted.current_ratio == position["currentRatio"]
+    assert adjusted.issuance_ratio == position["issuanceRatio"]
+    assert adjusted.target_ratio == position["targetRatio"]
+    assert adjusted.snx_rate == Wei("20 ether")
+    assert adjusted.unlocked_want == position["unlockedWant"]
+    assert adjusted.escrowed_want == position["balanceOfEscrowedWant"]
+    assert adjusted.susd_in_vault == position["balanceOfSusdInVault"]
+
+    # claims are logged by prepareReturn
+    chain.sleep(fee_pool.feePeriodDuration())
+    chain.mine(1)
+    fee_pool.closeCurrentFeePeriod({"from": gov})
+    fees, rewards = fee_pool.feesAvailable(strategy)
+    tx = strategy.harvest({"from": gov})
+    returned, adjusted = position_updates(tx)
+    assert returned.fees_claimed == fees
+    assert returned.rewards_claimed == rewards > 0
+    assert returned.escrowed_want == rewards
+    assert adjusted.fees_claimed == adjusted.rewards_claimed == 0
+
+
+def test_tend_logs_position(gov, strategy, snx_oracle, invested):
+    snx_oracle.updateSnxPrice(Wei("15 ether"), {"from": gov})
+    tx = strategy.tend({"from": gov})
+
+    (adjusted,) = position_updates(tx)
+    assert adjusted.phase == ADJUST_POSITION
+    assert adjusted.debt == strategy.balanceOfDebt()
+    assert adjusted.snx_rate == Wei("15 ether")
@@ -0,0 +1,17 @@
+from brownie import Wei
+
+
+def test_position_snapshot(strategy, invested):
+    position = strategy.getPositionSnapshot().dict()
+    assert position["debt"] == strategy.balanceOfDebt()
+    assert position["issuanceRatio"] == strategy.getIssuanceRatio()
+    assert position["targetRatio"] == strategy.getTargetRatio()
+    assert position["snxRate"] == Wei("20 ether")
+    assert position["balanceOfWant"] == strategy.balanceOfWant()
+    assert position["balanceOfSusd"] == strategy.balanceOfSusd()
+    assert position["balanceOfSusdInVault"] == strategy.balanceOfSusdInVault()
+    assert position["balanceOfEscrowedWant"] == strategy.balanceOfEscrowedWant()
+    # freshly issued: all the want is locked
+    assert position["unlockedWant"] < Wei("0.001 ether")
+    # computed locally, it can only differ from Synthetix's rounding
+    assert abs(position["currentRatio"] - strategy.getCurrentRatio()) <= 1
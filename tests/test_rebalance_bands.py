@@ -0,0 +1,91 @@
+from brownie import Wei
+
+
+def test_issue_and_repay_bands(chain, gov, strategy, snx_oracle, invested):
+    chain.sleep(86400 + 1)  # just over 24h
+    chain.mine()
+
+    # debt ratio from 0.2 to 0.16
+    snx_oracle.updateSnxPrice(Wei("25 ether"), {"from": gov})
+    assert strategy.tendTrigger(0)
+
+    strategy.setRatioThresholds(Wei("0.05 ether"), Wei("0.001 ether"), {"from": gov})
+    assert not strategy.tendTrigger(0)
+    previous_debt = strategy.balanceOfDebt()
+    strategy.tend({"from": gov})
+    assert strategy.balanceOfDebt() == previous_debt
+
+    # debt ratio from 0.2 to 0.2667, over the target ratio (0.25)
+    snx_oracle.updateSnxPrice(Wei("15 ether"), {"from": gov})
+    assert strategy.tendTrigger(0)
+    strategy.setRatioThresholds(Wei("0.05 ether"), Wei("0.05 ether"), {"from": gov})
+    assert not strategy.tendTrigger(0)
+
+
+def test_min_rebalance_interval(chain, gov, strategy, snx_oracle, invested):
+    strategy.setMinRebalanceInterval(7 * 86400, {"from": gov})
+    # the first harvest issued
+    assert strategy.lastIssueTime() > 0
+    chain.sleep(86400 + 1)
+    chain.mine()
+
+    snx_oracle.updateSnxPrice(Wei("25 ether"), {"from": gov})
+    assert not strategy.tendTrigger(0)
+    previous_debt = strategy.balanceOfDebt()
+    strategy.tend({"from": gov})
+    assert strategy.balanceOfDebt() == previous_debt
+
+    # repaying is the other direction
+    snx_oracle.updateSnxPrice(Wei("15 ether"), {"from": gov})
+    assert strategy.tendTrigger(0)
+    strategy.tend({"from": gov})
+    assert strategy.getCurrentRatio() == strategy.getTargetRatio()
+    assert strategy.lastRepayTime() == chain[-1].timestamp
+
+    chain.sleep(7 * 86400)
+    chain.mine()
+    snx_oracle.updateSnxPrice(Wei("25 ether"), {"from": gov})
+    assert strategy.tendTrigger(0)
+    previous_debt = strategy.balanceOfDebt()
+    strategy.tend({"from": gov})
+    assert strategy.balanceOfDebt() > previous_debt
+
+
+def test_tend_trigger_call_cost(chain, gov, strategy, snx_oracle, invested):
+    # 250 sUSD of debt to repay, but not during the minimum stake time
+    snx_oracle.updateSnxPrice(Wei("15 ether"), {"from": gov})
+    assert not strategy.tendTrigger(0)
+    chain.sleep(86400 + 1)
+    chain.mine()
+    assert strategy.tendTrigger(0)
+
+    # 1000 sUSD to issue at 25 sUSD per SNX: 40 SNX
+    snx_oracle.updateSnxPrice(Wei("25 ether"), {"from": gov})
+    profit_factor = strategy.profitFactor()
+    assert strategy.tendTrigger(Wei("40 ether") // profit_factor - 1)
+    assert not strategy.tendTrigger(Wei("40 ether") // profit_factor)
+
+
+def test_single_ratio_threshold(gov, strategy):
+    strategy.setRatioThreshold(Wei("0.01 ether"), {"from": gov})
+    assert strategy.issueRatioThreshold() == Wei("0.01 ether")
+    assert strategy.repayRatioThreshold() == Wei("0.01 ether")
+    assert strategy.ratioThreshold() == Wei("0.01 ether")
+
+    # the getter of the single threshold follows the repay side
+    strategy.setRatioThresholds(Wei("0.02 ether"), Wei("0.005 ether"), {"from": gov})
+    assert strategy.ratioThreshold() == Wei("0.005 ether")
+
+
+def test_tend_trigger_repays_at_any_call_cost(
+    chain, gov, strategy, snx_oracle, invested
+):
+    chain.sleep(86400 + 1)
+    chain.mine()
+
+    # 25 sUSD of debt to repay, about 1.6 SNX: far less than the call
+    snx_oracle.updateSnxPrice(Wei("15.9 ether"), {"from": gov})
+    assert strategy.getCurrentRatio() > (
+        strategy.getTargetRatio() + strategy.repayRatioThreshold()
+    )
+    assert strategy.tendTrigger(Wei("1000 ether"))
@@ -0,0 +1,51 @@
+from brownie import Contract, MockAddressResolver, MockIssuer
+from eth_abi import encode_single
+
+
+def test_resolver_cache(strategy, bob):
+    # the cache is built at deployment
+    assert strategy.cachedResolver() == strategy.resolver()
+    assert strategy.isResolverCached()
+
+    # anyone can rebuild it
+    tx = strategy.rebuildCache({"from": bob})
+    assert len(tx.events["CacheUpdated"]) == len(strategy.resolverAddressesRequired())
+    assert strategy.isResolverCached()
+
+
+def test_contract_upgrade(accounts, strategy, resolver, issuer, bob, invested):
+    # Issuer upgraded behind the same resolver
+    owner = accounts.at(resolver.owner(), force=True)
+    new_issuer = MockIssuer.deploy(owner, resolver, {"from": owner})
+    name = encode_single("bytes32", b"Issuer")
+    resolver.importAddresses([name], [new_issuer], {"from": owner})
+    assert not strategy.isResolverCached()
+
+    # the strategy keeps the retired Issuer until the cache is rebuilt
+    minimum_stake_time = issuer.minimumStakeTime()
+    assert strategy.nextBurnableTimestamp() == (
+        issuer.lastIssueEvent(strategy) + minimum_stake_time
+    )
+    strategy.rebuildCache({"from": bob})
+    assert strategy.isResolverCached()
+    # the new Issuer has no issue of the strategy
+    assert strategy.nextBurnableTimestamp() == minimum_stake_time
+
+
+def test_harvest_follows_resolver(
+    accounts, gov, strategy, read_proxy, resolver, invested
+):
+    # a new resolver with the same contracts behind the read proxy
+    names = strategy.resolverAddressesRequired()
+    new_resolver = MockAddressResolver.deploy(gov, {"from": gov})
+    new_resolver.importAddresses(
+        names, [resolver.getAddress(name) for name in names], {"from": gov}
+    )
+    proxy = Contract(read_proxy.address)
+    proxy.setTarget(new_resolver, {"from": accounts.at(proxy.owner(), force=True)})
+    assert not strategy.isResolverCached()
+
+    tx = strategy.harvest({"from": gov})
+    assert len(tx.events["CacheUpdated"]) == len(names)
+    assert strategy.cachedResolver() == new_resolver
+    assert strategy.isResolverCached()
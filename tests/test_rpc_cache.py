@@ -0,0 +1,109 @@
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from scripts.rpc_cache import MISSING, CachingProxy, Store, cache_key
+
+SLOT = ["0x4E3b31eB0E5CB73641EE1E65E7dCEFe520bA3ef2", "0x0", "0xbebc20"]
+
+
+def _call(method, params, id=1):
+    return {"jsonrpc": "2.0", "id": id, "method": method, "params": params}
+
+
+def test_cache_key():
+    key = cache_key(_call("eth_getStorageAt", SLOT))
+    # the block is normalized and addresses are case insensitive
+    assert key == cache_key(
+        _call("eth_getStorageAt", [SLOT[0].lower(), "0x0", "0xBEBC20"])
+    )
+    assert key[:2] == ("0xbebc20", "eth_getStorageAt")
+
+    assert cache_key(_call("eth_chainId", []))[0] == ""
+    # latest moves, other methods are never stored
+    assert cache_key(_call("eth_getStorageAt", SLOT[:2] + ["latest"])) is None
+    assert cache_key(_call("eth_getCode", SLOT[:1])) is None
+    assert cache_key(_call("eth_sendTransaction", [{}])) is None
+
+
+def test_store_round_trip(tmp_path):
+    key = cache_key(_call("eth_getCode", [SLOT[0], "0xbebc20"]))
+    store = Store(tmp_path / "cache.sqlite3")
+    assert store.get(key) is MISSING
+    store.put(key, None)  # empty accounts have no code, null is a result too
+    store.close()
+
+    store = Store(tmp_path / "cache.sqlite3")
+    assert store.get(key) is None
+    store.put(key, "0x6080")
+    assert store.get(key) == "0x6080"
+    store.close()
+
+
+def test_replay_miss(tmp_path):
+    proxy = CachingProxy(Store(tmp_path / "cache.sqlite3"))
+    (reply,) = asyncio.run(proxy.resolve([_call("eth_getStorageAt", SLOT, id=7)]))
+    assert reply["id"] == 7
+    assert reply["error"]["message"] == "eth_getStorageAt not recorded"
+    assert proxy.stats.misses["eth_getStorageAt"] == 1
+
+
+async def _upstream_app(served):
+    async def handle(request):
+        replies = []
+        for call in await request.json():
+            served.append(call["method"])
+            replies.append({"jsonrpc": "2.0", "id": call["id"], "result": "0x2a"})
+        # out of order, as some nodes answer batches
+        return web.json_response(replies[::-1])
+
+    app = web.Application()
+    app.router.add_post("/", handle)
+    return app
+
+
+async def _record_and_replay(path):
+    served = []
+    upstream = TestServer(await _upstream_app(served))
+    await upstream.start_server()
+    calls = [
+        _call("eth_getStorageAt", SLOT, id=1),
+        _call("eth_getBalance", [SLOT[0], "0xbebc20"], id=2),
+        _call("eth_blockNumber", [], id=3),
+    ]
+
+    proxy = CachingProxy(Store(path), str(upstream.make_url("/")))
+    async with TestClient(TestServer(proxy.app())) as client:
+        recorded = await (await client.post("/", json=calls)).json()
+    await upstream.close()
+
+    proxy = CachingProxy(Store(path))
+    async with TestClient(TestServer(proxy.app())) as client:
+        replayed = await (await client.post("/", json=calls[:2])).json()
+        single = await (await client.post("/", json=calls[0])).json()
+        stats = await (await client.get("/stats")).json()
+    return served, recorded, replayed, single, stats
+
+
+def test_record_and_replay(tmp_path):
+    served, recorded, replayed, single, stats = asyncio.run(
+        _record_and_replay(tmp_path / "cache.sqlite3")
+    )
+
+    assert sorted(served) == ["eth_blockNumber", "eth_getBalance", "eth_getStorageAt"]
+    assert [(r["id"], r["result"]) for r in recorded] == [
+        (1, "0x2a"),
+        (2, "0x2a"),
+        (3, "0x2a"),
+    ]
+    # replayed without an upstream, with the ids of the request
+    assert replayed == recorded[:2]
+    assert single == recorded[0]
+    assert stats["eth_getStorageAt"] == {
+        "hits": 2,
+        "misses": 0,
+        "forwarded": 0,
+        "hitRate": 1.0,
+    }
+    assert stats["eth_getBalance"]["hitRate"] == 1.0
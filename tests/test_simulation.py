@@ -0,0 +1,144 @@
+import numpy as np
+import pytest
+
+from simulation import MarketParams, PricePaths, StrategyParams, run_grid, simulate
+from simulation.paths import DAY
+from simulation.replay import load_prices, replay
+
+# same scenarios as the chain tests: 1000 SNX invested at an SNX price of 20
+# (4000 sUSD of debt in the sUSD vault), then the prices move
+
+NO_HARVEST = StrategyParams(harvest_interval=30 * DAY)
+
+
+def test_snx_price_decreases():
+    # test_snx_price_changes.py::test_snx_price_decreases
+    within_band = simulate(PricePaths.from_prices([20, 18]))
+    assert within_band.repays == 0 and within_band.issues == 1
+
+    result = simulate(PricePaths.from_prices([20, 18, 15]))
+    assert result.repays == 1
+    assert result.snx_sold == 0
+    assert result.final_ratio == pytest.approx(0.25)  # target ratio
+    assert result.total_assets == pytest.approx(1_000)
+
+
+def test_snx_price_increases():
+    # test_snx_price_changes.py::test_snx_price_increases
+    result = simulate(PricePaths.from_prices([20, 25]))
+    assert result.issues == 2
+    assert result.final_ratio == pytest.approx(0.2)
+    assert result.total_assets == pytest.approx(1_000)
+
+
+def test_debt_increases():
+    # test_debt_changes.py::test_debt_increases
+    paths = PricePaths.from_prices(
+        [20, 20, 20], btc=[50_000, 70_000, 120_000], eth=[2_000, 2_500, 3_500]
+    )
+    within_band = simulate(
+        PricePaths(paths.snx[:, :2], paths.btc[:, :2], paths.eth[:, :2])
+    )
+    assert within_band.repays == 0
+    assert 0.2 < within_band.final_ratio < 0.25
+
+    result = simulate(paths)
+    assert result.repays == 1
+    assert result.snx_sold == 0
+    assert result.final_ratio == pytest.approx(0.25)
+    # bob lost SNX
+    assert result.total_assets < 1_000
+
+
+def test_debt_decreases():
+    # test_debt_changes.py::test_debt_decreases
+    paths = PricePaths.from_prices([20, 20], btc=[50_000, 30_000], eth=[2_000, 1_500])
+    result = simulate(paths)
+    assert result.issues == 2
+    assert result.final_ratio == pytest.approx(0.2)
+    # bob earned SNX
+    assert result.total_assets > 1_000
+
+
+def test_liquidations_snx_price_change():
+    # test_liquidations.py::test_liquidations_snx_price_change
+    result = simulate(PricePaths.from_prices([20] + [7] * 4), NO_HARVEST)
+    amount_needed = (4_000 - 0.2 * 7_000) / (1 - 1.1 * 0.2)
+    assert result.liquidations == 1
+    assert result.liquidated_want == pytest.approx(amount_needed * 11 / 70)
+    assert result.final_ratio == pytest.approx(0.2)
+
+
+def test_liquidations_debt_changes():
+    # test_liquidations.py::test_liquidations_debt_changes
+    paths = PricePaths.from_prices(
+        [20] * 5, btc=[50_000] + [250_000] * 4, eth=[2_000] + [10_000] * 4
+    )
+    result = simulate(paths, NO_HARVEST)
+    amount_needed = (15_200 - 0.2 * 20_000) / (1 - 1.1 * 0.2)
+    assert result.liquidated_want == pytest.approx(amount_needed * 11 / 200)
+    assert result.final_ratio == pytest.approx(0.2)
+
+
+def test_harvest_reduces_liquidation():
+    # the harvest after the flag repays from the sUSD vault, but only down to the target
+    # ratio, so the account is still liquidated (for less) after the delay
+    paths = PricePaths.from_prices([20] + [7] * 4)
+    result = simulate(paths)
+    assert result.liquidations == 1
+    assert 0 < result.liquidated_want < simulate(paths, NO_HARVEST).liquidated_want
+    assert result.snx_sold == 0
+
+
+def test_rebalance_bands():
+    # SNX swings between 20 and 15: repaying at 15 leaves the ratio at 0.1875 at 20,
+    # under the issuance ratio, and the next swing repays what was just issued
+    paths = PricePaths.from_prices([20, 15, 20, 15, 20, 15, 20])
+    result = simulate(paths)
+    assert result.issues == 4 and result.repays == 3
+
+    # 0.1875 is inside of a wider issue band, the strategy stays at the target ratio
+    wide = simulate(paths, StrategyParams(issue_ratio_threshold=0.02))
+    assert wide.issues == 1 and wide.repays == 1
+    assert wide.final_ratio == pytest.approx(0.1875)
+    assert wide.total_assets == pytest.approx(1_000)
+
+    # at most one issue and one repay every 3 days
+    limited = simulate(paths, StrategyParams(min_rebalance_interval=3 * DAY))
+    assert limited.issues == 2 and limited.repays == 2
+
+
+def test_replay(tmp_path):
+    path = tmp_path / "prices.csv"
+    path.write_text("snx,btc\n20,50000\n15,50000\n20,50000\n15,50000\n")
+    paths = load_prices(path, DAY)
+    assert paths.n_steps == 3 and paths.eth[0, 3] == 2_000
+
+    grid = [StrategyParams(), StrategyParams(issue_ratio_threshold=0.02)]
+    (_, narrow), (_, wide) = replay(paths, grid)
+    assert narrow["actions"] == narrow["issues"] + narrow["repays"] == 4
+    assert wide["actions"] == 2
+
+
+def test_paths_are_vectorized():
+    # every path gives the same result alone or in a batch
+    paths = PricePaths.gbm(50, 90, seed=1)
+    batch = simulate(paths, market=MarketParams(fees_apr=0.1, rewards_apr=0.3))
+    for i in (0, 17, 49):
+        single = PricePaths(
+            paths.snx[i : i + 1], paths.btc[i : i + 1], paths.eth[i : i + 1]
+        )
+        alone = simulate(single, market=MarketParams(fees_apr=0.1, rewards_apr=0.3))
+        assert alone.total_assets[0] == pytest.approx(batch.total_assets[i])
+        assert alone.liquidations[0] == batch.liquidations[i]
+
+
+def test_run_grid():
+    grid = [StrategyParams(target_ratio_multiplier=m) for m in (11_000, 15_000)]
+    results = run_grid(grid, n_paths=200, n_steps=60, seed=3, processes=2)
+    assert [params for params, _ in results] == grid
+
+    # the pool runs the same paths as a local simulation
+    local = simulate(PricePaths.gbm(200, 60, seed=3), grid[1]).summary()
+    assert results[1][1]["total_assets"] == local["total_assets"]
+    assert np.isfinite(results[0][1]["paths_per_second"])
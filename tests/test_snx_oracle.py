@@ -0,0 +1,33 @@
+import brownie
+from brownie import Wei
+from eth_abi import encode_single
+
+from scripts.price_replay import PriceReplay
+
+
+def test_update_all_prices(gov, snx_oracle, exchange_rates):
+    keys = [encode_single("bytes32", key) for key in (b"SNX", b"sBTC", b"sETH")]
+    assert [bytes(key) for key in snx_oracle.currencyKeys()] == keys
+
+    rates = [Wei("25 ether"), Wei("60000 ether"), Wei("2500 ether")]
+    snx_oracle.updateAllPrices(rates, {"from": gov})
+    assert [exchange_rates.rateForCurrency(key) for key in keys] == rates
+
+    with brownie.reverts("!rates"):
+        snx_oracle.updateAllPrices(rates[:2], {"from": gov})
+
+
+def test_price_replay(chain, snx_oracle, debt_cache, system_settings, stale_period):
+    replay = PriceReplay(snx_oracle, debt_cache, system_settings, snapshot_bps=10)
+    assert replay.keys == ["SNX", "sBTC", "sETH"]
+
+    ticks = [
+        {"snx": 20, "btc": 50_000, "eth": 2_000},
+        {"snx": 21, "btc": 50_010, "eth": 2_000},  # under 10 bps
+        {"snx": 19, "btc": 50_010, "eth": 2_100},
+    ]
+    for prices in ticks:
+        replay.tick(prices, 3600)
+    assert replay.ticks == 3
+    assert replay.snapshots == 2
+    assert debt_cache.cacheInfo()[1] == chain[-1].timestamp
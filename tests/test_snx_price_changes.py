@@ -1,38 +1,10 @@
 import brownie
-from brownie import Wei, Contract
-from eth_abi import encode_single
+from brownie import Wei
 
 
 def test_snx_price_decreases(
-    snx,
-    chain,
-    gov,
-    vault,
-    strategy,
-    susd,
-    susd_vault,
-    susd_whale,
-    snx_whale,
-    bob,
-    snx_oracle,
+    snx, chain, gov, vault, strategy, bob, snx_oracle, invested_module
 ):
-    chain.snapshot()
-    # Move stale period to 6 days
-    resolver = Contract(strategy.resolver())
-    settings = Contract(
-        resolver.getAddress(encode_single("bytes32", b"SystemSettings"))
-    )
-    settings.setRateStalePeriod(24 * 3600 * 16, {"from": settings.owner()})
-    settings.setDebtSnapshotStaleTime(24 * 3600 * 16, {"from": settings.owner()})
-
-    snx.transfer(bob, Wei("1000 ether"), {"from": snx_whale})
-    snx.approve(vault, 2 ** 256 - 1, {"from": bob})
-    vault.deposit({"from": bob})
-
-    # Invest with an SNX price of 20
-    snx_oracle.updateSnxPrice(Wei("20 ether"), {"from": gov})
-    strategy.harvest({"from": gov})
-
     chain.sleep(86400 + 1)  # just over 24h
     chain.mine()
 
@@ -92,39 +64,11 @@ def test_snx_price_decreases(
 
     # bob did not lose SNX
     assert snx.balanceOf(bob) == Wei("1000 ether")
-    chain.revert()
 
 
 def test_snx_price_increases(
-    snx,
-    chain,
-    gov,
-    vault,
-    strategy,
-    susd,
-    susd_vault,
-    susd_whale,
-    snx_whale,
-    bob,
-    snx_oracle,
+    snx, chain, gov, vault, strategy, bob, snx_oracle, invested_module
 ):
-    chain.snapshot()
-    # Move stale period to 6 days
-    resolver = Contract(strategy.resolver())
-    settings = Contract(
-        resolver.getAddress(encode_single("bytes32", b"SystemSettings"))
-    )
-    settings.setRateStalePeriod(24 * 3600 * 6, {"from": settings.owner()})
-    settings.setDebtSnapshotStaleTime(24 * 3600 * 6, {"from": settings.owner()})
-
-    snx.transfer(bob, Wei("1000 ether"), {"from": snx_whale})
-    snx.approve(vault, 2 ** 256 - 1, {"from": bob})
-    vault.deposit({"from": bob})
-
-    # Invest with an SNX price of 20
-    snx_oracle.updateSnxPrice(Wei("20 ether"), {"from": gov})
-    strategy.harvest({"from": gov})
-
     chain.sleep(86400 + 1)  # just over 24h
     chain.mine()
 
@@ -164,4 +108,3 @@ def test_snx_price_increases(
     assert snx.balanceOf(strategy) == 0
 
     assert snx.balanceOf(bob) == Wei("1000 ether")
-    chain.revert()
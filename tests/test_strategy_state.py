@@ -0,0 +1,35 @@
+from brownie import Wei
+
+from scripts.strategy_state import VIEWS, read_state, read_states
+
+
+def test_read_state(chain, gov, strategy, snx_oracle, invested):
+    invested = read_state(strategy)
+
+    # one call returns what every view returns on its own
+    for field, view in VIEWS.items():
+        assert getattr(invested, field) == getattr(strategy, view)()
+    assert invested.debt > 0
+
+    # pinned to a block, the state does not move with the chain
+    # (past the minimum stake time, so that the tend can burn)
+    chain.sleep(86400 + 1)
+    chain.mine()
+    snx_oracle.updateSnxPrice(Wei("15 ether"), {"from": gov})
+    strategy.tend({"from": gov})
+    (pinned,) = read_states([strategy], block=invested.block)
+    assert pinned == invested
+    assert read_state(strategy).debt < invested.debt
+
+
+def test_read_many_strategies(
+    strategist, vault, strategy, Strategy, susd_vault, read_proxy, uniswap, sushiswap
+):
+    other = strategist.deploy(
+        Strategy, vault, susd_vault, read_proxy, uniswap, sushiswap
+    )
+
+    states = read_states([strategy, other])
+    assert [s.address for s in states] == [strategy.address, other.address]
+    assert states[0].block == states[1].block
+    assert states[1].target_ratio == other.getTargetRatio()
@@ -0,0 +1,40 @@
+import brownie
+from brownie import Wei
+
+
+def test_swap_paths_permissions(strategy, gov, bob, weth, usdc):
+    assert strategy.getSwapPaths() == [[weth]]
+
+    # only governance manages the candidate paths
+    with brownie.reverts():
+        strategy.setSwapPaths([[usdc, weth]], {"from": strategy.strategist()})
+    with brownie.reverts():
+        strategy.setSwapPaths([[usdc, weth]], {"from": bob})
+    with brownie.reverts():
+        strategy.setSwapPaths([], {"from": gov})
+
+    strategy.setSwapPaths([[weth], [usdc, weth]], {"from": gov})
+    assert strategy.getSwapPaths() == [[weth], [usdc, weth]]
+
+    with brownie.reverts():
+        strategy.setMinSplitImprovement(10_001, {"from": gov})
+    strategy.setMinSplitImprovement(0, {"from": strategy.strategist()})
+    assert strategy.minSplitImprovement() == 0
+
+
+def test_best_execution(vault, strategy, gov, susd, susd_whale, accounts, weth, usdc):
+    # a path without pairs on any venue is quoted as 0 and never used
+    missing_pair = accounts[9]
+    strategy.setSwapPaths([[weth], [usdc, weth], [missing_pair]], {"from": gov})
+
+    susd.transfer(strategy, Wei("1000 ether"), {"from": susd_whale})
+    strategy.harvest({"from": gov})
+    gain = vault.strategies(strategy).dict()["totalGain"]
+    assert gain > 0
+    assert strategy.balanceOfSusd() == 0
+
+    # a large sale can be split between uniswap and sushiswap
+    susd.transfer(strategy, Wei("500000 ether"), {"from": susd_whale})
+    strategy.harvest({"from": gov})
+    assert vault.strategies(strategy).dict()["totalGain"] > gain
+    assert strategy.balanceOfSusd() == 0
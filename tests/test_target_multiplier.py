@@ -18,3 +18,7 @@ def test_target_multiplier(vault, strategy, bob):
     # and can be set by gov
     strategy.setTargetRatioMultiplier(12345, {"from": vault.governance()})
     assert strategy.targetRatioMultiplier() == 12345
+
+    # it is stored in 16 bits
+    with brownie.reverts():
+        strategy.setTargetRatioMultiplier(2 ** 16, {"from": vault.governance()})
@@ -0,0 +1,49 @@
+from brownie import Wei
+
+
+def test_trigger_prices(chain, gov, strategy, snx_oracle, system_settings, invested):
+    chain.sleep(86400 + 1)
+    chain.mine()
+    prices = strategy.getTriggerPrices().dict()
+
+    # 4000 sUSD of debt on 1000 SNX: 4 sUSD of debt per SNX
+    debt_per_snx = strategy.balanceOfDebt() * 10 ** 18 // Wei("1000 ether")
+    assert prices["target"] == debt_per_snx * 10 ** 18 // strategy.getTargetRatio()
+    assert prices["issuance"] == debt_per_snx * 10 ** 18 // strategy.getIssuanceRatio()
+    assert (
+        prices["liquidation"]
+        == debt_per_snx * 10 ** 18 // system_settings.liquidationRatio()
+    )
+    # 8 < 15.94 (repay) < 16 (target) < 20 (issuance) < 20.1 (issue)
+    assert prices["liquidation"] < prices["repay"] < prices["target"]
+    assert prices["target"] < prices["issuance"] < prices["issue"]
+
+    # tend repays under the repay price, and not over it
+    snx_oracle.updateSnxPrice(prices["repay"] + Wei("0.001 ether"), {"from": gov})
+    assert not strategy.tendTrigger(0)
+    snx_oracle.updateSnxPrice(prices["repay"] - Wei("0.001 ether"), {"from": gov})
+    assert strategy.tendTrigger(0)
+
+    # the issue band starts over the issue price (tend also waits for MIN_ISSUE)
+    issue_ratio = strategy.getIssuanceRatio() - strategy.issueRatioThreshold()
+    snx_oracle.updateSnxPrice(prices["issue"] - Wei("0.001 ether"), {"from": gov})
+    assert strategy.getCurrentRatio() > issue_ratio
+    snx_oracle.updateSnxPrice(prices["issue"] + Wei("0.001 ether"), {"from": gov})
+    assert strategy.getCurrentRatio() < issue_ratio
+
+
+def test_trigger_debts(strategy, system_settings, invested):
+    debts = strategy.getTriggerDebts().dict()
+
+    # 1000 SNX at 20 sUSD
+    assert debts["issuance"] == Wei("4000 ether")
+    assert debts["target"] == strategy.getTargetRatio() * 20_000
+    assert debts["liquidation"] == system_settings.liquidationRatio() * 20_000
+    assert debts["repay"] == debts["target"] + strategy.repayRatioThreshold() * 20_000
+    assert debts["issue"] == debts["issuance"] - strategy.issueRatioThreshold() * 20_000
+
+
+def test_trigger_levels_without_debt(strategy, deposit):
+    prices = strategy.getTriggerPrices().dict()
+    # no SNX price gets a position without debt over any level
+    assert all(price == 0 for price in prices.values())
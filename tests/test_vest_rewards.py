@@ -0,0 +1,31 @@
+from brownie import Wei
+
+
+def test_vest_all_matured_entries(chain, gov, strategy, snx_oracle, fee_pool, invested):
+    # claim rewards during three fee periods, creating three escrow entries
+    for i in range(3):
+        chain.sleep(fee_pool.feePeriodDuration())
+        chain.mine(1)
+        fee_pool.closeCurrentFeePeriod({"from": gov})
+        strategy.harvest({"from": gov})
+        assert strategy.entryIDs(i) > 0
+
+    escrowed = strategy.balanceOfEscrowedWant()
+    assert escrowed > 0
+    assert strategy.vestableRewards() == (0, 0)
+
+    # every entry has matured, they are all vested in a single harvest
+    chain.sleep(3600 * 24 * 7 * 52)
+    chain.mine(1)
+    snx_oracle.updateSnxPrice(Wei("20 ether"), {"from": gov})
+    assert strategy.vestableRewards() == (3, escrowed)
+
+    strategy.setMaxEntriesToVest(2, {"from": gov})
+    strategy.harvest({"from": gov})
+    assert strategy.entryIDIndex() == 2
+    assert strategy.vestableRewards()[0] == 1
+
+    strategy.harvest({"from": gov})
+    assert strategy.entryIDIndex() == 3
+    assert strategy.vestableRewards() == (0, 0)
+    assert strategy.balanceOfEscrowedWant() == 0
@@ -0,0 +1,152 @@
+import asyncio
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from brownie import Wei, web3
+
+from scripts.keeper import RpcClient
+from scripts.watchdog import Update, Watchdog
+
+
+async def watch(strategy, sender, moves):
+    async with aiohttp.ClientSession() as session:
+        rpc = RpcClient(session, web3.provider.endpoint_uri)
+        watchdog = Watchdog(rpc, strategy.address, sender.address)
+        await watchdog.setup()
+        ratios = []
+        for move in moves:
+            move()
+            await watchdog.poll()
+            await asyncio.gather(*watchdog.receipts)
+            ratios.append(watchdog.state.current_ratio())
+        return watchdog, ratios
+
+
+def test_watchdog_tends_and_repays(chain, gov, strategy, snx_oracle, invested_module):
+    chain.sleep(86400 + 1)
+    chain.mine()
+
+    def price(snx):
+        return lambda: snx_oracle.updateSnxPrice(Wei(f"{snx} ether"), {"from": gov})
+
+    watchdog, ratios = asyncio.run(watch(strategy, gov, [price(15), price(8)]))
+
+    # 0.267 is over the repay threshold, 0.469 within 10% of the liquidation ratio
+    assert [kind for kind, _, _ in watchdog.latencies] == ["tend", "repay"]
+    assert all(latency > 0 for _, _, latency in watchdog.latencies)
+    # both were mined and read back: the strategy is at its target ratio again
+    assert ratios == [strategy.getTargetRatio()] * 2
+    assert strategy.getCurrentRatio() == strategy.getTargetRatio()
+    assert watchdog.in_flight is None
+
+
+def test_watchdog_follows_debt_snapshots(gov, strategy, debt_cache, invested_module):
+    async def run():
+        async with aiohttp.ClientSession() as session:
+            rpc = RpcClient(session, web3.provider.endpoint_uri)
+            watchdog = Watchdog(rpc, strategy.address, gov.address)
+            await watchdog.setup()
+            debt_cache.takeDebtSnapshot({"from": gov})
+            await watchdog.poll()
+            return watchdog
+
+    watchdog = asyncio.run(run())
+    assert watchdog.state.debt == strategy.balanceOfDebt()
+    assert watchdog.state.cached_debt == debt_cache.cacheInfo()[0]
+    assert not watchdog.latencies
+
+
+def test_watchdog_refresh_and_snapshot_in_one_block(
+    gov, strategy, debt_cache, invested_module
+):
+    async def logs(rpc, block):
+        return await rpc.call(
+            "eth_getLogs",
+            {
+                "fromBlock": hex(block),
+                "toBlock": hex(block),
+                "address": debt_cache.address,
+            },
+        )
+
+    async def run():
+        async with aiohttp.ClientSession() as session:
+            rpc = RpcClient(session, web3.provider.endpoint_uri)
+            watchdog = Watchdog(rpc, strategy.address, gov.address)
+            await watchdog.setup()
+
+            # the receipt of a transaction mined in the block of the snapshot reads
+            # the position back between the DebtCacheUpdated and the snapshot logs
+            block = debt_cache.takeDebtSnapshot({"from": gov}).block_number
+            updated, taken = await logs(rpc, block)
+            await watchdog.on_update(Update("log", block, 0, updated))
+            await watchdog.refresh(block)
+            assert watchdog.previous_cached_debt is None
+            await watchdog.on_update(Update("log", block, 0, taken))
+            assert watchdog.state.debt == strategy.balanceOfDebt()
+
+            debt_cache.takeDebtSnapshot({"from": gov})
+            await watchdog.poll()
+            return watchdog
+
+    watchdog = asyncio.run(run())
+    assert watchdog.state.debt == strategy.balanceOfDebt()
+    assert watchdog.previous_cached_debt is None
+
+
+def test_watchdog_subscribe(gov, strategy, debt_cache, invested_module):
+    def notification(subscription, result):
+        return {
+            "jsonrpc": "2.0",
+            "method": "eth_subscription",
+            "params": {"subscription": subscription, "result": result},
+        }
+
+    async def run():
+        async with aiohttp.ClientSession() as session:
+            rpc = RpcClient(session, web3.provider.endpoint_uri)
+            watchdog = Watchdog(rpc, strategy.address, gov.address)
+            await watchdog.setup()
+            block = debt_cache.takeDebtSnapshot({"from": gov}).block_number
+            logs = await rpc.call(
+                "eth_getLogs",
+                {
+                    "fromBlock": hex(block),
+                    "toBlock": hex(block),
+                    "address": debt_cache.address,
+                },
+            )
+            requests = []
+
+            # pushes the logs and the head of the snapshot block as a node would
+            async def node(request):
+                ws = web.WebSocketResponse()
+                await ws.prepare(request)
+                for subscription in ("0xa", "0xb"):
+                    call = await ws.receive_json()
+                    requests.append(call["params"])
+                    await ws.send_json(
+                        {"jsonrpc": "2.0", "id": call["id"], "result": subscription}
+                    )
+                for entry in logs:
+                    await ws.send_json(notification("0xb", entry))
+                await ws.send_json(notification("0xa", {"number": hex(block)}))
+                await ws.close()
+                return ws
+
+            app = web.Application()
+            app.router.add_get("/", node)
+            async with TestServer(app) as server:
+                await watchdog.subscribe(session, str(server.make_url("/")))
+            return watchdog, requests, block
+
+    watchdog, requests, block = asyncio.run(run())
+    assert requests == [
+        ["newHeads"],
+        ["logs", {"address": watchdog._watched()}],
+    ]
+    assert watchdog.last_block == block
+    assert watchdog.state.debt == strategy.balanceOfDebt()
+    assert watchdog.state.cached_debt == debt_cache.cacheInfo()[0]
+    assert watchdog.previous_cached_debt is None